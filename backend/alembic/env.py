@@ -0,0 +1,59 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models import models  # noqa: F401  (registers the tables on Base.metadata)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emit SQL to stdout (alembic upgrade head --sql)."""
+    context.configure(
+        url=settings.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def _is_pre_alembic(connection) -> bool:
+    """Tables made by create_all at API startup, before migrations existed."""
+    tables = inspect(connection).get_table_names()
+    return "routers" in tables and "alembic_version" not in tables
+
+
+def _run_migrations(connection) -> None:
+    pre_alembic = _is_pre_alembic(connection)
+    context.configure(connection=connection, target_metadata=target_metadata)
+    if pre_alembic:
+        # Same schema as the baseline revision: record it instead of re-creating it
+        context.get_context().stamp(ScriptDirectory.from_config(config), "0001")
+        connection.commit()
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    engine = create_async_engine(settings.DATABASE_URL)
+    async with engine.connect() as connection:
+        await connection.run_sync(_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
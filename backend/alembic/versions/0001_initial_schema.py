@@ -0,0 +1,91 @@
+"""Initial schema (as previously created by create_all at API startup)
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+Only the tables create_all made before migrations existed, with columns NOT
+NULL wherever the models' non-Optional Mapped[...] annotations made it declare
+them so. Databases created that way already have these tables; env.py stamps
+them as 0001 on their first upgrade. Later tables belong in later revisions.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "routers",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False, unique=True),
+        sa.Column("ip_address", sa.String(45), nullable=False),
+        sa.Column("ssh_port", sa.Integer(), nullable=False),
+        sa.Column("ssh_user", sa.String(50), nullable=False),
+        sa.Column("ssh_password", sa.String(255)),
+        sa.Column("ssh_key", sa.Text()),
+        sa.Column("location", sa.String(200)),
+        sa.Column("notes", sa.Text()),
+        sa.Column("tags", sa.JSON()),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("last_seen", sa.DateTime(timezone=True)),
+        sa.Column("is_online", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(255), nullable=False, unique=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_admin", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_login", sa.DateTime(timezone=True)),
+    )
+    op.create_table(
+        "magic_links",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("token", sa.String(255), nullable=False, unique=True),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("used", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_table(
+        "script_executions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("router_id", sa.Integer(), sa.ForeignKey("routers.id"), nullable=False),
+        sa.Column("script_name", sa.String(100), nullable=False),
+        sa.Column("triggered_by", sa.String(50), nullable=False),
+        sa.Column("triggered_by_user", sa.String(255)),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("output", sa.Text()),
+        sa.Column("error", sa.Text()),
+        sa.Column("duration_ms", sa.Integer()),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("completed_at", sa.DateTime(timezone=True)),
+    )
+    op.create_table(
+        "alerts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("router_id", sa.Integer(), sa.ForeignKey("routers.id"), nullable=False),
+        sa.Column("alert_type", sa.String(50), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("severity", sa.String(20), nullable=False),
+        sa.Column("resolved", sa.Boolean(), nullable=False),
+        sa.Column("resolved_at", sa.DateTime(timezone=True)),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("alerts")
+    op.drop_table("script_executions")
+    op.drop_table("magic_links")
+    op.drop_table("users")
+    op.drop_table("routers")
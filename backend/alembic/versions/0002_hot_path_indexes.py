@@ -0,0 +1,43 @@
+"""Indexes for the hot query paths
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+Built CONCURRENTLY so a live database keeps serving writes while they build.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    # (name, table, columns, partial WHERE)
+    ("ix_script_executions_router_created", "script_executions", ["router_id", sa.text("created_at DESC")], None),
+    ("ix_alerts_unresolved_router_created", "alerts", ["router_id", sa.text("created_at DESC")], "NOT resolved"),
+    ("ix_routers_active_name", "routers", ["name", "id"], "is_active"),
+    ("ix_magic_links_unused_token", "magic_links", ["token"], "NOT used"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,82 @@
+"""Store script execution output compressed, with size and truncation flag
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+
+The storage format is inlined below rather than imported from the app, so
+this migration keeps doing what it did when it was written.
+"""
+import zlib
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+BATCH = 500
+MAX_BYTES = 1_000_000  # EXECUTION_OUTPUT_MAX_BYTES at the time
+
+
+def _pack(text: str) -> tuple[bytes, int, bool]:
+    raw = text.encode("utf-8")
+    size = len(raw)
+    truncated = size > MAX_BYTES
+    if truncated:
+        raw = raw[:MAX_BYTES].decode("utf-8", errors="ignore").encode("utf-8")
+    return zlib.compress(raw, 6), size, truncated
+
+
+def upgrade() -> None:
+    op.add_column("script_executions", sa.Column("output_compressed", sa.LargeBinary(), nullable=True))
+    op.add_column("script_executions", sa.Column("output_size", sa.Integer(), nullable=True))
+    op.add_column(
+        "script_executions",
+        sa.Column("output_truncated", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+    conn = op.get_bind()
+    last_id = 0
+    while True:
+        rows = conn.execute(
+            sa.text(
+                "SELECT id, output FROM script_executions "
+                "WHERE id > :last_id AND output IS NOT NULL ORDER BY id LIMIT :batch"
+            ),
+            {"last_id": last_id, "batch": BATCH},
+        ).all()
+        if not rows:
+            break
+        params = []
+        for row_id, output in rows:
+            blob, size, truncated = _pack(output)
+            params.append({"id": row_id, "blob": blob, "size": size, "truncated": truncated})
+        conn.execute(
+            sa.text(
+                "UPDATE script_executions SET output_compressed = :blob, output_size = :size, "
+                "output_truncated = :truncated WHERE id = :id"
+            ),
+            params,
+        )
+        last_id = rows[-1][0]
+
+    op.drop_column("script_executions", "output")
+
+
+def downgrade() -> None:
+    op.add_column("script_executions", sa.Column("output", sa.Text(), nullable=True))
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.text("SELECT id, output_compressed FROM script_executions WHERE output_compressed IS NOT NULL")
+    ).all()
+    if rows:
+        conn.execute(
+            sa.text("UPDATE script_executions SET output = :output WHERE id = :id"),
+            [{"id": row_id, "output": zlib.decompress(blob).decode("utf-8")} for row_id, blob in rows],
+        )
+    op.drop_column("script_executions", "output_truncated")
+    op.drop_column("script_executions", "output_size")
+    op.drop_column("script_executions", "output_compressed")
@@ -0,0 +1,127 @@
+"""Partition script_executions and alerts by month on created_at
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+
+Each table is rebuilt as a partitioned parent, with monthly partitions from its
+oldest row through PARTITION_PREMAKE_MONTHS ahead, and the rows copied over.
+The copy holds the old table locked for its duration; run it in a quiet window.
+Later partitions are created (and old ones expired) by the maintain_partitions
+task; the naming and month arithmetic are inlined to match app.services.partitions
+as it was when this migration was written.
+"""
+from datetime import datetime, timezone
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+PREMAKE_MONTHS = 3  # PARTITION_PREMAKE_MONTHS at the time
+
+
+def _month_start(t: datetime) -> datetime:
+    return t.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _add_months(month: datetime, n: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + n
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def _create_partition(table: str, month: datetime) -> None:
+    op.execute(
+        f"CREATE TABLE IF NOT EXISTS {table}_p{month:%Y%m} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+    )
+
+
+def _columns(table: str) -> list[sa.Column]:
+    id_ = sa.Column("id", sa.Integer(), nullable=False, server_default=sa.text(f"nextval('{table}_id_seq'::regclass)"))
+    router_id = sa.Column("router_id", sa.Integer(), sa.ForeignKey("routers.id"), nullable=False)
+    created_at = sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now())
+    if table == "script_executions":
+        return [
+            id_,
+            router_id,
+            sa.Column("script_name", sa.String(100), nullable=False),
+            sa.Column("triggered_by", sa.String(50), nullable=False),
+            sa.Column("triggered_by_user", sa.String(255)),
+            sa.Column("status", sa.String(20), nullable=False),
+            sa.Column("output_compressed", sa.LargeBinary()),
+            sa.Column("output_size", sa.Integer()),
+            sa.Column("output_truncated", sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column("error", sa.Text()),
+            sa.Column("duration_ms", sa.Integer()),
+            created_at,
+            sa.Column("completed_at", sa.DateTime(timezone=True)),
+        ]
+    return [
+        id_,
+        router_id,
+        sa.Column("alert_type", sa.String(50), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("severity", sa.String(20), nullable=False),
+        sa.Column("resolved", sa.Boolean(), nullable=False),
+        sa.Column("resolved_at", sa.DateTime(timezone=True)),
+        created_at,
+    ]
+
+
+INDEXES = [
+    # (name, table, columns, partial WHERE), as in 0002; rebuilt with each table
+    ("ix_script_executions_router_created", "script_executions", ["router_id", sa.text("created_at DESC")], None),
+    ("ix_alerts_unresolved_router_created", "alerts", ["router_id", sa.text("created_at DESC")], "NOT resolved"),
+]
+
+
+def _rebuild(table: str, partitioned: bool) -> None:
+    """Swap `table` for a (non-)partitioned copy with the same rows, sequence and indexes."""
+    old = f"{table}_old"
+    conn = op.get_bind()
+    op.rename_table(table, old)
+    op.execute(f"ALTER TABLE {old} RENAME CONSTRAINT {table}_pkey TO {old}_pkey")
+    for name, index_table, _, _ in INDEXES:
+        if index_table == table:
+            op.drop_index(name, table_name=old, if_exists=True)
+
+    columns = _columns(table)
+    key = ("id", "created_at") if partitioned else ("id",)
+    op.create_table(
+        table,
+        *columns,
+        sa.PrimaryKeyConstraint(*key, name=f"{table}_pkey"),
+        **({"postgresql_partition_by": "RANGE (created_at)"} if partitioned else {}),
+    )
+    if partitioned:
+        now = datetime.now(timezone.utc)
+        oldest = conn.execute(sa.text(f"SELECT min(created_at) FROM {old}")).scalar() or now
+        month, last = _month_start(oldest), _add_months(_month_start(now), PREMAKE_MONTHS)
+        while month <= last:
+            _create_partition(table, month)
+            month = _add_months(month, 1)
+
+    names = [column.name for column in columns]
+    values = ["coalesce(created_at, now())" if name == "created_at" else name for name in names]
+    op.execute(f"INSERT INTO {table} ({', '.join(names)}) SELECT {', '.join(values)} FROM {old}")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.drop_table(old)
+
+    for name, index_table, index_columns, where in INDEXES:
+        if index_table == table:
+            op.create_index(name, table, index_columns, postgresql_where=sa.text(where) if where else None)
+
+
+def upgrade() -> None:
+    for table in ("script_executions", "alerts"):
+        _rebuild(table, partitioned=True)
+
+
+def downgrade() -> None:
+    # Dropping the old partitioned parent takes its partitions with it
+    for table in ("script_executions", "alerts"):
+        _rebuild(table, partitioned=False)
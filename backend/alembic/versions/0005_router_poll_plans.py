@@ -0,0 +1,36 @@
+"""Per-router polling plans
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+One row per router once the heartbeat has probed it: when it is next due, at
+what interval and why, and when it last had a full SSH check. Routers without
+a row are due at once, so existing deployments need no backfill.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "router_poll_plans",
+        sa.Column("router_id", sa.Integer(), sa.ForeignKey("routers.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("interval_s", sa.Integer(), nullable=False),
+        sa.Column("next_due_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_polled_at", sa.DateTime(timezone=True)),
+        sa.Column("last_change_at", sa.DateTime(timezone=True)),
+        sa.Column("last_ssh_check_at", sa.DateTime(timezone=True)),
+        sa.Column("consecutive_failures", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.String(20), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("router_poll_plans")
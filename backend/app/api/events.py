@@ -0,0 +1,48 @@
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.services.events import get_broker
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    user: dict = Depends(get_current_user),
+    routers: Optional[str] = Query(None, description="Comma-separated router ids; all routers when omitted"),
+):
+    """
+    Server-Sent Events: router status changes, last_seen refreshes, new alerts
+    and script execution status, as published by the Celery tasks.
+    """
+    try:
+        router_ids = {int(r) for r in routers.split(",") if r.strip()} if routers else None
+    except ValueError:
+        raise HTTPException(400, "routers must be comma-separated ids")
+
+    broker = get_broker()
+    queue = broker.subscribe(router_ids)
+
+    async def stream():
+        try:
+            yield "retry: 2000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=settings.EVENTS_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            broker.unsubscribe(queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
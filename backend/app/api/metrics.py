@@ -1,12 +1,36 @@
+import asyncio
+import importlib.util
 import re
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 from fastapi import APIRouter, Query, Depends, HTTPException
-from app.core.influx import get_query_api
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_db
+from app.core.influx import get_query_api, run_in_query_executor
 from app.core.config import settings
+from app.core.redis import get_async_redis, get_redis
 from app.api.deps import get_current_user
+from app.services.metrics_cache import get_cached, set_cached, cache_stats
+from app.services.analytics import fleet_signal_stats
+from app.services.downsample import lttb_rows
+from app.services.export import iter_arrow, iter_csv
+from app.services.snapshots import read_summary
+from app.services.uptime import fleet_uptime, router_uptime
+from app.services.writer_stats import read_writer_stats
+from app.models.models import Router
+from app.services.rollups import checkpoint_key, choose_tier, rfc3339, rollup_tiers
 
-router = APIRouter(prefix="/metrics", tags=["metrics"])
+# Series endpoints return ORJSONResponse themselves: returning a plain dict would
+# still run FastAPI's jsonable_encoder over every point before orjson sees it
+router = APIRouter(prefix="/metrics", tags=["metrics"], default_response_class=ORJSONResponse)
 
 _RANGE_PATTERN = re.compile(r"^[1-9][0-9]{0,3}(m|h|d|w)$")
+_UNIT_SECONDS = {"m": 60, "h": 3600, "d": 86400, "w": 604800}
+# Aggregation windows, finest first; a request gets the finest one that fits max_points
+WINDOW_LADDER = ["1m", "5m", "15m", "1h", "3h", "6h", "1d"]
 
 
 def validate_range(range_: str) -> str:
@@ -15,27 +39,352 @@ def validate_range(range_: str) -> str:
     return range_
 
 
-def _flux_query(router_id: int, measurement: str, field: str, range_: str) -> list[dict]:
+def duration_seconds(duration: str) -> int:
+    """Seconds in a validated range/window string such as '5m' or '7d'."""
+    return int(duration[:-1]) * _UNIT_SECONDS[duration[-1]]
+
+
+def pick_window(range_: str, max_points: int) -> str:
+    """Finest window keeping `range_` within `max_points` points (coarsest window if none does)."""
+    range_s = duration_seconds(range_)
+    for window in WINDOW_LADDER:
+        if range_s / duration_seconds(window) <= max_points:
+            return window
+    return WINDOW_LADDER[-1]
+
+
+SIGNAL_FIELDS = {"rssi": "rssi", "rsrp": "rsrp", "rsrq": "rsrq", "sinr": "sinr"}
+# "latency" is the SSH round trip it always was; the TCP connect time is a separate series
+HEARTBEAT_FIELDS = {"latency": "ssh_latency_ms", "tcp_latency": "tcp_latency_ms"}
+# Fields written under another name before: read as the current one (measurement -> old -> new)
+LEGACY_FIELDS = {"heartbeat": {"latency_ms": "ssh_latency_ms"}}
+
+
+def field_selector(measurement: str, fields: list[str]) -> str:
+    """Flux filter steps for `fields` of `measurement`, with legacy field names renamed to current ones."""
+    legacy = {old: new for old, new in LEGACY_FIELDS.get(measurement, {}).items() if new in fields}
+    field_filter = " or ".join(f'r._field == "{field}"' for field in [*fields, *legacy])
+    selector = f"""
+      |> filter(fn: (r) => r._measurement == "{measurement}")
+      |> filter(fn: (r) => {field_filter})"""
+    for old, new in legacy.items():
+        selector += f"""
+      |> map(fn: (r) => ({{r with _field: if r._field == "{old}" then "{new}" else r._field}}))"""
+    return selector
+
+
+def parse_fields(fields: Optional[str], allowed: dict) -> list[str]:
+    """Resolve a comma-separated `fields=` parameter to response names; all when omitted."""
+    if not fields:
+        return list(allowed)
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in names if f not in allowed]
+    if unknown or not names:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(allowed)}")
+    return list(dict.fromkeys(names))
+
+
+async def _cached_flux_query(router_id: int, measurement: str, fields: list[str], range_: str, window: str) -> dict:
+    cache_field = ",".join(sorted(fields))
+    columns = await get_cached(router_id, measurement, cache_field, range_, window)
+    if columns is None:
+        columns = await run_in_query_executor(_flux_query, router_id, measurement, fields, range_, window)
+        await set_cached(router_id, measurement, cache_field, range_, window, columns,
+                         ttl=duration_seconds(window))
+    return columns
+
+
+def _flux_query(router_id: int, measurement: str, fields: list[str], range_: str, window: str) -> dict:
+    """
+    Windowed means of several fields in one query. Series are regrouped by field
+    (so tag changes such as a new band do not split them), aggregated, then
+    pivoted into one row per window. Returns columns: {"time": [epoch ms, ...],
+    field: [...]}, with None where a field has no value in a window.
+    """
     range_ = validate_range(range_)
     query_api = get_query_api()
+    selector = f"""
+      |> filter(fn: (r) => r.router_id == "{router_id}"){field_selector(measurement, fields)}"""
     query = f"""
-    from(bucket: "{settings.INFLUX_BUCKET}")
-      |> range(start: -{range_})
-      |> filter(fn: (r) => r._measurement == "{measurement}")
-      |> filter(fn: (r) => r.router_id == "{router_id}")
-      |> filter(fn: (r) => r._field == "{field}")
-      |> aggregateWindow(every: 5m, fn: mean, createEmpty: false)
-      |> yield(name: "mean")
+    {_source_flux(selector, range_, window)}
+      |> group(columns: ["_field"])
+      |> aggregateWindow(every: {window}, fn: mean, createEmpty: false)
+      |> group()
+      |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+      |> sort(columns: ["_time"])
     """
     tables = query_api.query(query, org=settings.INFLUX_ORG)
-    points = []
+    columns = {"time": [], **{field: [] for field in fields}}
     for table in tables:
         for record in table.records:
-            points.append({
-                "time": record.get_time().isoformat(),
-                "value": round(record.get_value() or 0, 2),
-            })
-    return points
+            columns["time"].append(int(record.get_time().timestamp() * 1000))
+            for field in fields:
+                value = record.values.get(field)
+                columns[field].append(round(value, 2) if value is not None else None)
+    return columns
+
+
+def _source_flux(selector: str, range_: str, window: Optional[str], checkpoints: Optional[dict] = None) -> str:
+    """
+    Flux source for the series picked by `selector` (filter steps): the coarsest
+    rollup bucket that meets the window (its means up to the rollup checkpoint,
+    raw points after it), or the raw bucket alone (always when window is None).
+    Callers on the event loop pass `checkpoints`; otherwise they are read here,
+    which blocks, so only do that in the query executor.
+    """
+    if not window:
+        checkpoints = {}
+    elif checkpoints is None:
+        checkpoints = _rollup_checkpoints()
+    tier = choose_tier(duration_seconds(window), duration_seconds(range_), time.time(), checkpoints) if window else None
+    if tier is None:
+        return f"""from(bucket: "{settings.INFLUX_BUCKET}")
+      |> range(start: -{range_}){selector}"""
+
+    cut = rfc3339(checkpoints[tier["name"]])
+    return f"""union(tables: [
+      from(bucket: "{tier['bucket']}")
+        |> range(start: -{range_}, stop: {cut}){selector}
+        |> filter(fn: (r) => r.stat == "mean")
+        |> drop(columns: ["stat"])
+        |> toFloat(),
+      from(bucket: "{settings.INFLUX_BUCKET}")
+        |> range(start: {cut}){selector}
+        |> toFloat(),
+    ])"""
+
+
+def source_covers(range_: str, window: Optional[str], checkpoints: dict, now: float) -> bool:
+    """
+    Whether _source_flux reaches back over the whole range: a rollup tier
+    serves the window, or the raw bucket's retention covers the range.
+    """
+    raw_days = settings.INFLUX_RAW_RETENTION_DAYS
+    if not raw_days or duration_seconds(range_) <= raw_days * 86400:
+        return True
+    return window is not None and choose_tier(duration_seconds(window), duration_seconds(range_), now, checkpoints) is not None
+
+
+def _rollup_checkpoints() -> dict:
+    tiers = rollup_tiers()
+    values = get_redis().mget([checkpoint_key(t["name"]) for t in tiers])
+    return {t["name"]: float(v) for t, v in zip(tiers, values) if v is not None}
+
+
+async def _read_rollup_checkpoints() -> dict:
+    """_rollup_checkpoints for handlers on the event loop."""
+    tiers = rollup_tiers()
+    values = await get_async_redis().mget([checkpoint_key(t["name"]) for t in tiers])
+    return {t["name"]: float(v) for t, v in zip(tiers, values) if v is not None}
+
+
+def _points(columns: dict, field: str) -> list[dict]:
+    return [
+        {"time": datetime.fromtimestamp(t / 1000, tz=timezone.utc).isoformat(), "value": v}
+        for t, v in zip(columns["time"], columns[field])
+        if v is not None
+    ]
+
+
+def _query_window(range_: str, max_points: int, downsample: Optional[str]) -> str:
+    # LTTB needs more raw points than it returns to pick peaks from
+    if downsample == "lttb":
+        max_points *= settings.METRICS_LTTB_OVERSAMPLE
+    return pick_window(range_, max_points)
+
+
+def _select_rows(columns: dict, fields: list[str], max_points: int, downsample: Optional[str]) -> dict:
+    if downsample != "lttb":
+        return columns
+    rows = lttb_rows(columns["time"], [columns[f] for f in fields], max_points)
+    return {key: [columns[key][i] for i in rows] for key in ["time", *fields]}
+
+
+def _series_payload(columns: dict, names: list[str], field_map: dict, max_points: int,
+                    downsample: Optional[str], format: str) -> dict:
+    """
+    Response body for the selected fields. "points": a list of {"time": iso,
+    "value"} per field. "columnar": one epoch-ms "time" array shared by all
+    fields and a value array per field (null where a window has no value).
+    """
+    if format == "columnar":
+        columns = _select_rows(columns, [field_map[n] for n in names], max_points, downsample)
+        return {"time": columns["time"], **{name: columns[field_map[name]] for name in names}}
+    return {
+        name: _points(_select_rows(columns, [field_map[name]], max_points, downsample), field_map[name])
+        for name in names
+    }
+
+
+@router.get("/fleet/signal")
+async def get_fleet_signal(
+    user: dict = Depends(get_current_user),
+    range: str = Query("7d", description="Time range e.g. 24h, 7d, 4w"),
+    field: str = Query("rsrp", description="One of rssi,rsrp,rsrq,sinr"),
+    limit: int = Query(20, ge=1, le=500, description="Routers in the top and bottom rankings"),
+):
+    """
+    Fleet-wide distribution of one signal field: percentiles across routers,
+    best/worst routers by mean, and breakdowns per operator and band.
+    """
+    try:
+        validate_range(range)
+    except ValueError:
+        raise HTTPException(400, "Invalid range format. Use e.g. 1h, 6h, 24h, 7d")
+    if field not in SIGNAL_FIELDS:
+        raise HTTPException(400, f"Unknown field: {field}. Allowed: {', '.join(SIGNAL_FIELDS)}")
+
+    window = pick_window(range, settings.METRICS_FLEET_SAMPLES)
+    stats = await run_in_query_executor(_fleet_signal_stats, SIGNAL_FIELDS[field], range, window, limit)
+    return ORJSONResponse({"range": range, "field": field, "window": window, **stats})
+
+
+def _fleet_signal_stats(field: str, range_: str, window: str, limit: int) -> dict:
+    """One grouped query for the whole fleet: a windowed mean per (router, operator, band)."""
+    selector = f"""
+      |> filter(fn: (r) => r._measurement == "signal")
+      |> filter(fn: (r) => r._field == "{field}")"""
+    query = f"""
+    {_source_flux(selector, validate_range(range_), window)}
+      |> group(columns: ["router_id", "router_name", "operator", "band"])
+      |> aggregateWindow(every: {window}, fn: mean, createEmpty: false)
+      |> keep(columns: ["_time", "_value", "router_id", "router_name", "operator", "band"])
+    """
+    router_ids, names, operators, bands, values, times = [], [], [], [], [], []
+    for record in get_query_api().query_stream(query, org=settings.INFLUX_ORG):
+        value = record.get_value()
+        if value is None:
+            continue
+        router_ids.append(int(record["router_id"]))
+        names.append(record.values.get("router_name") or "")
+        operators.append(record.values.get("operator") or "unknown")
+        bands.append(record.values.get("band") or "unknown")
+        values.append(value)
+        times.append(record.get_time().timestamp())
+    return fleet_signal_stats(router_ids, names, operators, bands, values, times, limit)
+
+
+@router.get("/fleet/uptime")
+async def get_fleet_uptime(
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    range: str = Query("30d", description="Time range e.g. 24h, 30d, 52w (hour resolution)"),
+    target: float = Query(99.5, ge=0, le=100, description="SLA target in percent"),
+):
+    """SLA report: uptime of every active router over the range, worst first."""
+    try:
+        validate_range(range)
+    except ValueError:
+        raise HTTPException(400, "Invalid range format. Use e.g. 1h, 6h, 24h, 7d")
+
+    now = datetime.now(timezone.utc)
+    uptime = await fleet_uptime(now - timedelta(seconds=duration_seconds(range)), now)
+    routers = (await db.execute(
+        select(Router.id, Router.name).where(Router.is_active == True)
+    )).all()
+
+    rows = [
+        {"router_id": rid, "router_name": name, **uptime.get(rid, {"up_s": 0, "total_s": 0, "uptime_pct": None})}
+        for rid, name in routers
+    ]
+    for row in rows:
+        row["meets_target"] = row["uptime_pct"] is not None and row["uptime_pct"] >= target
+    rows.sort(key=lambda row: (row["uptime_pct"] is not None, row["uptime_pct"] or 0))
+
+    up = sum(row["up_s"] for row in rows)
+    total = sum(row["total_s"] for row in rows)
+    return ORJSONResponse({
+        "range": range,
+        "target": target,
+        "fleet_uptime_pct": round(up / total * 100, 3) if total else None,
+        "below_target": sum(1 for row in rows if row["uptime_pct"] is not None and not row["meets_target"]),
+        "routers": rows,
+    })
+
+
+EXPORT_MEASUREMENTS = {"signal": SIGNAL_FIELDS, "heartbeat": HEARTBEAT_FIELDS}
+EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv", "csv"),
+    "arrow": (iter_arrow, "application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+@router.get("/export")
+async def export_metrics(
+    user: dict = Depends(get_current_user),
+    measurement: str = Query("signal", description="signal or heartbeat"),
+    routers: Optional[str] = Query(None, description="Comma-separated router ids; all routers when omitted"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of the measurement's fields"),
+    range: str = Query("30d"),
+    window: Optional[str] = Query(None, description="Aggregate to this window (e.g. 1h); raw points when omitted"),
+    format: str = Query("csv", description="csv or arrow (Arrow IPC stream)"),
+):
+    """Stream history for several routers and fields as CSV or Arrow IPC, one row per router and timestamp."""
+    if measurement not in EXPORT_MEASUREMENTS:
+        raise HTTPException(400, f"Unknown measurement: {measurement}. Allowed: {', '.join(EXPORT_MEASUREMENTS)}")
+    allowed = EXPORT_MEASUREMENTS[measurement]
+    try:
+        validate_range(range)
+        names = parse_fields(fields, allowed)
+        router_ids = [int(r) for r in routers.split(",") if r.strip()] if routers else []
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    if window is not None and window not in WINDOW_LADDER:
+        raise HTTPException(400, f"Invalid window. Use one of {', '.join(WINDOW_LADDER)}")
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(400, f"Unknown format: {format}. Allowed: {', '.join(EXPORT_FORMATS)}")
+    if format == "arrow" and importlib.util.find_spec("pyarrow") is None:
+        raise HTTPException(400, "Arrow export is not available on this server (pyarrow is not installed)")
+    checkpoints = await _read_rollup_checkpoints()
+    if not source_covers(range, window, checkpoints, time.time()):
+        raise HTTPException(
+            422,
+            f"Raw points are kept {settings.INFLUX_RAW_RETENTION_DAYS} days; for a longer range "
+            f"pass a window served by the rollups ({', '.join(t['name'] for t in rollup_tiers())} or coarser)",
+        )
+
+    encode, media_type, extension = EXPORT_FORMATS[format]
+    columns = {name: allowed[name] for name in names}
+    query = _export_flux(measurement, router_ids, list(columns.values()), range, window, checkpoints)
+    rows = _export_rows(query, columns)
+    filename = f"{measurement}-{range}.{extension}"
+    # A sync iterator: Starlette pulls it from a worker thread, one chunk at a time
+    return StreamingResponse(
+        encode(rows, names),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def _export_flux(measurement: str, router_ids: list[int], fields: list[str], range_: str,
+                 window: Optional[str], checkpoints: dict) -> str:
+    selector = field_selector(measurement, fields)
+    if router_ids:
+        ids = ", ".join(f'"{rid}"' for rid in router_ids)
+        selector += f"""
+      |> filter(fn: (r) => contains(value: r.router_id, set: [{ids}]))"""
+    aggregate = ""
+    if window:
+        aggregate = f"""
+      |> group(columns: ["router_id", "router_name", "_field"])
+      |> aggregateWindow(every: {window}, fn: mean, createEmpty: false)"""
+    return f"""
+    {_source_flux(selector, range_, window, checkpoints)}{aggregate}
+      |> group(columns: ["router_id", "router_name"])
+      |> pivot(rowKey: ["_time"], columnKey: ["_field"], valueColumn: "_value")
+    """
+
+
+def _export_rows(query: str, columns: dict):
+    """Lazily map streamed Influx records to export rows (columns: export name -> Influx field)."""
+    for record in get_query_api().query_stream(query, org=settings.INFLUX_ORG):
+        values = record.values
+        yield {
+            "time": record.get_time(),
+            "router_id": int(values["router_id"]),
+            "router_name": values.get("router_name", ""),
+            **{name: values.get(field) for name, field in columns.items()},
+        }
 
 
 @router.get("/{router_id}/signal")
@@ -43,17 +392,28 @@ async def get_signal_metrics(
     router_id: int,
     user: dict = Depends(get_current_user),
     range: str = Query("24h", description="Time range e.g. 1h, 6h, 24h, 7d"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of rssi,rsrp,rsrq,sinr"),
+    max_points: int = Query(settings.METRICS_MAX_POINTS, ge=10, le=5000, description="Upper bound on points per field"),
+    downsample: Optional[str] = Query(None, pattern="^lttb$", description="lttb: keep peaks and dips when reducing"),
+    format: str = Query("points", pattern="^(points|columnar)$", description="points, or columnar (shared epoch-ms time array)"),
 ):
     try:
         validate_range(range)
     except ValueError:
         raise HTTPException(400, "Invalid range format. Use e.g. 1h, 6h, 24h, 7d")
+    try:
+        names = parse_fields(fields, SIGNAL_FIELDS)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
 
-    fields = ["rssi", "rsrp", "rsrq", "sinr"]
-    result = {}
-    for field in fields:
-        result[field] = _flux_query(router_id, "signal", field, range)
-    return {"router_id": router_id, "range": range, **result}
+    window = _query_window(range, max_points, downsample)
+    columns = await _cached_flux_query(router_id, "signal", [SIGNAL_FIELDS[n] for n in names], range, window)
+    return ORJSONResponse({
+        "router_id": router_id,
+        "range": range,
+        "window": window,
+        **_series_payload(columns, names, SIGNAL_FIELDS, max_points, downsample, format),
+    })
 
 
 @router.get("/{router_id}/heartbeat")
@@ -61,56 +421,55 @@ async def get_heartbeat_metrics(
     router_id: int,
     user: dict = Depends(get_current_user),
     range: str = Query("24h"),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of latency (SSH round trip),tcp_latency"),
+    max_points: int = Query(settings.METRICS_MAX_POINTS, ge=10, le=5000, description="Upper bound on points per field"),
+    downsample: Optional[str] = Query(None, pattern="^lttb$", description="lttb: keep peaks and dips when reducing"),
+    format: str = Query("points", pattern="^(points|columnar)$", description="points, or columnar (shared epoch-ms time array)"),
 ):
     try:
         validate_range(range)
     except ValueError:
         raise HTTPException(400, "Invalid range format. Use e.g. 1h, 6h, 24h, 7d")
+    try:
+        names = parse_fields(fields, HEARTBEAT_FIELDS)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
 
-    latency = _flux_query(router_id, "heartbeat", "latency_ms", range)
-
-    # Calculate uptime %
-    query_api = get_query_api()
-    uptime_query = f"""
-    from(bucket: "{settings.INFLUX_BUCKET}")
-      |> range(start: -{range})
-      |> filter(fn: (r) => r._measurement == "heartbeat")
-      |> filter(fn: (r) => r.router_id == "{router_id}")
-      |> filter(fn: (r) => r._field == "online")
-      |> mean()
-    """
-    tables = query_api.query(uptime_query, org=settings.INFLUX_ORG)
-    uptime_pct = 0.0
-    for table in tables:
-        for record in table.records:
-            uptime_pct = round((record.get_value() or 0) * 100, 1)
+    window = _query_window(range, max_points, downsample)
+    now = datetime.now(timezone.utc)
+    columns, uptime = await asyncio.gather(
+        _cached_flux_query(router_id, "heartbeat", [HEARTBEAT_FIELDS[n] for n in names], range, window),
+        router_uptime(router_id, now - timedelta(seconds=duration_seconds(range)), now),
+    )
 
-    return {
+    return ORJSONResponse({
         "router_id": router_id,
         "range": range,
-        "latency": latency,
-        "uptime_pct": uptime_pct,
-    }
+        "window": window,
+        **_series_payload(columns, names, HEARTBEAT_FIELDS, max_points, downsample, format),
+        "uptime_pct": uptime["uptime_pct"],
+    })
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(user: dict = Depends(get_current_user)):
+    """Hit/miss counters of the metrics query cache."""
+    return await cache_stats()
+
+
+@router.get("/writer/stats")
+async def get_writer_stats(user: dict = Depends(get_current_user)):
+    """Queued, flushed, dropped and failed-batch counts of the workers' Influx point writers."""
+    return await read_writer_stats()
 
 
 @router.get("/summary")
-async def get_all_routers_summary(user: dict = Depends(get_current_user)):
-    """Latest signal snapshot for all routers (for dashboard cards)."""
-    query_api = get_query_api()
-    query = f"""
-    from(bucket: "{settings.INFLUX_BUCKET}")
-      |> range(start: -10m)
-      |> filter(fn: (r) => r._measurement == "signal")
-      |> filter(fn: (r) => r._field == "rssi" or r._field == "rsrp")
-      |> last()
-      |> group(columns: ["router_id", "router_name", "_field"])
-    """
-    tables = query_api.query(query, org=settings.INFLUX_ORG)
-    result = {}
-    for table in tables:
-        for record in table.records:
-            rid = record["router_id"]
-            if rid not in result:
-                result[rid] = {"router_id": rid, "router_name": record.values.get("router_name", "")}
-            result[rid][record.get_field()] = record.get_value()
-    return list(result.values())
+async def get_all_routers_summary(
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Latest signal snapshot for all active routers (for dashboard cards)."""
+    routers = dict((await db.execute(
+        select(Router.id, Router.name).where(Router.is_active == True)
+    )).all())
+    return await read_summary(routers, datetime.now(timezone.utc))
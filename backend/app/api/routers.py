@@ -1,24 +1,125 @@
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+import hashlib
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import undefer
 from app.core.database import get_db
 from app.api.deps import get_current_user
-from app.models.models import Router, ScriptExecution
-from app.schemas.schemas import RouterCreate, RouterUpdate, RouterResponse, ExecuteScriptRequest, ExecutionResponse
+from app.models.models import Router, RouterPollPlan, ScriptExecution
+from app.schemas.schemas import (
+    RouterCreate,
+    RouterUpdate,
+    RouterResponse,
+    PollPlanResponse,
+    ExecuteScriptRequest,
+    ExecutionSummary,
+    ExecutionResponse,
+)
+from app.services.polling import REASON_NEW
+from app.services.snapshots import delete_snapshots
 from app.scripts.routeros import list_scripts, get_script
 from app.tasks.tasks import execute_script
-from datetime import datetime, timezone
+from app.core.config import settings
+from datetime import datetime, timedelta, timezone
 
 router = APIRouter(prefix="/routers", tags=["routers"])
 
 
+def encode_cursor(name: str, router_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([name, router_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        name, router_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(name), int(router_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def parse_tag_filters(tags: list[str]) -> list[tuple[str, Optional[str]]]:
+    """`key:value` matches a tag value, a bare `key` matches routers that have the tag."""
+    parsed = []
+    for tag in tags:
+        key, sep, value = tag.partition(":")
+        if not key:
+            raise ValueError(f"Invalid tag filter: {tag!r}")
+        parsed.append((key, value if sep else None))
+    return parsed
+
+
+def list_etag(max_updated_at, count: int, max_last_seen, query: str) -> str:
+    """
+    Validator for a router listing. updated_at moves on every edit and state
+    flip, count on deletes; the heartbeat refreshes last_seen without touching
+    updated_at, so the newest last_seen is folded in, coarsened to
+    ROUTERS_ETAG_LAST_SEEN_RESOLUTION so routine heartbeats still revalidate.
+    """
+    last_seen_bucket = int(max_last_seen.timestamp()) // settings.ROUTERS_ETAG_LAST_SEEN_RESOLUTION if max_last_seen else 0
+    raw = f"{max_updated_at.isoformat() if max_updated_at else ''}|{count}|{last_seen_bucket}|{query}"
+    return f'W/"{hashlib.sha1(raw.encode()).hexdigest()}"'
+
+
 @router.get("/", response_model=list[RouterResponse])
 async def list_routers(
+    request: Request,
+    response: Response,
     user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
+    is_online: Optional[bool] = None,
+    is_active: Optional[bool] = None,
+    location: Optional[str] = Query(None, description="Case-insensitive substring of the location"),
+    tag: list[str] = Query([], description="key:value, or key alone for routers that have the tag; repeatable"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; all routers when omitted"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
 ):
-    result = await db.execute(select(Router).order_by(Router.name))
-    return result.scalars().all()
+    """
+    Routers ordered by name. With `limit`, pages are keyset-paginated on
+    (name, id) and the next page's cursor comes back in X-Next-Cursor.
+    Responses carry an ETag; a matching If-None-Match gets 304 without the
+    rows being loaded.
+    """
+    try:
+        tag_filters = parse_tag_filters(tag)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+
+    conditions = []
+    if is_online is not None:
+        conditions.append(Router.is_online == is_online)
+    if is_active is not None:
+        conditions.append(Router.is_active == is_active)
+    if location:
+        conditions.append(Router.location.ilike(f"%{location}%"))
+    for key, value in tag_filters:
+        if value is None:
+            conditions.append(Router.tags[key].is_not(None))
+        else:
+            conditions.append(Router.tags[key].as_string() == value)
+
+    max_updated_at, count, max_last_seen = (await db.execute(
+        select(func.max(Router.updated_at), func.count(Router.id), func.max(Router.last_seen)).where(*conditions)
+    )).one()
+    etag = list_etag(max_updated_at, count, max_last_seen, request.url.query)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag in {t.strip() for t in request.headers.get("if-none-match", "").split(",")}:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+    query = select(Router).where(*conditions).order_by(Router.name, Router.id)
+    if after:
+        query = query.where(tuple_(Router.name, Router.id) > after)
+    if limit:
+        query = query.limit(limit + 1)
+    routers = (await db.execute(query)).scalars().all()
+    if limit and len(routers) > limit:
+        routers = routers[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(routers[-1].name, routers[-1].id)
+    return routers
 
 
 @router.post("/", response_model=RouterResponse)
@@ -74,26 +175,92 @@ async def delete_router(
         raise HTTPException(404, "Router not found")
     await db.delete(r)
     await db.commit()
+    await delete_snapshots(router_id)
     return {"deleted": True}
 
 
-@router.get("/{router_id}/executions", response_model=list[ExecutionResponse])
+@router.get("/{router_id}/poll-plan", response_model=PollPlanResponse)
+async def get_poll_plan(
+    router_id: int,
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """When the heartbeat will next probe this router, and why (backoff, recent change...)."""
+    r = await db.get(Router, router_id)
+    if not r:
+        raise HTTPException(404, "Router not found")
+
+    now = datetime.now(timezone.utc)
+    plan = await db.get(RouterPollPlan, router_id)
+    if not plan:
+        # Never probed yet: due on the next heartbeat tick
+        return PollPlanResponse(
+            router_id=router_id,
+            interval_s=settings.POLL_BASE_INTERVAL,
+            next_due_at=now,
+            last_polled_at=None,
+            last_change_at=None,
+            consecutive_failures=0,
+            reason=REASON_NEW,
+            due=r.is_active,
+        )
+    return PollPlanResponse(
+        router_id=router_id,
+        interval_s=plan.interval_s,
+        next_due_at=plan.next_due_at,
+        last_polled_at=plan.last_polled_at,
+        last_change_at=plan.last_change_at,
+        consecutive_failures=plan.consecutive_failures,
+        reason=plan.reason,
+        due=r.is_active and plan.next_due_at <= now,
+    )
+
+
+@router.get("/{router_id}/executions", response_model=list[ExecutionSummary])
 async def get_executions(
     router_id: int,
     limit: int = 50,
+    days: int = Query(settings.EXECUTION_HISTORY_DAYS, ge=1),
     user: dict = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
+    """
+    Execution history of the last `days` days, newest first; the window keeps
+    the query to the partitions it covers. Output and error text come from
+    the detail endpoint.
+    """
+    since = datetime.now(timezone.utc) - timedelta(days=days)
     result = await db.execute(
         select(ScriptExecution)
-        .where(ScriptExecution.router_id == router_id)
+        .where(ScriptExecution.router_id == router_id, ScriptExecution.created_at >= since)
         .order_by(ScriptExecution.created_at.desc())
         .limit(limit)
     )
     return result.scalars().all()
 
 
-@router.post("/{router_id}/execute", response_model=ExecutionResponse)
+@router.get("/{router_id}/executions/{execution_id}", response_model=ExecutionResponse)
+async def get_execution(
+    router_id: int,
+    execution_id: int,
+    created_at: Optional[datetime] = Query(None, description="The execution's created_at; narrows the lookup to one partition"),
+    user: dict = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    query = (
+        select(ScriptExecution)
+        .options(undefer(ScriptExecution.output_compressed))
+        .where(ScriptExecution.id == execution_id, ScriptExecution.router_id == router_id)
+    )
+    if created_at is not None:
+        query = query.where(ScriptExecution.created_at == created_at)
+    execution = (await db.execute(query)).scalar_one_or_none()
+    if not execution:
+        raise HTTPException(404, "Execution not found")
+    return execution
+
+
+@router.post("/{router_id}/execute", response_model=ExecutionSummary)
 async def run_script(
     router_id: int,
     req: ExecuteScriptRequest,
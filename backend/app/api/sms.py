@@ -12,7 +12,9 @@ from app.services.sms import (
     validate_twilio_request,
     HELP_MESSAGE,
 )
-from app.tasks.tasks import execute_script
+from app.tasks.tasks import execute_script, execution_event
+from app.services.events import publish
+from app.tasks.runtime import run_async
 from app.core.config import settings
 
 router = APIRouter(prefix="/sms", tags=["sms"])
@@ -114,36 +116,40 @@ from app.scripts.routeros import get_script, parse_kv_output
 @celery_app.task(name="app.api.sms.execute_script_with_sms_reply")
 def execute_script_with_sms_reply(execution_id: int, reply_to: str):
     """Execute script and send result via SMS."""
-    import asyncio
-    from sqlalchemy.orm import Session
+    message = run_async(_execute_script_for_sms(execution_id))
+    # Twilio's client is blocking, so send from the task thread, not the shared loop
+    send_sms(reply_to, message)
+
+
+async def _execute_script_for_sms(execution_id: int) -> str:
     from app.models.models import ScriptExecution, Router
-    from app.core.database import get_sync_engine
+    from app.tasks.runtime import task_session
     from datetime import datetime, timezone
 
-    engine = get_sync_engine()
-
-    with Session(engine) as session:
-        execution = session.get(ScriptExecution, execution_id)
-        router = session.get(Router, execution.router_id)
+    async with task_session() as session:
+        execution = await session.get(ScriptExecution, execution_id)
+        router = await session.get(Router, execution.router_id)
         script = get_script(execution.script_name)
 
         execution.status = "running"
-        session.commit()
+        await session.commit()
+        await publish(execution_event(execution))
 
-        result = asyncio.run(run_ssh_command(
+        result = await run_ssh_command(
             router.ip_address,
             script["command"],
             port=router.ssh_port,
             username=router.ssh_user,
             password=router.ssh_password,
-        ))
+        )
 
         execution.status = "success" if result.success else "error"
         execution.output = result.stdout
         execution.error = result.stderr if not result.success else None
         execution.duration_ms = result.duration_ms
         execution.completed_at = datetime.now(timezone.utc)
-        session.commit()
+        await session.commit()
+        await publish(execution_event(execution))
 
         # Format SMS reply (160 char chunks)
         if result.success:
@@ -151,8 +157,5 @@ def execute_script_with_sms_reply(execution_id: int, reply_to: str):
             lines = [f"✓ {router.name} - {execution.script_name.upper()}"]
             for k, v in list(data.items())[:8]:
                 lines.append(f"{k}: {v}")
-            message = "\n".join(lines)[:1500]
-        else:
-            message = f"✗ Error on {router.name}:\n{result.stderr[:200]}"
-
-        send_sms(reply_to, message)
+            return "\n".join(lines)[:1500]
+        return f"✗ Error on {router.name}:\n{result.stderr[:200]}"
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -11,6 +11,19 @@ class Settings(BaseSettings):
     INFLUX_TOKEN: str
     INFLUX_ORG: str
     INFLUX_BUCKET: str
+    INFLUX_BATCH_SIZE: int = 1000
+    INFLUX_FLUSH_INTERVAL: float = 1.0  # seconds
+    INFLUX_MAX_BUFFER: int = 50000  # points held in memory before writers block/drop
+    INFLUX_BLOCK_TIMEOUT: float = 5.0  # seconds a writer waits on a full buffer
+    INFLUX_QUERY_WORKERS: int = 8  # concurrent Influx queries per API process
+    INFLUX_RAW_RETENTION_DAYS: int = 0  # 0 = keep forever; shortening needs the apply_raw_retention task
+    INFLUX_ROLLUP_5M_RETENTION_DAYS: int = 180
+    INFLUX_ROLLUP_1H_RETENTION_DAYS: int = 1825
+
+    # Rollups (see app.services.rollups)
+    ROLLUP_INTERVAL: int = 300  # seconds between rollup runs
+    ROLLUP_LAG: int = 120  # seconds a window must be closed before it is rolled up
+    ROLLUP_MAX_SPAN: int = 86400  # seconds of source data rolled up per tier per run
 
     # Redis
     REDIS_URL: str
@@ -33,10 +46,65 @@ class Settings(BaseSettings):
     TWILIO_PHONE_NUMBER: str
     SMS_WHITELIST: str = ""  # comma-separated phone numbers
 
+    # Celery worker
+    WORKER_CONCURRENCY: int = 8  # task threads per worker; also the worker's DB pool size
+
     # SSH
     SSH_DEFAULT_USER: str = "admin"
     SSH_DEFAULT_PORT: int = 22
     SSH_TIMEOUT: int = 30
+    SSH_POOL_MAX_CONNECTIONS: int = 500
+    SSH_POOL_IDLE_TIMEOUT: int = 300  # seconds before an unused connection is closed
+    SSH_KEEPALIVE_INTERVAL: int = 30
+
+    # Heartbeat
+    HEARTBEAT_INTERVAL: int = 20  # seconds between beat ticks; each tick probes the routers that are due
+    HEARTBEAT_TCP_TIMEOUT: float = 3.0
+    HEARTBEAT_SSH_EVERY: int = 5  # full SSH check once per N base intervals (per router, from its last one) for routers that stay online
+    HEARTBEAT_CONCURRENCY: int = 100  # max routers probed at once per cycle
+    HEARTBEAT_DEADLINE: int = 18  # seconds; must stay below HEARTBEAT_INTERVAL
+    HEARTBEAT_SHARDS: int = 8  # one task per shard; match the worker concurrency
+    HEARTBEAT_JITTER: float = 2.0  # max random delay (seconds) before a shard starts
+
+    # Uptime accounting (see app.services.uptime)
+    UPTIME_MAX_GAP: int = 1800  # seconds credited at most per probe; longer gaps mean the heartbeat was down
+    UPTIME_HOURLY_RETENTION_DAYS: int = 35
+    UPTIME_DAILY_RETENTION_DAYS: int = 800
+    UPTIME_MONTHLY_RETENTION_DAYS: int = 1830
+
+    # Adaptive polling (per-router intervals, see app.services.polling)
+    POLL_BASE_INTERVAL: int = 60  # stable routers
+    POLL_FAST_INTERVAL: int = 20  # after a state change; no faster than HEARTBEAT_INTERVAL
+    POLL_FAST_WINDOW: int = 600  # seconds the fast interval lasts after a change
+    POLL_MAX_INTERVAL: int = 900  # backoff cap for routers that stay offline
+
+    # Fleet signal sweep
+    SIGNAL_SWEEP_INTERVAL: int = 300  # seconds
+    SIGNAL_SWEEP_CONCURRENCY: int = 50
+    SIGNAL_SWEEP_DEADLINE: int = 240  # seconds; must stay below SIGNAL_SWEEP_INTERVAL
+
+    # Metrics API
+    METRICS_MAX_POINTS: int = 500  # default points per field returned to charts
+    METRICS_LTTB_OVERSAMPLE: int = 4  # raw points fetched per returned point when downsampling
+    METRICS_FLEET_SAMPLES: int = 48  # windowed samples per router in fleet analytics
+    SUMMARY_MAX_AGE: int = 600  # seconds; older signal snapshots are left out of /metrics/summary
+
+    # Script executions
+    EXECUTION_OUTPUT_MAX_BYTES: int = 1_000_000  # stdout kept per execution; the rest is cut and flagged
+    EXECUTION_HISTORY_DAYS: int = 90  # default window of the history listing; bounds the partitions scanned
+
+    # History partitions (see app.services.partitions)
+    EXECUTION_RETENTION_MONTHS: int = 12
+    ALERT_RETENTION_MONTHS: int = 12
+    PARTITION_PREMAKE_MONTHS: int = 3  # future monthly partitions kept ready
+    PARTITION_EXPIRED_ACTION: Literal["drop", "detach"] = "drop"  # detach leaves the table for archiving
+    PARTITION_MAINTENANCE_INTERVAL: int = 21600  # seconds
+
+    # Router listing
+    ROUTERS_ETAG_LAST_SEEN_RESOLUTION: int = 60  # seconds; how stale list last_seen may get behind a 304
+
+    # Live events
+    EVENTS_KEEPALIVE_INTERVAL: float = 15.0  # seconds between SSE comments on an idle stream
 
     # Frontend
     NEXT_PUBLIC_API_URL: str = "http://localhost/api"
@@ -1,4 +1,3 @@
-from sqlalchemy import create_engine as _create_sync_engine
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
@@ -19,12 +18,12 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
-_sync_engine = None
-
-
-def get_sync_engine():
-    global _sync_engine
-    if _sync_engine is None:
-        sync_url = settings.DATABASE_URL.replace("+asyncpg", "")
-        _sync_engine = _create_sync_engine(sync_url, pool_pre_ping=True)
-    return _sync_engine
+def create_worker_engine(pool_size: int):
+    """Engine for a Celery worker process; one pooled connection per concurrent task."""
+    return create_async_engine(
+        settings.DATABASE_URL,
+        echo=False,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=0,
+    )
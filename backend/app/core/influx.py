@@ -1,7 +1,20 @@
-from influxdb_client import InfluxDBClient
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Optional
+from influxdb_client import BucketRetentionRules, InfluxDBClient
 from influxdb_client.client.write_api import SYNCHRONOUS
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+ASYNC_WAIT_STEP = 0.05  # seconds write_async() sleeps between checks for room
+
 _client = InfluxDBClient(
     url=settings.INFLUX_URL,
     token=settings.INFLUX_TOKEN,
@@ -18,3 +31,253 @@ def get_write_api():
 
 def get_query_api():
     return query_api
+
+
+def ensure_bucket(name: str, retention_days: int, shorten: bool = False):
+    """
+    Create the bucket if missing, else bring its retention up to `retention_days`
+    (0 days = keep forever). An existing retention is only shortened with
+    `shorten=True`: Influx deletes the older data as soon as it applies.
+    """
+    buckets_api = _client.buckets_api()
+    rules = BucketRetentionRules(type="expire", every_seconds=retention_days * 86400)
+    bucket = buckets_api.find_bucket_by_name(name)
+    if bucket is None:
+        buckets_api.create_bucket(bucket_name=name, retention_rules=rules, org=settings.INFLUX_ORG)
+        logger.info("Created Influx bucket %s (retention %sd)", name, retention_days)
+        return
+    current = bucket.retention_rules[0].every_seconds if bucket.retention_rules else 0
+    if current == rules.every_seconds:
+        return
+    if is_shorter_retention(rules.every_seconds, current) and not shorten:
+        logger.warning(
+            "Keeping retention of Influx bucket %s at %ss; shortening it to %sd has to be applied explicitly",
+            name, current, retention_days,
+        )
+        return
+    bucket.retention_rules = [rules]
+    buckets_api.update_bucket(bucket=bucket)
+    logger.info("Updated retention of Influx bucket %s to %sd", name, retention_days)
+
+
+def is_shorter_retention(wanted_s: int, current_s: int) -> bool:
+    """Whether retention `wanted_s` keeps less than `current_s` (0 = forever)."""
+    return wanted_s != 0 and (current_s == 0 or wanted_s < current_s)
+
+
+# --- Non-blocking queries for the API ---
+# influxdb_client's query API is blocking, so async handlers run queries (and
+# the parsing of their results) on a dedicated, bounded thread pool instead of
+# the event loop. The pool is started and stopped by the API lifespan.
+
+_query_executor = None
+
+
+def start_query_executor():
+    global _query_executor
+    if _query_executor is None:
+        _query_executor = ThreadPoolExecutor(
+            max_workers=settings.INFLUX_QUERY_WORKERS, thread_name_prefix="influx-query"
+        )
+
+
+def shutdown_influx():
+    global _query_executor
+    if _query_executor is not None:
+        executor, _query_executor = _query_executor, None
+        executor.shutdown(wait=True, cancel_futures=True)
+    _client.close()
+
+
+async def run_in_query_executor(fn, *args, **kwargs):
+    """Run a blocking Influx call (or a function making them) without stalling the event loop."""
+    start_query_executor()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_query_executor, partial(fn, *args, **kwargs))
+
+
+class BufferedPointWriter:
+    """
+    Collects points in memory and writes them to Influx in batches, either when
+    `batch_size` points are waiting or every `flush_interval` seconds.
+
+    The buffer holds at most `max_buffer` points. When it is full, callers
+    wait up to `block_timeout` seconds for the flusher to catch up before the
+    remaining points are dropped: write() blocks its thread, write_async()
+    yields to the event loop between checks. offer() never waits. Failed
+    batches are put back at the front of the buffer (as far as it has room)
+    and retried on the next flush.
+    """
+
+    def __init__(self, write_api, bucket: str, org: str, batch_size: int, flush_interval: float,
+                 max_buffer: int, block_timeout: float):
+        self._write_api = write_api
+        self.bucket = bucket
+        self.org = org
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_buffer = max(self.batch_size, max_buffer)
+        self.block_timeout = block_timeout
+
+        self._buffer = deque()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._pid = None
+        self._closed = False
+
+        self.queued = 0
+        self.flushed = 0
+        self.dropped = 0
+        self.failed_batches = 0
+
+    def write(self, records, timeout: Optional[float] = None):
+        """Queue a Point or a list of Points, waiting up to `timeout` (default block_timeout) for room."""
+        records = self._as_list(records)
+        deadline = time.monotonic() + (self.block_timeout if timeout is None else timeout)
+        queued = self._put(records, deadline)
+        self._drop(len(records) - queued)
+
+    async def write_async(self, records, timeout: Optional[float] = None):
+        """write() for coroutines: waits for room by sleeping on the loop, not by blocking it."""
+        records = self._as_list(records)
+        deadline = time.monotonic() + (self.block_timeout if timeout is None else timeout)
+        while True:
+            records = records[self._put(records, 0):]
+            remaining = deadline - time.monotonic()
+            if not records or remaining <= 0 or self._closed:
+                break
+            await asyncio.sleep(min(ASYNC_WAIT_STEP, remaining))
+        self._drop(len(records))
+
+    def offer(self, records):
+        """Queue what fits without waiting and count the rest as dropped."""
+        self.write(records, timeout=0)
+
+    def flush(self):
+        """Write everything buffered so far from the calling thread."""
+        while True:
+            with self._cond:
+                batch = self._take_batch()
+            if not batch or not self._send(batch):
+                return
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None and self._pid == os.getpid():
+            self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "queued": self.queued,
+                "flushed": self.flushed,
+                "dropped": self.dropped,
+                "failed_batches": self.failed_batches,
+                "buffered": len(self._buffer),
+            }
+
+    def _as_list(self, records) -> list:
+        self._ensure_flusher()
+        return list(records) if isinstance(records, (list, tuple)) else [records]
+
+    def _put(self, records: list, deadline: float) -> int:
+        """Queue `records` in order until one does not fit by `deadline`; returns how many were queued."""
+        queued = 0
+        with self._cond:
+            for point in records:
+                while len(self._buffer) >= self.max_buffer and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.notify_all()
+                    self._cond.wait(remaining)
+                if len(self._buffer) >= self.max_buffer:
+                    self._cond.notify_all()  # make sure the flusher is working on it
+                    break
+                self._buffer.append(point)
+                queued += 1
+            self.queued += queued
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify_all()
+        return queued
+
+    def _drop(self, count: int):
+        if not count:
+            return
+        with self._cond:
+            self.dropped += count
+            total_dropped = self.dropped
+        logger.warning("Influx point buffer full: dropped %d points (%d dropped in total)", count, total_dropped)
+
+    def _ensure_flusher(self):
+        # Threads do not survive a fork, so each (Celery prefork) process starts its own
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._cond:
+            if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="influx-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if len(self._buffer) < self.batch_size and not self._closed:
+                    self._cond.wait(self.flush_interval)
+                if self._closed:
+                    return
+                batch = self._take_batch()
+            if batch and not self._send(batch):
+                # Influx is unhappy; back off for one interval before retrying
+                time.sleep(self.flush_interval)
+
+    def _take_batch(self) -> list:
+        count = min(self.batch_size, len(self._buffer))
+        batch = [self._buffer.popleft() for _ in range(count)]
+        if batch:
+            self._cond.notify_all()  # wake writers blocked on a full buffer
+        return batch
+
+    def _send(self, batch: list) -> bool:
+        try:
+            self._write_api.write(bucket=self.bucket, org=self.org, record=batch)
+        except Exception as e:
+            with self._cond:
+                self.failed_batches += 1
+                room = self.max_buffer - len(self._buffer)
+                keep = batch[:max(0, room)]
+                self.dropped += len(batch) - len(keep)
+                self._buffer.extendleft(reversed(keep))
+                failed_batches, dropped = self.failed_batches, self.dropped
+            logger.warning(
+                "Influx batch write of %d points failed: %s (%d requeued; %d failed batches, %d points dropped in total)",
+                len(batch), e, len(keep), failed_batches, dropped,
+            )
+            return False
+        with self._cond:
+            self.flushed += len(batch)
+            flushed = self.flushed
+        logger.debug("Influx batch of %d points written (%d flushed in total)", len(batch), flushed)
+        return True
+
+
+_point_writer = None
+
+
+def get_point_writer() -> BufferedPointWriter:
+    global _point_writer
+    if _point_writer is None:
+        _point_writer = BufferedPointWriter(
+            write_api,
+            bucket=settings.INFLUX_BUCKET,
+            org=settings.INFLUX_ORG,
+            batch_size=settings.INFLUX_BATCH_SIZE,
+            flush_interval=settings.INFLUX_FLUSH_INTERVAL,
+            max_buffer=settings.INFLUX_MAX_BUFFER,
+            block_timeout=settings.INFLUX_BLOCK_TIMEOUT,
+        )
+    return _point_writer
@@ -0,0 +1,59 @@
+import asyncio
+import secrets
+from contextlib import contextmanager
+import redis
+import redis.asyncio as aioredis
+from app.core.config import settings
+
+_client = None
+_async_clients: dict = {}
+
+# Delete the lease only if we still own it (it may have expired and been taken over)
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+def get_redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(settings.REDIS_URL)
+    return _client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Async client for the running event loop (redis.asyncio connections are loop-bound)."""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        for stale in [l for l in _async_clients if l.is_closed()]:
+            del _async_clients[stale]
+        client = _async_clients[loop] = aioredis.Redis.from_url(settings.REDIS_URL)
+    return client
+
+
+async def close_async_redis():
+    """Close the client bound to the running loop (API shutdown)."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+@contextmanager
+def lease(name: str, ttl: int):
+    """
+    Best-effort distributed lock. Yields True if the lease was acquired, False
+    if someone else holds it. The TTL bounds how long a crashed holder blocks others.
+    """
+    key = f"lease:{name}"
+    token = secrets.token_hex(16)
+    client = get_redis()
+    acquired = bool(client.set(key, token, nx=True, ex=ttl))
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            client.eval(_RELEASE_SCRIPT, 1, key, token)
@@ -1,15 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
-from app.core.database import engine, Base
-from app.api import routers, auth, sms, metrics
+from app.core.database import engine
+from app.core.influx import start_query_executor, shutdown_influx
+from app.core.redis import close_async_redis
+from app.services.events import get_broker
+from app.api import routers, auth, sms, metrics, events
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Create tables on startup
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Schema is managed by Alembic (alembic upgrade head), not at startup
+    start_query_executor()
+    get_broker().start()
     yield
+    await get_broker().stop()
+    await close_async_redis()
+    shutdown_influx()
+    await engine.dispose()
 
 
 app = FastAPI(
@@ -24,12 +31,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 app.include_router(auth.router, prefix="/api")
 app.include_router(routers.router, prefix="/api")
 app.include_router(sms.router, prefix="/api")
 app.include_router(metrics.router, prefix="/api")
+app.include_router(events.router, prefix="/api")
 
 
 @app.get("/api/health")
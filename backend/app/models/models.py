@@ -1,13 +1,19 @@
-from sqlalchemy import String, Integer, Boolean, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import String, Integer, Boolean, DateTime, Text, ForeignKey, JSON, Index, LargeBinary, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql import func
+from app.core.config import settings
 from app.core.database import Base
+from app.services.execution_output import pack_output, unpack_output
 from datetime import datetime
 from typing import Optional
 
 
 class Router(Base):
     __tablename__ = "routers"
+    __table_args__ = (
+        # Heartbeat, signal sweep and the dashboard list only active routers, by name
+        Index("ix_routers_active_name", "name", "id", postgresql_where=text("is_active")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
@@ -27,6 +33,25 @@ class Router(Base):
 
     executions: Mapped[list["ScriptExecution"]] = relationship("ScriptExecution", back_populates="router")
     alerts: Mapped[list["Alert"]] = relationship("Alert", back_populates="router")
+    poll_plan: Mapped[Optional["RouterPollPlan"]] = relationship(
+        "RouterPollPlan", back_populates="router", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+
+class RouterPollPlan(Base):
+    """When a router is next due for a heartbeat probe, and why (see app.services.polling)."""
+    __tablename__ = "router_poll_plans"
+
+    router_id: Mapped[int] = mapped_column(ForeignKey("routers.id", ondelete="CASCADE"), primary_key=True)
+    interval_s: Mapped[int] = mapped_column(Integer, nullable=False)
+    next_due_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_polled_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_change_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_ssh_check_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    consecutive_failures: Mapped[int] = mapped_column(Integer, default=0)
+    reason: Mapped[str] = mapped_column(String(20), nullable=False)  # stable|recent_change|offline_backoff
+
+    router: Mapped["Router"] = relationship("Router", back_populates="poll_plan")
 
 
 class User(Base):
@@ -44,6 +69,10 @@ class User(Base):
 
 class MagicLink(Base):
     __tablename__ = "magic_links"
+    __table_args__ = (
+        # Login looks tokens up among the unused ones only
+        Index("ix_magic_links_unused_token", "token", postgresql_where=text("NOT used")),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
@@ -56,33 +85,66 @@ class MagicLink(Base):
 
 
 class ScriptExecution(Base):
+    """Partitioned by month on created_at (see app.services.partitions)."""
     __tablename__ = "script_executions"
-
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    __table_args__ = (
+        # Execution history: newest first per router
+        Index("ix_script_executions_router_created", "router_id", text("created_at DESC")),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    # The table key must include the partition column; id alone identifies a row
+    __mapper_args__ = {"primary_key": ["id"]}
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     router_id: Mapped[int] = mapped_column(ForeignKey("routers.id"))
     script_name: Mapped[str] = mapped_column(String(100), nullable=False)
     triggered_by: Mapped[str] = mapped_column(String(50), default="ui")  # ui | sms | schedule
     triggered_by_user: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     status: Mapped[str] = mapped_column(String(20), default="pending")  # pending|running|success|error
-    output: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Compressed stdout (see app.services.execution_output); only loaded when asked for
+    output_compressed: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True)
+    output_size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # bytes before truncation
+    output_truncated: Mapped[bool] = mapped_column(Boolean, default=False)
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     duration_ms: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
 
     router: Mapped["Router"] = relationship("Router", back_populates="executions")
 
+    @property
+    def output(self) -> Optional[str]:
+        # Loading the deferred column from an async session needs undefer() up front
+        return unpack_output(self.output_compressed)
+
+    @output.setter
+    def output(self, text: Optional[str]):
+        self.output_compressed, self.output_size, self.output_truncated = pack_output(
+            text, settings.EXECUTION_OUTPUT_MAX_BYTES
+        )
+
 
 class Alert(Base):
+    """Partitioned by month on created_at (see app.services.partitions)."""
     __tablename__ = "alerts"
-
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    __table_args__ = (
+        Index(
+            "ix_alerts_unresolved_router_created",
+            "router_id",
+            text("created_at DESC"),
+            postgresql_where=text("NOT resolved"),
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     router_id: Mapped[int] = mapped_column(ForeignKey("routers.id"))
     alert_type: Mapped[str] = mapped_column(String(50), nullable=False)  # offline|low_signal|sim_error
     message: Mapped[str] = mapped_column(Text, nullable=False)
     severity: Mapped[str] = mapped_column(String(20), default="warning")  # info|warning|critical
     resolved: Mapped[bool] = mapped_column(Boolean, default=False)
     resolved_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), primary_key=True, server_default=func.now())
 
     router: Mapped["Router"] = relationship("Router", back_populates="alerts")
@@ -49,6 +49,20 @@ class RouterResponse(BaseModel):
         from_attributes = True
 
 
+class PollPlanResponse(BaseModel):
+    router_id: int
+    interval_s: int
+    next_due_at: datetime
+    last_polled_at: Optional[datetime]
+    last_change_at: Optional[datetime]
+    consecutive_failures: int
+    reason: str
+    due: bool
+
+    class Config:
+        from_attributes = True
+
+
 # --- Auth ---
 
 class MagicLinkRequest(BaseModel):
@@ -73,15 +87,16 @@ class ExecuteScriptRequest(BaseModel):
     triggered_by_user: Optional[str] = None
 
 
-class ExecutionResponse(BaseModel):
+class ExecutionSummary(BaseModel):
+    """History row: status and timing, without output or error text."""
     id: int
     router_id: int
     script_name: str
     triggered_by: str
     status: str
-    output: Optional[str]
-    error: Optional[str]
     duration_ms: Optional[int]
+    output_size: Optional[int]
+    output_truncated: bool
     created_at: datetime
     completed_at: Optional[datetime]
 
@@ -89,6 +104,11 @@ class ExecutionResponse(BaseModel):
         from_attributes = True
 
 
+class ExecutionResponse(ExecutionSummary):
+    output: Optional[str]
+    error: Optional[str]
+
+
 # --- Alerts ---
 
 class AlertResponse(BaseModel):
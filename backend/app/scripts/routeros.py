@@ -3,6 +3,7 @@ RouterOS script library.
 Each script returns a command string to execute via SSH.
 Output is parsed by the corresponding parser function.
 """
+import re
 from typing import Optional
 
 
@@ -110,3 +111,63 @@ def parse_kv_output(output: str) -> dict:
             key, _, value = line.partition("=")
             result[key.strip()] = value.strip()
     return result
+
+
+# --- Collector mode: several scripts over one SSH round-trip ---
+
+COLLECTOR_SECTION_PREFIX = ">>> section="
+
+
+def build_collector(names: list[str]) -> str:
+    """
+    Combine registered scripts into one RouterOS invocation. Each script runs in
+    its own :do block (so its :local variables stay scoped and a failure does
+    not abort the others) behind a section header line.
+    """
+    parts = []
+    for name in names:
+        script = get_script(name)
+        if not script:
+            raise ValueError(f"Unknown script: {name}")
+        parts.append(
+            f':put "{COLLECTOR_SECTION_PREFIX}{name}";\n'
+            f":do {{\n{script['command']}\n}} on-error={{ :put \"collector-error=1\" }};"
+        )
+    return "\n".join(parts)
+
+
+def split_collector_output(output: str) -> dict[str, str]:
+    """Split collector stdout back into {script name: that script's output}."""
+    sections: dict[str, list[str]] = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith(COLLECTOR_SECTION_PREFIX):
+            current = line[len(COLLECTOR_SECTION_PREFIX):].strip()
+            sections[current] = []
+        elif current is not None:
+            sections[current].append(line)
+    return {name: "\n".join(lines) for name, lines in sections.items()}
+
+
+_DURATION_UNITS = {"w": 604800, "d": 86400, "h": 3600, "m": 60, "s": 1}
+_DURATION_PART = re.compile(r"(\d+)([wdhms])")
+_CLOCK_PART = re.compile(r"(\d+):(\d{2}):(\d{2})$")
+
+
+def parse_routeros_duration(value: str) -> Optional[int]:
+    """Parse RouterOS durations like '1w2d03:04:05' or '2d3h4m5s' into seconds."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    seconds = 0
+    clock = _CLOCK_PART.search(value)
+    if clock:
+        h, m, s = (int(x) for x in clock.groups())
+        seconds += h * 3600 + m * 60 + s
+        value = value[:clock.start()]
+    parts = _DURATION_PART.findall(value)
+    if not parts and not clock:
+        return None
+    for amount, unit in parts:
+        seconds += int(amount) * _DURATION_UNITS[unit]
+    return seconds
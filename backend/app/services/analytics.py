@@ -0,0 +1,84 @@
+"""
+Fleet-wide signal statistics.
+
+Input is one row per (router, window) sample as parallel sequences, straight
+from a grouped Flux query; everything is computed on NumPy arrays so the cost
+stays in C whatever the fleet size. All signal fields are "higher is better",
+so `top` lists the best routers and `bottom` the worst.
+"""
+import numpy as np
+
+PERCENTILES = [5, 25, 50, 75, 95]
+
+
+def _round(values) -> list:
+    return [round(float(v), 2) for v in values]
+
+
+def _distribution(values: np.ndarray) -> dict:
+    stats = dict(zip((f"p{p}" for p in PERCENTILES), _round(np.percentile(values, PERCENTILES))))
+    return {"mean": round(float(values.mean()), 2), **stats}
+
+
+def _grouped(keys: np.ndarray, values: np.ndarray):
+    """Yield (key, values) per distinct key, via one sort instead of a mask per key."""
+    order = np.argsort(keys, kind="stable")
+    keys, values = keys[order], values[order]
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    for key, chunk in zip(keys[starts], np.split(values, starts[1:])):
+        yield key, chunk
+
+
+def _breakdown(labels: np.ndarray, router_codes: np.ndarray, values: np.ndarray, name: str) -> list[dict]:
+    rows = []
+    for label, idx in _grouped(labels, np.arange(len(values))):
+        rows.append({
+            name: str(label),
+            "routers": int(len(np.unique(router_codes[idx]))),
+            "samples": int(len(idx)),
+            **_distribution(values[idx]),
+        })
+    return sorted(rows, key=lambda row: row["mean"])
+
+
+def fleet_signal_stats(router_ids, router_names, operators, bands, values, times, limit: int) -> dict:
+    """
+    Percentiles across routers (of each router's mean), top/bottom `limit`
+    routers by mean, and sample distributions per operator and per band.
+    `times` (epoch seconds) picks each router's latest name; Flux returns
+    rows series by series, not in time order.
+    """
+    values = np.asarray(values, dtype=float)
+    if len(values) == 0:
+        return {"routers": 0, "samples": 0, "distribution": None, "top": [], "bottom": [],
+                "by_operator": [], "by_band": []}
+
+    ids, codes = np.unique(np.asarray(router_ids), return_inverse=True)
+    counts = np.bincount(codes)
+    means = np.bincount(codes, weights=values) / counts
+    order = np.lexsort((np.asarray(times, dtype=float), codes))  # by router, then time
+    starts = np.r_[0, np.cumsum(counts)[:-1]]
+    mins = np.minimum.reduceat(values[order], starts)
+    maxs = np.maximum.reduceat(values[order], starts)
+    names = np.asarray(router_names, dtype=object)[order][starts + counts - 1]  # latest name
+
+    def _router(i) -> dict:
+        return {
+            "router_id": int(ids[i]),
+            "router_name": names[i],
+            "mean": round(float(means[i]), 2),
+            "min": round(float(mins[i]), 2),
+            "max": round(float(maxs[i]), 2),
+            "samples": int(counts[i]),
+        }
+
+    ranking = np.argsort(means, kind="stable")
+    return {
+        "routers": int(len(ids)),
+        "samples": int(len(values)),
+        "distribution": _distribution(means),
+        "top": [_router(i) for i in ranking[::-1][:limit]],
+        "bottom": [_router(i) for i in ranking[:limit]],
+        "by_operator": _breakdown(np.asarray(operators, dtype=str), codes, values, "operator"),
+        "by_band": _breakdown(np.asarray(bands, dtype=str), codes, values, "band"),
+    }
@@ -0,0 +1,112 @@
+"""
+Live fleet events over Redis pub/sub.
+
+Celery tasks publish small JSON events on one channel; each API process keeps
+a single subscription (EventBroker) and fans events out to its connected
+stream clients, each with an optional router filter. Event shapes:
+
+    {"type": "router.status", "router_id": 1, "is_online": false, "last_seen": ..., "at": ...}
+    {"type": "routers.seen", "router_ids": [1, 2], "at": ...}   # heartbeat refreshed last_seen
+    {"type": "alert.created", "router_id": 1, "alert_type": "offline", "message": ..., "severity": ..., "at": ...}
+    {"type": "execution.status", "router_id": 1, "execution_id": 7, "script_name": ..., "status": ..., "at": ...}
+"""
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Optional
+from redis.exceptions import RedisError
+from app.core.redis import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "events"
+SUBSCRIBER_QUEUE_SIZE = 256
+
+
+def make_event(type_: str, **data) -> dict:
+    return {"type": type_, **data, "at": datetime.now(timezone.utc).isoformat()}
+
+
+async def publish(*events: dict):
+    """Best-effort: a Redis failure is logged and swallowed, so callers never fail on it."""
+    if not events:
+        return
+    try:
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            for event in events:
+                pipe.publish(CHANNEL, json.dumps(event, default=str))
+            await pipe.execute()
+    except RedisError as e:
+        logger.warning("Publishing %d events failed: %s", len(events), e)
+
+
+def filter_event(event: dict, routers: Optional[set[int]]) -> Optional[dict]:
+    """The part of `event` a subscriber filtered to `routers` should see (None: nothing)."""
+    if routers is None:
+        return event
+    if "router_ids" in event:
+        ids = [rid for rid in event["router_ids"] if rid in routers]
+        return {**event, "router_ids": ids} if ids else None
+    return event if event.get("router_id") in routers else None
+
+
+class EventBroker:
+    """One Redis subscription per API process, fanned out to in-process queues."""
+
+    def __init__(self):
+        self._subscribers: dict[asyncio.Queue, Optional[set[int]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            task, self._task = self._task, None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    def subscribe(self, routers: Optional[set[int]] = None) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers[queue] = routers
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.pop(queue, None)
+
+    def dispatch(self, event: dict):
+        for queue, routers in list(self._subscribers.items()):
+            visible = filter_event(event, routers)
+            if visible is None:
+                continue
+            if queue.full():
+                queue.get_nowait()  # a stalled client loses its oldest event, not the others' stream
+            queue.put_nowait(visible)
+
+    async def _run(self):
+        while True:
+            pubsub = get_async_redis().pubsub()
+            try:
+                await pubsub.subscribe(CHANNEL)
+                async for message in pubsub.listen():
+                    if message["type"] == "message":
+                        self.dispatch(json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Event subscription failed, resubscribing")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+_broker: Optional[EventBroker] = None
+
+
+def get_broker() -> EventBroker:
+    global _broker
+    if _broker is None:
+        _broker = EventBroker()
+    return _broker
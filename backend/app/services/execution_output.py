@@ -0,0 +1,26 @@
+"""
+Storage format of script execution output: UTF-8, capped at
+EXECUTION_OUTPUT_MAX_BYTES, zlib-compressed. RouterOS print/log output is
+highly repetitive text and typically shrinks 5-10x.
+"""
+import zlib
+from typing import Optional
+
+
+def pack_output(text: Optional[str], max_bytes: int) -> tuple[Optional[bytes], Optional[int], bool]:
+    """Returns (compressed, original size in bytes, truncated)."""
+    if text is None:
+        return None, None, False
+    raw = text.encode("utf-8")
+    size = len(raw)
+    truncated = size > max_bytes
+    if truncated:
+        # Cut on a character boundary
+        raw = raw[:max_bytes].decode("utf-8", errors="ignore").encode("utf-8")
+    return zlib.compress(raw, 6), size, truncated
+
+
+def unpack_output(blob: Optional[bytes]) -> Optional[str]:
+    if blob is None:
+        return None
+    return zlib.decompress(blob).decode("utf-8")
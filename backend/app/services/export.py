@@ -0,0 +1,84 @@
+"""
+Streaming encoders for bulk metric exports.
+
+Rows arrive from a lazily consumed Influx stream and leave as encoded chunks of
+at most EXPORT_CHUNK_ROWS rows, so memory use is bounded by the chunk size, not
+by the range or the number of routers exported. Each row is a dict with
+"time", "router_id", "router_name" and one key per exported field.
+"""
+import csv
+import io
+from itertools import islice
+from typing import Iterable, Iterator
+
+EXPORT_CHUNK_ROWS = 5000
+
+
+def _chunks(rows: Iterable[dict]) -> Iterator[list[dict]]:
+    rows = iter(rows)
+    while chunk := list(islice(rows, EXPORT_CHUNK_ROWS)):
+        yield chunk
+
+
+def iter_csv(rows: Iterable[dict], fields: list[str]) -> Iterator[str]:
+    columns = ["time", "router_id", "router_name", *fields]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for chunk in _chunks(rows):
+        for row in chunk:
+            writer.writerow([
+                row["time"].isoformat(),
+                row["router_id"],
+                row["router_name"],
+                *("" if row.get(f) is None else row[f] for f in fields),
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+class _ChunkSink:
+    """Minimal writable file for pyarrow that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self.closed = False
+
+    def write(self, data) -> int:
+        self._parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data, self._parts = b"".join(self._parts), []
+        return data
+
+
+def iter_arrow(rows: Iterable[dict], fields: list[str]) -> Iterator[bytes]:
+    """Arrow IPC stream: one record batch per chunk. Needs pyarrow (ImportError otherwise)."""
+    import pyarrow as pa
+
+    schema = pa.schema([
+        ("time", pa.timestamp("ms", tz="UTC")),
+        ("router_id", pa.int32()),
+        ("router_name", pa.string()),
+        *((field, pa.float64()) for field in fields),
+    ])
+    sink = _ChunkSink()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        for chunk in _chunks(rows):
+            batch = pa.RecordBatch.from_pydict(
+                {name: [row.get(name) for row in chunk] for name in schema.names},
+                schema=schema,
+            )
+            writer.write_batch(batch)
+            yield sink.drain()
+    yield sink.drain()  # end-of-stream marker
@@ -0,0 +1,48 @@
+import asyncio
+from typing import Awaitable, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def fan_out(
+    items: Iterable[T],
+    worker: Callable[[T], Awaitable[R]],
+    concurrency: int,
+    deadline: float,
+) -> list[R | BaseException]:
+    """
+    Run worker(item) for every item on the current event loop, at most
+    `concurrency` at a time, and give up on whatever is still running once
+    `deadline` seconds have passed.
+
+    Results come back in input order, like asyncio.gather(return_exceptions=True):
+    a failed item yields its exception, an item cut off by the deadline yields
+    an asyncio.TimeoutError.
+    """
+    items = list(items)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def _run(item: T) -> R:
+        async with semaphore:
+            return await worker(item)
+
+    tasks = [asyncio.ensure_future(_run(item)) for item in items]
+    if not tasks:
+        return []
+
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results: list[R | BaseException] = []
+    for task in tasks:
+        if task in pending:
+            results.append(asyncio.TimeoutError(f"Deadline of {deadline}s exceeded"))
+        elif task.exception() is not None:
+            results.append(task.exception())
+        else:
+            results.append(task.result())
+    return results
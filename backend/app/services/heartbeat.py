@@ -0,0 +1,37 @@
+"""
+Heartbeat scheduling policy: which routers get which probe tier in a cycle.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+from app.core.config import settings
+
+
+def needs_ssh_check(
+    router_id: int, was_online: bool, last_ssh_check_at: Optional[datetime], now: datetime
+) -> bool:
+    """
+    Routers that are not known to be online always get the full SSH check, so
+    a recovery is confirmed end to end. Online routers get it once every
+    HEARTBEAT_SSH_EVERY base intervals since their last one, however often
+    they are probed in between. A router that was never checked counts as
+    checked 1 to N base intervals ago depending on its id, so the SSH load of
+    a fresh fleet is spread over the period instead of landing on one tick.
+    """
+    if not was_online:
+        return True
+    every = max(1, settings.HEARTBEAT_SSH_EVERY)
+    period = every * settings.POLL_BASE_INTERVAL
+    if last_ssh_check_at is None:
+        last_ssh_check_at = now - timedelta(seconds=(router_id % every + 1) * settings.POLL_BASE_INTERVAL)
+    # Half a tick of slack, as for due routers, so jitter does not push a check a whole poll later
+    return (now - last_ssh_check_at).total_seconds() >= period - settings.HEARTBEAT_INTERVAL / 2
+
+
+def shard_for(router_id: int, shards: int) -> int:
+    """Stable shard assignment; ids are sequential, so a plain modulo spreads them evenly."""
+    return router_id % max(1, shards)
+
+
+def shard_filter(id_column, shard: int, shards: int):
+    """shard_for as a SQL condition on `id_column`, so a shard only fetches its own rows."""
+    return id_column % max(1, shards) == shard
@@ -0,0 +1,85 @@
+"""
+Redis cache for per-router Flux query results.
+
+Entries live for one aggregation window (the data only changes at the edge of
+the newest window). Ingest tasks record when they last wrote points for a
+(router, measurement); an entry computed before that is treated as a miss, so
+new points are visible on the next request without scanning for keys to delete.
+
+The cache is an optimisation only: Redis errors are logged and treated as a
+miss (reads) or skipped (writes), so callers fall through to Influx.
+"""
+import json
+import logging
+import time
+from typing import Optional
+from redis.exceptions import RedisError
+from app.core.config import settings
+from app.core.redis import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+_HITS_KEY = "metrics:cache:hits"
+_MISSES_KEY = "metrics:cache:misses"
+
+
+# v2: cached time columns are epoch milliseconds
+def _entry_key(router_id: int, measurement: str, field: str, range_: str, window: str) -> str:
+    return f"metrics:cache:v2:{router_id}:{measurement}:{field}:{range_}:{window}"
+
+
+def _written_key(router_id: int, measurement: str) -> str:
+    return f"metrics:written:{router_id}:{measurement}"
+
+
+async def get_cached(router_id: int, measurement: str, field: str, range_: str, window: str) -> Optional[object]:
+    client = get_async_redis()
+    try:
+        entry, written_at = await client.mget(
+            _entry_key(router_id, measurement, field, range_, window),
+            _written_key(router_id, measurement),
+        )
+        if entry is not None:
+            entry = json.loads(entry)
+            if written_at is None or entry["computed_at"] >= float(written_at):
+                await client.incr(_HITS_KEY)
+                return entry["data"]
+        await client.incr(_MISSES_KEY)
+    except RedisError as e:
+        logger.warning("Metrics cache read failed, querying Influx: %s", e)
+    return None
+
+
+async def set_cached(router_id: int, measurement: str, field: str, range_: str, window: str,
+                     data: object, ttl: int):
+    entry = json.dumps({"computed_at": time.time(), "data": data})
+    try:
+        await get_async_redis().set(_entry_key(router_id, measurement, field, range_, window), entry, ex=ttl)
+    except RedisError as e:
+        logger.warning("Metrics cache write failed: %s", e)
+
+
+async def mark_written(router_ids: list[int], measurement: str):
+    """
+    Invalidate cached results for these routers. Points reach Influx through the
+    buffered writer, so anything computed before the next flush is stale too.
+    """
+    if not router_ids:
+        return
+    stale_until = time.time() + settings.INFLUX_FLUSH_INTERVAL + 2
+    ttl = 7 * 86400
+    try:
+        async with get_async_redis().pipeline(transaction=False) as pipe:
+            for router_id in router_ids:
+                pipe.set(_written_key(router_id, measurement), stale_until, ex=ttl)
+            await pipe.execute()
+    except RedisError as e:
+        # Entries age out after one window; until then they may miss the new points
+        logger.warning("Metrics cache invalidation for %s failed: %s", measurement, e)
+
+
+async def cache_stats() -> dict:
+    hits, misses = await get_async_redis().mget(_HITS_KEY, _MISSES_KEY)
+    hits, misses = int(hits or 0), int(misses or 0)
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_ratio": round(hits / total, 3) if total else 0.0}
@@ -0,0 +1,100 @@
+"""
+Monthly range partitions for the history tables.
+
+`script_executions` and `alerts` are partitioned by RANGE (created_at), one
+partition per UTC calendar month named `<table>_pYYYYMM`. The maintenance task
+keeps PARTITION_PREMAKE_MONTHS months created ahead of the current one (there
+is no default partition, so an insert past the last partition fails rather
+than landing somewhere unprunable) and expires partitions whose whole month is
+older than the table's retention: dropped, or detached and left as a plain
+table for archiving when PARTITION_EXPIRED_ACTION is "detach".
+"""
+import re
+from datetime import datetime, timezone
+from typing import Optional
+from app.core.config import settings
+
+PARTITIONED_TABLES = ("script_executions", "alerts")
+
+_SUFFIX = re.compile(r"_p(\d{4})(\d{2})$")
+
+
+def retention_months(table: str) -> int:
+    return {
+        "script_executions": settings.EXECUTION_RETENTION_MONTHS,
+        "alerts": settings.ALERT_RETENTION_MONTHS,
+    }[table]
+
+
+def month_start(t: datetime) -> datetime:
+    return t.astimezone(timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(month: datetime, n: int) -> datetime:
+    index = month.year * 12 + month.month - 1 + n
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def partition_month(table: str, name: str) -> Optional[datetime]:
+    """The month a partition of `table` covers, or None if `name` is not one of ours."""
+    if not name.startswith(f"{table}_p"):
+        return None
+    match = _SUFFIX.search(name)
+    if not match:
+        return None
+    return datetime(int(match[1]), int(match[2]), 1, tzinfo=timezone.utc)
+
+
+def create_partition_sql(table: str, month: datetime) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} PARTITION OF {table} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def expire_partition_sql(table: str, name: str, action: str) -> str:
+    if action == "detach":
+        return f"ALTER TABLE {table} DETACH PARTITION {name}"
+    return f"DROP TABLE IF EXISTS {name}"
+
+
+def months_between(first: datetime, last: datetime) -> list[datetime]:
+    """Month starts from the month of `first` through the month of `last`."""
+    month, end = month_start(first), month_start(last)
+    months = []
+    while month <= end:
+        months.append(month)
+        month = add_months(month, 1)
+    return months
+
+
+def plan_partitions(
+    table: str, existing: list[str], now: datetime, ahead: int, retention: int
+) -> tuple[list[datetime], list[str]]:
+    """
+    Months to create (current through `ahead` months out, minus those that
+    exist) and existing partitions to expire: those covering months before
+    the `retention` most recent ones, the current month included.
+    """
+    current = month_start(now)
+    have = {partition_month(table, name) for name in existing}
+    create = [m for m in months_between(current, add_months(current, ahead)) if m not in have]
+    cutoff = add_months(current, -(retention - 1))
+    expire = sorted(
+        name for name in existing
+        if (month := partition_month(table, name)) is not None and month < cutoff
+    )
+    return create, expire
+
+
+# Current partitions of a parent table (detached ones are no longer listed)
+PARTITIONS_SQL = """
+SELECT child.relname FROM pg_inherits
+JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+WHERE parent.relname = :table
+"""
@@ -0,0 +1,61 @@
+"""
+Adaptive per-router polling: how long to wait before probing a router again.
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+from app.core.config import settings
+
+REASON_NEW = "new"
+REASON_STABLE = "stable"
+REASON_RECENT_CHANGE = "recent_change"
+REASON_OFFLINE_BACKOFF = "offline_backoff"
+
+
+def plan_next_poll(
+    was_online: bool,
+    is_online: bool,
+    consecutive_failures: int,
+    last_change_at: Optional[datetime],
+    now: datetime,
+) -> dict:
+    """
+    Next polling plan after a probe:
+    - right after a state change, poll at POLL_FAST_INTERVAL for POLL_FAST_WINDOW
+      seconds so recoveries and flapping are caught quickly
+    - after that, offline routers back off exponentially from POLL_BASE_INTERVAL
+      up to POLL_MAX_INTERVAL
+    - online routers stay on POLL_BASE_INTERVAL
+    """
+    if was_online != is_online:
+        last_change_at = now
+
+    in_fast_window = (
+        last_change_at is not None
+        and now - last_change_at < timedelta(seconds=settings.POLL_FAST_WINDOW)
+    )
+
+    if is_online:
+        consecutive_failures = 0
+    elif not in_fast_window:
+        # Only failures outside the fast window count towards the backoff
+        consecutive_failures += 1
+
+    if in_fast_window:
+        interval, reason = settings.POLL_FAST_INTERVAL, REASON_RECENT_CHANGE
+    elif not is_online:
+        interval = min(
+            settings.POLL_BASE_INTERVAL * 2 ** max(0, consecutive_failures - 1),
+            settings.POLL_MAX_INTERVAL,
+        )
+        reason = REASON_OFFLINE_BACKOFF
+    else:
+        interval, reason = settings.POLL_BASE_INTERVAL, REASON_STABLE
+
+    return {
+        "interval_s": interval,
+        "next_due_at": now + timedelta(seconds=interval),
+        "last_polled_at": now,
+        "last_change_at": last_change_at,
+        "consecutive_failures": consecutive_failures,
+        "reason": reason,
+    }
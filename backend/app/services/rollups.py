@@ -0,0 +1,154 @@
+"""
+Rollup buckets for long-range metrics.
+
+Raw heartbeat/signal/system points are rolled up into a 5-minute bucket, and
+that into a 1-hour bucket, each holding mean, min and max per series (the
+`stat` tag). A scheduled task extends each tier up to a checkpoint kept in
+Redis; readers take rolled-up data before the checkpoint and raw data after
+it, so recent points are never missing from a rollup read.
+
+The first run backfills every tier from the oldest raw point. Raw data is kept
+forever unless INFLUX_RAW_RETENTION_DAYS is set and applied explicitly (the
+apply_raw_retention task), which refuses until the backfill has caught up.
+"""
+import math
+from datetime import datetime, timezone
+from typing import Optional
+from app.core.config import settings
+
+ROLLUP_MEASUREMENTS = ["heartbeat", "signal", "system"]
+ROLLUP_STATS = ["mean", "min", "max"]
+
+
+def rollup_tiers() -> list[dict]:
+    """Rollup tiers, finest first. Each tier is built from the one before it."""
+    raw = settings.INFLUX_BUCKET
+    return [
+        {
+            "name": "5m",
+            "bucket": f"{raw}_5m",
+            "every_s": 300,
+            "source": raw,
+            "retention_days": settings.INFLUX_ROLLUP_5M_RETENTION_DAYS,
+        },
+        {
+            "name": "1h",
+            "bucket": f"{raw}_1h",
+            "every_s": 3600,
+            "source": f"{raw}_5m",
+            "retention_days": settings.INFLUX_ROLLUP_1H_RETENTION_DAYS,
+        },
+    ]
+
+
+def checkpoint_key(tier_name: str) -> str:
+    return f"rollup:checkpoint:{tier_name}"
+
+
+def rollup_span(
+    checkpoint: Optional[float],
+    now: float,
+    every_s: int,
+    source_start: float,
+    source_checkpoint: Optional[float] = None,
+) -> Optional[tuple[float, float]]:
+    """
+    The [start, stop) span a tier should roll up next, or None when there is
+    nothing complete to add. Both ends sit on window boundaries; stop trails
+    `now` by ROLLUP_LAG so late (buffered) points are in before a window is
+    closed, never passes the source tier's own checkpoint, and is at most
+    ROLLUP_MAX_SPAN after start so a long backlog is caught up over several runs.
+    A tier without a checkpoint starts at `source_start`, the oldest raw point.
+    """
+    stop = now - settings.ROLLUP_LAG
+    if source_checkpoint is not None:
+        stop = min(stop, source_checkpoint)
+    stop = math.floor(stop / every_s) * every_s
+
+    if checkpoint is None:
+        checkpoint = math.floor(source_start / every_s) * every_s
+    stop = min(stop, checkpoint + max(every_s, settings.ROLLUP_MAX_SPAN // every_s * every_s))
+    if stop <= checkpoint:
+        return None
+    return checkpoint, stop
+
+
+def rfc3339(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def earliest_flux(bucket: str) -> str:
+    """Flux query for the time of the oldest rolled-up measurement point in `bucket`."""
+    measurements = ", ".join(f'"{m}"' for m in ROLLUP_MEASUREMENTS)
+    return f"""
+from(bucket: "{bucket}")
+  |> range(start: 0)
+  |> filter(fn: (r) => contains(value: r._measurement, set: [{measurements}]))
+  |> first()
+  |> group()
+  |> min(column: "_time")
+  |> keep(columns: ["_time"])"""
+
+
+def rollup_source(tier: dict, start: float, now: float) -> str:
+    """
+    Bucket a tier reads [start, ...) from: its source tier, or the raw bucket
+    where the source tier's retention no longer reaches (a backfill of a
+    coarse tier over history older than the finer rollup keeps).
+    """
+    raw = settings.INFLUX_BUCKET
+    if tier["source"] == raw:
+        return raw
+    source = next(t for t in rollup_tiers() if t["bucket"] == tier["source"])
+    if start < now - source["retention_days"] * 86400:
+        return raw
+    return tier["source"]
+
+
+def backfill_complete(checkpoints: dict, now: float) -> bool:
+    """Whether every tier has been rolled up to within its normal lag of `now`."""
+    for tier in rollup_tiers():
+        checkpoint = checkpoints.get(tier["name"])
+        slack = 2 * tier["every_s"] + settings.ROLLUP_LAG + settings.ROLLUP_INTERVAL
+        if checkpoint is None or checkpoint < now - slack:
+            return False
+    return True
+
+
+def rollup_flux(tier: dict, start: float, stop: float, source: str) -> str:
+    """Flux script writing mean/min/max windows of [start, stop) from `source` into the tier's bucket."""
+    from_raw = source == settings.INFLUX_BUCKET
+    measurements = ", ".join(f'"{m}"' for m in ROLLUP_MEASUREMENTS)
+    pipelines = []
+    for stat in ROLLUP_STATS:
+        # A coarser tier aggregates the matching stat of the finer one: max of maxes, ...
+        stat_filter = "" if from_raw else f'\n  |> filter(fn: (r) => r.stat == "{stat}")\n  |> drop(columns: ["stat"])'
+        pipelines.append(f"""
+from(bucket: "{source}")
+  |> range(start: {rfc3339(start)}, stop: {rfc3339(stop)})
+  |> filter(fn: (r) => contains(value: r._measurement, set: [{measurements}])){stat_filter}
+  |> toFloat()
+  |> aggregateWindow(every: {tier['name']}, fn: {stat}, timeSrc: "_start", createEmpty: false)
+  |> set(key: "stat", value: "{stat}")
+  |> to(bucket: "{tier['bucket']}", org: "{settings.INFLUX_ORG}")
+  |> yield(name: "{stat}")""")
+    return "\n".join(pipelines)
+
+
+def choose_tier(window_s: int, range_s: int, now: float, checkpoints: dict) -> Optional[dict]:
+    """
+    Coarsest tier that can serve a query: its resolution divides the requested
+    window, its retention covers the range, and it has been built past the
+    start of the range. None means read the raw bucket.
+    """
+    start = now - range_s
+    for tier in reversed(rollup_tiers()):
+        checkpoint = checkpoints.get(tier["name"])
+        if (
+            window_s % tier["every_s"] == 0
+            and range_s <= tier["retention_days"] * 86400
+            and checkpoint is not None
+            and checkpoint > start
+        ):
+            return tier
+    return None
@@ -0,0 +1,75 @@
+"""
+Latest-value snapshot per router, kept in Redis by the ingest tasks.
+
+Two hashes, router_id -> JSON: `snapshot:signal` (last signal reading) and
+`snapshot:heartbeat` (last probe). The dashboard summary reads the signal
+snapshots of the active routers in one round-trip instead of scanning Influx.
+"""
+import json
+from datetime import datetime
+from app.core.config import settings
+from app.core.redis import get_async_redis
+
+SIGNAL_KEY = "snapshot:signal"
+HEARTBEAT_KEY = "snapshot:heartbeat"
+
+
+async def write_snapshots(key: str, snapshots: dict[int, dict]):
+    """Replace the snapshot of each router in `snapshots` (router_id -> values)."""
+    if not snapshots:
+        return
+    await get_async_redis().hset(key, mapping={rid: json.dumps(s) for rid, s in snapshots.items()})
+
+
+async def delete_snapshots(router_id: int):
+    async with get_async_redis().pipeline(transaction=False) as pipe:
+        pipe.hdel(SIGNAL_KEY, router_id)
+        pipe.hdel(HEARTBEAT_KEY, router_id)
+        await pipe.execute()
+
+
+async def read_summary(routers: dict[int, str], now: datetime) -> list[dict]:
+    """Summary rows for `routers` (id -> name, the active ones) from one HMGET of their signal snapshots."""
+    if not routers:
+        return []
+    values = await get_async_redis().hmget(SIGNAL_KEY, list(routers))
+    return summary_rows(routers, values, now, settings.SUMMARY_MAX_AGE)
+
+
+def summary_rows(routers: dict[int, str], snapshots: list, now: datetime, max_age: int) -> list[dict]:
+    """
+    Rows in the shape the Influx-backed summary had: {"router_id": "<id>",
+    "router_name", "rssi", "rsrp"} for routers with a reading at most
+    `max_age` seconds old (the old query looked back 10 minutes).
+    """
+    rows = []
+    for (router_id, name), raw in zip(routers.items(), snapshots):
+        if raw is None:
+            continue
+        snapshot = json.loads(raw)
+        if (now - datetime.fromisoformat(snapshot["at"])).total_seconds() > max_age:
+            continue
+        row = {"router_id": str(router_id), "router_name": name}
+        row.update({field: snapshot[field] for field in ("rssi", "rsrp") if snapshot.get(field) is not None})
+        rows.append(row)
+    return rows
+
+
+def signal_snapshot(router, fields: dict, data: dict, at: datetime) -> dict:
+    return {
+        "router_name": router.name,
+        **fields,
+        "operator": data.get("operator", "unknown"),
+        "band": data.get("band", "unknown"),
+        "at": at.isoformat(),
+    }
+
+
+def heartbeat_snapshot(router, result, at: datetime) -> dict:
+    return {
+        "router_name": router.name,
+        "online": result.is_online,
+        "tcp_latency_ms": result.tcp_latency_ms,
+        "ssh_latency_ms": result.ssh_latency_ms,
+        "at": at.isoformat(),
+    }
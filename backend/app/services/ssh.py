@@ -1,20 +1,228 @@
 import asyncssh
 import asyncio
+import hashlib
 import time
+from collections import OrderedDict
 from typing import Optional
 from app.core.config import settings
 
 
 class SSHResult:
-    def __init__(self, stdout: str, stderr: str, exit_code: int, duration_ms: int):
+    def __init__(self, stdout: str, stderr: str, exit_code: int, duration_ms: int, connect_ms: int = 0):
         self.stdout = stdout
         self.stderr = stderr
         self.exit_code = exit_code
-        self.duration_ms = duration_ms
+        self.duration_ms = duration_ms  # command round-trip only
+        self.connect_ms = connect_ms  # 0 when a pooled connection was reused
         self.success = exit_code == 0
 
     def __repr__(self):
-        return f"<SSHResult exit={self.exit_code} duration={self.duration_ms}ms>"
+        return f"<SSHResult exit={self.exit_code} duration={self.duration_ms}ms connect={self.connect_ms}ms>"
+
+
+class _PooledConnection:
+    def __init__(self, conn):
+        self.conn = conn
+        self.last_used = time.monotonic()
+        self.in_use = 0
+        self.retired = False  # out of the pool; closed once its last command finishes
+
+    @property
+    def alive(self) -> bool:
+        return not self.conn.is_closed()
+
+
+class SSHConnectionPool:
+    """
+    Keeps SSH connections open per (ip, port, username, credentials) so
+    heartbeats, signal polls and script runs skip the key exchange on every
+    command. The credentials are part of the key as a hash, so a changed
+    password or key opens a new connection instead of reusing the old login.
+
+    Connections are bound to the event loop the pool was created on. Dead
+    connections are detected through SSH keepalives and replaced on the next
+    use; idle ones are closed after `idle_timeout` seconds, and the least
+    recently used idle connection is closed when `max_connections` is reached.
+    A connection that timed out or failed is taken out of the pool at once
+    but only closed when the other commands running on it have finished.
+    """
+
+    def __init__(self, max_connections: int, idle_timeout: int, keepalive_interval: int):
+        self.max_connections = max(1, max_connections)
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self.loop = asyncio.get_running_loop()
+        self._entries: OrderedDict[tuple, _PooledConnection] = OrderedDict()
+        self._connect_locks: dict[tuple, asyncio.Lock] = {}
+        self._released = asyncio.Condition()
+
+    def __len__(self):
+        return len(self._entries)
+
+    async def run(
+        self,
+        ip: str,
+        port: int,
+        username: str,
+        command: str,
+        timeout: int,
+        password: Optional[str] = None,
+        private_key: Optional[str] = None,
+    ) -> SSHResult:
+        key = (ip, port, username, _credential_hash(password, private_key))
+        start = time.monotonic()
+        try:
+            entry, reused = await self._acquire(key, password, private_key, timeout)
+        except asyncio.TimeoutError:
+            return SSHResult("", "Connection timed out", 1, _elapsed_ms(start))
+        except Exception as e:
+            return SSHResult("", str(e), 1, _elapsed_ms(start))
+        connect_ms = 0 if reused else _elapsed_ms(start)
+
+        cmd_start = time.monotonic()
+        try:
+            result = await asyncio.wait_for(entry.conn.run(command, check=False), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._retire(key, entry)
+            return SSHResult("", "Command timed out", 1, _elapsed_ms(cmd_start), connect_ms)
+        except Exception as e:
+            self._retire(key, entry)
+            if not reused:
+                return SSHResult("", str(e), 1, _elapsed_ms(cmd_start), connect_ms)
+            # A pooled connection went stale between keepalives: reconnect once
+            return await self.run(ip, port, username, command, timeout, password, private_key)
+        finally:
+            await self._release(entry)
+
+        return SSHResult(
+            stdout=result.stdout or "",
+            stderr=result.stderr or "",
+            exit_code=result.exit_status or 0,
+            duration_ms=_elapsed_ms(cmd_start),
+            connect_ms=connect_ms,
+        )
+
+    async def _acquire(self, key, password, private_key, timeout) -> tuple[_PooledConnection, bool]:
+        self._evict_idle()
+
+        entry = self._entries.get(key)
+        if entry and entry.alive:
+            self._checkout(key, entry)
+            return entry, True
+
+        lock = self._connect_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller may have connected while we waited for the lock
+            entry = self._entries.get(key)
+            if entry and entry.alive:
+                self._checkout(key, entry)
+                return entry, True
+            if entry:
+                self._discard(key, entry)
+
+            await self._make_room()
+            conn = await asyncio.wait_for(
+                self._connect(key, password, private_key, timeout), timeout=timeout
+            )
+            entry = _PooledConnection(conn)
+            self._entries[key] = entry
+            self._checkout(key, entry)
+            return entry, False
+
+    async def _connect(self, key, password, private_key, timeout):
+        ip, port, username, _ = key
+        connect_kwargs = dict(
+            host=ip,
+            port=port,
+            username=username,
+            known_hosts=None,  # Internal network - skip host key check
+            connect_timeout=timeout,
+            keepalive_interval=self.keepalive_interval,
+            keepalive_count_max=3,
+        )
+        if private_key:
+            connect_kwargs["client_keys"] = [asyncssh.import_private_key(private_key)]
+        elif password:
+            connect_kwargs["password"] = password
+            connect_kwargs["preferred_auth"] = "password"
+        return await asyncssh.connect(**connect_kwargs)
+
+    def _checkout(self, key, entry: _PooledConnection):
+        entry.in_use += 1
+        entry.last_used = time.monotonic()
+        self._entries.move_to_end(key)
+
+    async def _release(self, entry: _PooledConnection):
+        entry.in_use -= 1
+        entry.last_used = time.monotonic()
+        if entry.retired and entry.in_use == 0:
+            entry.conn.close()
+        async with self._released:
+            self._released.notify_all()
+
+    async def _make_room(self):
+        while len(self._entries) >= self.max_connections:
+            victim = next((k for k, e in self._entries.items() if e.in_use == 0), None)
+            if victim is not None:
+                self._discard(victim, self._entries[victim])
+                continue
+            async with self._released:
+                await self._released.wait()
+
+    def _evict_idle(self):
+        cutoff = time.monotonic() - self.idle_timeout
+        for key, entry in list(self._entries.items()):
+            if entry.in_use == 0 and (entry.last_used < cutoff or not entry.alive):
+                self._discard(key, entry)
+
+    def _retire(self, key, entry: _PooledConnection):
+        """Stop handing `entry` out; _release closes it when nothing runs on it any more."""
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        entry.retired = True
+
+    def _discard(self, key, entry: _PooledConnection):
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        entry.conn.close()
+
+    async def close(self):
+        entries = list(self._entries.values())
+        self._entries.clear()
+        for entry in entries:
+            entry.conn.close()
+        await asyncio.gather(*(e.conn.wait_closed() for e in entries), return_exceptions=True)
+
+
+_pool: Optional[SSHConnectionPool] = None
+
+
+def get_ssh_pool() -> SSHConnectionPool:
+    """Pool for the running event loop (a new loop gets a fresh pool)."""
+    global _pool
+    if _pool is None or _pool.loop is not asyncio.get_running_loop():
+        _pool = SSHConnectionPool(
+            max_connections=settings.SSH_POOL_MAX_CONNECTIONS,
+            idle_timeout=settings.SSH_POOL_IDLE_TIMEOUT,
+            keepalive_interval=settings.SSH_KEEPALIVE_INTERVAL,
+        )
+    return _pool
+
+
+async def close_ssh_pool():
+    global _pool
+    if _pool is not None:
+        pool, _pool = _pool, None
+        await pool.close()
+
+
+def _credential_hash(password: Optional[str], private_key: Optional[str]) -> str:
+    """Identifies the credentials in a pool key without keeping them in it."""
+    return hashlib.sha256(f"{password or ''}\0{private_key or ''}".encode()).hexdigest()[:16]
+
+
+def _elapsed_ms(start: float) -> int:
+    return int((time.monotonic() - start) * 1000)
 
 
 async def run_ssh_command(
@@ -26,47 +234,54 @@ async def run_ssh_command(
     private_key: Optional[str] = None,
     timeout: int = None,
 ) -> SSHResult:
-    port = port or settings.SSH_DEFAULT_PORT
-    username = username or settings.SSH_DEFAULT_USER
-    timeout = timeout or settings.SSH_TIMEOUT
-
-    connect_kwargs = dict(
-        host=ip,
-        port=port,
-        username=username,
-        known_hosts=None,  # Internal network - skip host key check
-        connect_timeout=timeout,
+    return await get_ssh_pool().run(
+        ip,
+        port or settings.SSH_DEFAULT_PORT,
+        username or settings.SSH_DEFAULT_USER,
+        command,
+        timeout or settings.SSH_TIMEOUT,
+        password=password,
+        private_key=private_key,
     )
 
-    if private_key:
-        connect_kwargs["client_keys"] = [asyncssh.import_private_key(private_key)]
-    elif password:
-        connect_kwargs["password"] = password
-        connect_kwargs["preferred_auth"] = "password"
 
+class ProbeResult:
+    def __init__(self, is_online: bool, tcp_latency_ms: Optional[int], ssh_latency_ms: Optional[int] = None):
+        self.is_online = is_online
+        self.tcp_latency_ms = tcp_latency_ms  # None when the SSH port was unreachable
+        self.ssh_latency_ms = ssh_latency_ms  # None when the SSH tier was skipped
+
+    def __repr__(self):
+        return f"<ProbeResult online={self.is_online} tcp={self.tcp_latency_ms}ms ssh={self.ssh_latency_ms}ms>"
+
+
+async def tcp_probe(ip: str, port: int, timeout: float) -> tuple[bool, int]:
+    """Open and close a TCP connection to the SSH port. Returns (reachable, latency_ms)."""
     start = time.monotonic()
     try:
-        async with asyncssh.connect(**connect_kwargs) as conn:
-            result = await asyncio.wait_for(
-                conn.run(command, check=False),
-                timeout=timeout,
-            )
-        duration_ms = int((time.monotonic() - start) * 1000)
-        return SSHResult(
-            stdout=result.stdout or "",
-            stderr=result.stderr or "",
-            exit_code=result.exit_status or 0,
-            duration_ms=duration_ms,
-        )
-    except asyncio.TimeoutError:
-        duration_ms = int((time.monotonic() - start) * 1000)
-        return SSHResult("", "Connection timed out", 1, duration_ms)
-    except Exception as e:
-        duration_ms = int((time.monotonic() - start) * 1000)
-        return SSHResult("", str(e), 1, duration_ms)
-
-
-async def test_connectivity(ip: str, **kwargs) -> tuple[bool, int]:
-    """Quick ping via SSH. Returns (is_online, latency_ms)."""
-    result = await run_ssh_command(ip, ":put ok", timeout=10, **kwargs)
-    return result.success, result.duration_ms
+        _, writer = await asyncio.wait_for(asyncio.open_connection(ip, port), timeout=timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False, _elapsed_ms(start)
+    latency_ms = _elapsed_ms(start)
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return True, latency_ms
+
+
+async def test_connectivity(ip: str, port: int = None, full_check: bool = True, **kwargs) -> ProbeResult:
+    """
+    Tiered liveness probe. A TCP connect to the SSH port decides most cycles;
+    with full_check the router must also answer `:put ok` over SSH.
+    """
+    port = port or settings.SSH_DEFAULT_PORT
+    reachable, tcp_ms = await tcp_probe(ip, port, settings.HEARTBEAT_TCP_TIMEOUT)
+    if not reachable:
+        return ProbeResult(False, None)
+    if not full_check:
+        return ProbeResult(True, tcp_ms)
+
+    result = await run_ssh_command(ip, ":put ok", port=port, timeout=10, **kwargs)
+    return ProbeResult(result.success, tcp_ms, result.duration_ms)
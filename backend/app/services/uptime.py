@@ -0,0 +1,173 @@
+"""
+Incremental uptime accounting.
+
+Every heartbeat probe credits the time since the router's previous probe to
+hourly, daily and monthly Redis hashes (`uptime:h:<YYYYMMDDHH>`,
+`uptime:d:<YYYYMMDD>`, `uptime:m:<YYYYMM>`), as "<router_id>:total" seconds
+and, when the router answered, "<router_id>:up" seconds. Uptime for a range is
+the ratio of bucket sums: whole months come from monthly buckets, whole days
+around them from daily ones and only the partial days at the edges from hourly
+ones. A range reads at most ~46 hourly, ~60 daily and one hash per month, all
+in one pipelined round-trip, so a year costs about what a month does.
+Resolution is one hour: a range starts at the top of the hour it falls in.
+
+History from before the counters existed is filled in once from the raw
+`online` points by the backfill_uptime task, walking back a few days per run
+and only writing buckets that are missing. Probe spacing has changed over
+time (and differs between stable and recovering routers), so each hour with
+probes is credited as the whole hour, split up/down in the ratio of its
+successful probes, rather than as probes times an interval. The day the
+counters started is left as they counted it.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from app.core.config import settings
+from app.core.redis import get_async_redis
+
+HOUR = timedelta(hours=1)
+DAY = timedelta(days=1)
+BACKFILL_CURSOR_KEY = "uptime:backfill:cursor"  # start of the next day to backfill, or "done"
+BACKFILL_DAYS_PER_RUN = 7
+
+
+def hour_key(t: datetime) -> str:
+    return f"uptime:h:{t:%Y%m%d%H}"
+
+
+def day_key(t: datetime) -> str:
+    return f"uptime:d:{t:%Y%m%d}"
+
+
+def month_key(t: datetime) -> str:
+    return f"uptime:m:{t:%Y%m}"
+
+
+def next_month(t: datetime) -> datetime:
+    return t.replace(year=t.year + t.month // 12, month=t.month % 12 + 1)
+
+
+def split_by_hour(start: datetime, end: datetime) -> list[tuple[datetime, float]]:
+    """Pieces of [start, end) within each clock hour, as (hour, seconds)."""
+    pieces = []
+    hour = start.replace(minute=0, second=0, microsecond=0)
+    while hour < end:
+        seconds = (min(end, hour + HOUR) - max(start, hour)).total_seconds()
+        if seconds > 0:
+            pieces.append((hour, seconds))
+        hour += HOUR
+    return pieces
+
+
+def range_bucket_keys(start: datetime, now: datetime) -> list[str]:
+    """Bucket keys covering the hours from `start` through the current one."""
+    hour = start.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    end = now.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0) + HOUR
+    keys = []
+    while hour < end:
+        if hour.day == 1 and hour.hour == 0 and next_month(hour) <= end:
+            keys.append(month_key(hour))
+            hour = next_month(hour)
+        elif hour.hour == 0 and hour + DAY <= end:
+            keys.append(day_key(hour))
+            hour += DAY
+        else:
+            keys.append(hour_key(hour))
+            hour += HOUR
+    return keys
+
+
+async def record_uptime(samples: list[tuple[int, bool, Optional[datetime]]], now: datetime):
+    """
+    Credit each probed router (router_id, is_online, previous probe time) with
+    the time since its previous probe. The first probe of a router only starts
+    the clock; gaps longer than UPTIME_MAX_GAP (heartbeat outage) are capped.
+    """
+    hourly_ttl = settings.UPTIME_HOURLY_RETENTION_DAYS * 86400
+    daily_ttl = settings.UPTIME_DAILY_RETENTION_DAYS * 86400
+    monthly_ttl = settings.UPTIME_MONTHLY_RETENTION_DAYS * 86400
+    touched = set()
+    async with get_async_redis().pipeline(transaction=False) as pipe:
+        for router_id, is_online, since in samples:
+            if since is None:
+                continue
+            since = max(since.astimezone(timezone.utc), now - timedelta(seconds=settings.UPTIME_MAX_GAP))
+            for hour, seconds in split_by_hour(since, now):
+                for key, ttl in ((hour_key(hour), hourly_ttl), (day_key(hour), daily_ttl), (month_key(hour), monthly_ttl)):
+                    pipe.hincrbyfloat(key, f"{router_id}:total", seconds)
+                    if is_online:
+                        pipe.hincrbyfloat(key, f"{router_id}:up", seconds)
+                    if key not in touched:
+                        touched.add(key)
+                        pipe.expire(key, ttl)
+        if touched:
+            await pipe.execute()
+
+
+def _pct(up: float, total: float) -> Optional[float]:
+    return round(up / total * 100, 3) if total else None
+
+
+async def router_uptime(router_id: int, start: datetime, now: datetime) -> dict:
+    async with get_async_redis().pipeline(transaction=False) as pipe:
+        for key in range_bucket_keys(start, now):
+            pipe.hmget(key, f"{router_id}:up", f"{router_id}:total")
+        buckets = await pipe.execute()
+    up = sum(float(u or 0) for u, _ in buckets)
+    total = sum(float(t or 0) for _, t in buckets)
+    return {"up_s": round(up), "total_s": round(total), "uptime_pct": _pct(up, total)}
+
+
+async def fleet_uptime(start: datetime, now: datetime) -> dict[int, dict]:
+    """Uptime of every router with data in the range, keyed by router id."""
+    async with get_async_redis().pipeline(transaction=False) as pipe:
+        for key in range_bucket_keys(start, now):
+            pipe.hgetall(key)
+        buckets = await pipe.execute()
+    return sum_buckets(buckets)
+
+
+def sum_buckets(buckets: list[dict]) -> dict[int, dict]:
+    totals: dict[int, list[float]] = {}
+    for bucket in buckets:
+        for field, value in bucket.items():
+            field = field.decode() if isinstance(field, bytes) else field
+            router_id, kind = field.split(":")
+            sums = totals.setdefault(int(router_id), [0.0, 0.0])
+            sums[0 if kind == "up" else 1] += float(value)
+    return {
+        rid: {"up_s": round(up), "total_s": round(total), "uptime_pct": _pct(up, total)}
+        for rid, (up, total) in totals.items()
+    }
+
+
+def backfill_flux(start: datetime, stop: datetime) -> str:
+    """Probes and successful probes per router and hour in [start, stop), from raw heartbeat points."""
+    return f"""
+    from(bucket: "{settings.INFLUX_BUCKET}")
+      |> range(start: {start.isoformat()}, stop: {stop.isoformat()})
+      |> filter(fn: (r) => r._measurement == "heartbeat" and r._field == "online")
+      |> group(columns: ["router_id"])
+      |> window(every: 1h)
+      |> reduce(identity: {{total: 0, up: 0}}, fn: (r, accumulator) => ({{
+          total: accumulator.total + 1,
+          up: accumulator.up + r._value,
+      }}))
+    """
+
+
+def backfill_buckets(rows: list[tuple[int, datetime, int, int]]) -> dict[str, dict[str, float]]:
+    """
+    Hourly and daily bucket contents from (router_id, hour, probes, successful
+    probes) rows: an hour with probes counts as 3600 s, up in proportion.
+    """
+    buckets: dict[str, dict[str, float]] = {}
+    for router_id, hour, total, up in rows:
+        if not total:
+            continue
+        hour = hour.astimezone(timezone.utc)
+        for key in (hour_key(hour), day_key(hour)):
+            fields = buckets.setdefault(key, {})
+            fields[f"{router_id}:total"] = fields.get(f"{router_id}:total", 0.0) + HOUR.total_seconds()
+            if up:
+                fields[f"{router_id}:up"] = fields.get(f"{router_id}:up", 0.0) + HOUR.total_seconds() * up / total
+    return buckets
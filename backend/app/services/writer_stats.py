@@ -0,0 +1,50 @@
+"""
+Influx point writer counters, gathered from every worker process.
+
+Each worker process owns its own BufferedPointWriter, so its queued / flushed /
+dropped / failed counts are only visible inside that process. After tasks the
+worker publishes them (at most every WRITER_STATS_INTERVAL seconds) to one Redis
+hash, `influx:writer:stats`, keyed by "<host>:<pid>"; the API sums the entries
+reported recently enough to still be alive.
+"""
+import json
+import os
+import socket
+import time
+from typing import Optional
+from app.core.redis import get_async_redis, get_redis
+
+WRITER_STATS_KEY = "influx:writer:stats"
+WRITER_STATS_INTERVAL = 30  # seconds between reports from one process
+WRITER_STATS_MAX_AGE = 600  # seconds; older reports are from processes that are gone
+COUNTERS = ["queued", "flushed", "dropped", "failed_batches", "buffered"]
+
+_last_report: Optional[float] = None
+
+
+def publish_writer_stats(stats: dict, now: Optional[float] = None):
+    """Report this process's counters, unless it already did within the interval."""
+    global _last_report
+    now = time.time() if now is None else now
+    if _last_report is not None and now - _last_report < WRITER_STATS_INTERVAL:
+        return
+    _last_report = now
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    get_redis().hset(WRITER_STATS_KEY, name, json.dumps({**stats, "at": now}))
+
+
+async def read_writer_stats() -> dict:
+    entries = await get_async_redis().hgetall(WRITER_STATS_KEY)
+    return summarize_writer_stats(entries, time.time())
+
+
+def summarize_writer_stats(entries: dict, now: float) -> dict:
+    """Totals over the live processes, plus each process's own report."""
+    processes = {}
+    for name, value in entries.items():
+        name = name.decode() if isinstance(name, bytes) else name
+        report = json.loads(value)
+        if now - report["at"] <= WRITER_STATS_MAX_AGE:
+            processes[name] = report
+    totals = {key: sum(report.get(key, 0) for report in processes.values()) for key in COUNTERS}
+    return {**totals, "processes": processes}
@@ -19,11 +19,32 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     broker_connection_retry_on_startup=True,
+    # Task bodies are coroutines on one shared per-process loop (app.tasks.runtime),
+    # so threads give concurrency without a loop/engine/SSH pool per child process
+    worker_pool="threads",
+    worker_concurrency=settings.WORKER_CONCURRENCY,
     beat_scheduler="redbeat.RedBeatScheduler",
     beat_schedule={
         "heartbeat-all-routers": {
             "task": "app.tasks.tasks.heartbeat_all_routers",
-            "schedule": 60.0,  # every 60 seconds
+            "schedule": float(settings.HEARTBEAT_INTERVAL),
+        },
+        "signal-sweep": {
+            "task": "app.tasks.tasks.signal_sweep",
+            "schedule": float(settings.SIGNAL_SWEEP_INTERVAL),
+        },
+        "rollup-metrics": {
+            "task": "app.tasks.tasks.rollup_metrics",
+            "schedule": float(settings.ROLLUP_INTERVAL),
+        },
+        "backfill-uptime": {
+            # One-off: stops itself after the first full walk back (see app.services.uptime)
+            "task": "app.tasks.tasks.backfill_uptime",
+            "schedule": float(settings.ROLLUP_INTERVAL),
+        },
+        "maintain-partitions": {
+            "task": "app.tasks.tasks.maintain_partitions",
+            "schedule": float(settings.PARTITION_MAINTENANCE_INTERVAL),
         },
     },
 )
@@ -0,0 +1,72 @@
+"""
+Long-lived async runtime for Celery workers.
+
+Each worker process owns one event loop, running in a background thread, and
+one async SQLAlchemy engine sized to the worker's concurrency. Task bodies are
+coroutines submitted to that loop with run_async(), so SSH connections, DB
+connections and anything else bound to the loop survive from task to task.
+Works with both the threads pool (all task threads share the loop) and the
+prefork pool (each child process starts its own loop on first use).
+"""
+import asyncio
+import os
+import threading
+from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from app.core.config import settings
+from app.core.database import create_worker_engine
+from app.services.ssh import close_ssh_pool
+
+_lock = threading.Lock()
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_thread: Optional[threading.Thread] = None
+_pid: Optional[int] = None
+_engine = None
+_sessionmaker: Optional[async_sessionmaker] = None
+
+
+def get_loop() -> asyncio.AbstractEventLoop:
+    global _loop, _thread, _pid
+    if _loop is not None and _pid == os.getpid() and _thread.is_alive():
+        return _loop
+    with _lock:
+        if _loop is None or _pid != os.getpid() or not _thread.is_alive():
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="task-runtime", daemon=True)
+            _thread.start()
+            _pid = os.getpid()
+    return _loop
+
+
+def run_async(coro):
+    """Run a coroutine on the worker's persistent loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result()
+
+
+def task_session() -> AsyncSession:
+    """New AsyncSession on the worker engine. Only use it from coroutines run via run_async."""
+    global _engine, _sessionmaker
+    if _sessionmaker is None or _pid != os.getpid():
+        _engine = create_worker_engine(pool_size=settings.WORKER_CONCURRENCY)
+        _sessionmaker = async_sessionmaker(_engine, expire_on_commit=False)
+    return _sessionmaker()
+
+
+async def _close_async_resources():
+    global _engine, _sessionmaker
+    await close_ssh_pool()
+    if _engine is not None:
+        engine, _engine, _sessionmaker = _engine, None, None
+        await engine.dispose()
+
+
+def shutdown():
+    """Release loop-bound resources and stop the loop. Safe to call more than once."""
+    global _loop, _thread
+    if _loop is None or _pid != os.getpid() or not _thread.is_alive():
+        return
+    run_async(_close_async_resources())
+    _loop.call_soon_threadsafe(_loop.stop)
+    _thread.join(timeout=10)
+    _loop.close()
+    _loop, _thread = None, None
@@ -1,153 +1,574 @@
-import asyncio
-from datetime import datetime, timezone
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+import random
+import time
+from typing import Optional
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import case, insert, or_, select, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from celery.signals import task_postrun, worker_process_shutdown, worker_shutdown
 from influxdb_client import Point
 from app.tasks.celery_app import celery_app
+from app.tasks import runtime
+from app.tasks.runtime import run_async, task_session
 from app.services.ssh import run_ssh_command, test_connectivity
-from app.scripts.routeros import get_script, parse_kv_output
+from app.services.fanout import fan_out
+from app.services.heartbeat import needs_ssh_check, shard_filter
+from app.services.polling import plan_next_poll
+from app.services.rollups import (
+    backfill_complete,
+    checkpoint_key,
+    earliest_flux,
+    rollup_flux,
+    rollup_source,
+    rollup_span,
+    rollup_tiers,
+)
+from app.services.partitions import (
+    PARTITIONED_TABLES,
+    PARTITIONS_SQL,
+    create_partition_sql,
+    expire_partition_sql,
+    partition_name,
+    plan_partitions,
+    retention_months,
+)
+from app.scripts.routeros import (
+    get_script,
+    parse_kv_output,
+    build_collector,
+    split_collector_output,
+    parse_routeros_duration,
+)
 from app.core.config import settings
-from app.core.database import get_sync_engine
-from app.core.influx import get_write_api
-from app.models.models import Router, ScriptExecution, Alert
+from app.core.influx import ensure_bucket, get_point_writer, get_query_api
+from app.core.redis import get_redis, lease
+from app.services.metrics_cache import mark_written
+from app.services.writer_stats import publish_writer_stats
+from app.services.uptime import (
+    BACKFILL_CURSOR_KEY,
+    BACKFILL_DAYS_PER_RUN,
+    DAY,
+    backfill_buckets,
+    backfill_flux,
+    day_key,
+    month_key,
+    record_uptime,
+)
+from app.services.events import make_event, publish
+from app.services.snapshots import (
+    HEARTBEAT_KEY,
+    SIGNAL_KEY,
+    heartbeat_snapshot,
+    signal_snapshot,
+    write_snapshots,
+)
+from app.models.models import Router, RouterPollPlan, ScriptExecution, Alert
 
 
-def run_async(coro):
-    """Run an async function from sync Celery task."""
-    return asyncio.run(coro)
+@task_postrun.connect
+def _flush_influx_points(**kwargs):
+    writer = get_point_writer()
+    writer.flush()
+    try:
+        publish_writer_stats(writer.stats())
+    except Exception as e:
+        print(f"Could not publish Influx writer stats: {e!r}")
 
 
-@celery_app.task(name="app.tasks.tasks.heartbeat_all_routers", bind=True)
-def heartbeat_all_routers(self):
-    """Poll all active routers and update their online status + metrics."""
-    engine = get_sync_engine()
+@worker_shutdown.connect
+@worker_process_shutdown.connect
+def _close_worker_resources(**kwargs):
+    get_point_writer().close()
+    runtime.shutdown()
 
-    with Session(engine) as session:
-        routers = session.execute(select(Router).where(Router.is_active == True)).scalars().all()
-        write_api = get_write_api()
 
-        for router in routers:
-            try:
-                is_online, latency_ms = run_async(
-                    test_connectivity(
-                        router.ip_address,
-                        port=router.ssh_port,
-                        username=router.ssh_user,
-                        password=router.ssh_password,
-                    )
-                )
-
-                was_online = router.is_online
-                router.is_online = is_online
-                if is_online:
-                    router.last_seen = datetime.now(timezone.utc)
-
-                    # Write heartbeat to InfluxDB
-                    point = (
-                        Point("heartbeat")
-                        .tag("router_id", str(router.id))
-                        .tag("router_name", router.name)
-                        .field("latency_ms", latency_ms)
-                        .field("online", 1)
-                    )
-                    write_api.write(bucket=settings.INFLUX_BUCKET, org=settings.INFLUX_ORG, record=point)
-
-                    # If just came back online, pull signal metrics
-                    if not was_online:
-                        poll_signal_metrics.delay(router.id)
-                else:
-                    point = (
-                        Point("heartbeat")
-                        .tag("router_id", str(router.id))
-                        .tag("router_name", router.name)
-                        .field("online", 0)
-                    )
-                    write_api.write(bucket=settings.INFLUX_BUCKET, org=settings.INFLUX_ORG, record=point)
-
-                    # Create alert if just went offline
-                    if was_online:
-                        _create_offline_alert(session, router)
-
-                session.commit()
-
-            except Exception as e:
-                print(f"Heartbeat error for {router.name}: {e}")
+@celery_app.task(name="app.tasks.tasks.heartbeat_all_routers")
+def heartbeat_all_routers():
+    """Fan the heartbeat cycle out to one task per shard, with jittered start times."""
+    for shard in range(settings.HEARTBEAT_SHARDS):
+        heartbeat_shard.apply_async(
+            args=[shard],
+            countdown=random.uniform(0, settings.HEARTBEAT_JITTER),
+            expires=settings.HEARTBEAT_INTERVAL,  # never run a stale cycle
+        )
+
+
+@celery_app.task(name="app.tasks.tasks.heartbeat_shard", bind=True)
+def heartbeat_shard(self, shard: int):
+    """Poll one shard of the active routers concurrently and update their online status + metrics."""
+    # The lease outlives the cycle deadline, so an overrunning cycle is never doubled up
+    with lease(f"heartbeat:shard:{shard}", ttl=settings.HEARTBEAT_DEADLINE + settings.HEARTBEAT_INTERVAL) as acquired:
+        if not acquired:
+            print(f"Heartbeat shard {shard} still running, skipping this cycle")
+            return
+        run_async(_heartbeat_shard(shard))
+
+
+async def _heartbeat_shard(shard: int):
+    now = datetime.now(timezone.utc)
+
+    # Only routers whose polling plan says they are due (half a tick of slack
+    # so a router due just after this tick is not pushed to the next one).
+    # The session is closed before probing so no pooled connection sits idle
+    # in a transaction for the length of the cycle.
+    due_by = now + timedelta(seconds=settings.HEARTBEAT_INTERVAL / 2)
+    async with task_session() as session:
+        rows = (await session.execute(
+            select(Router, RouterPollPlan)
+            .outerjoin(RouterPollPlan, RouterPollPlan.router_id == Router.id)
+            .where(
+                Router.is_active == True,
+                shard_filter(Router.id, shard, settings.HEARTBEAT_SHARDS),
+                or_(RouterPollPlan.next_due_at == None, RouterPollPlan.next_due_at <= due_by),
+            )
+        )).all()
+    routers = [r for r, _ in rows]
+    plans = {r.id: plan for r, plan in rows}
+    full_checks = {
+        r.id: needs_ssh_check(r.id, r.is_online, plan.last_ssh_check_at if plan else None, now)
+        for r, plan in rows
+    }
+
+    # Probe the whole fleet on one event loop; the cycle takes as long as
+    # the slowest router (or the deadline), not the sum of all of them.
+    results = await fan_out(
+        routers,
+        lambda r: test_connectivity(
+            r.ip_address,
+            port=r.ssh_port,
+            full_check=full_checks[r.id],
+            username=r.ssh_user,
+            password=r.ssh_password,
+        ),
+        concurrency=settings.HEARTBEAT_CONCURRENCY,
+        deadline=settings.HEARTBEAT_DEADLINE,
+    )
+
+    points = []
+    snapshots = {}
+    uptime_samples = []
+    came_online, went_offline, still_online = [], [], []
+    next_plans = []
+
+    for router, result in zip(routers, results):
+        if isinstance(result, BaseException):
+            # Not probed before the deadline (or probe crashed): leave state as-is
+            print(f"Heartbeat error for {router.name}: {result!r}")
+            continue
+
+        point = (
+            Point("heartbeat")
+            .tag("router_id", str(router.id))
+            .tag("router_name", router.name)
+            .field("online", 1 if result.is_online else 0)
+        )
+        if result.tcp_latency_ms is not None:
+            point = point.field("tcp_latency_ms", result.tcp_latency_ms)
+        if result.ssh_latency_ms is not None:
+            point = point.field("ssh_latency_ms", result.ssh_latency_ms)
+        points.append(point)
+        snapshots[router.id] = heartbeat_snapshot(router, result, now)
+
+        plan = plans[router.id]
+        uptime_samples.append((router.id, result.is_online, plan.last_polled_at if plan else None))
+        next_plans.append({
+            "router_id": router.id,
+            **plan_next_poll(
+                router.is_online,
+                result.is_online,
+                plan.consecutive_failures if plan else 0,
+                plan.last_change_at if plan else None,
+                now,
+            ),
+            "last_ssh_check_at": now if full_checks[router.id] else (plan.last_ssh_check_at if plan else None),
+        })
+
+        if result.is_online:
+            (still_online if router.is_online else came_online).append(router)
+        elif router.is_online:
+            went_offline.append(router)
+
+    async with task_session() as session:
+        await _persist_heartbeat_state(session, came_online, went_offline, still_online, now)
+        await _persist_poll_plans(session, next_plans)
+        await session.commit()
+
+    await get_point_writer().write_async(points)
+    await write_snapshots(HEARTBEAT_KEY, snapshots)
+    await record_uptime(uptime_samples, now)
+    await publish(*_heartbeat_events(came_online, went_offline, still_online, now))
+    await mark_written(list(snapshots), "heartbeat")
+
+    # Routers that just came back online: pull signal metrics (after commit,
+    # so the task sees them as online)
+    for router in came_online:
+        poll_signal_metrics.delay(router.id)
 
 
 @celery_app.task(name="app.tasks.tasks.poll_signal_metrics")
 def poll_signal_metrics(router_id: int):
-    """Pull LTE signal metrics and store in InfluxDB."""
-    engine = get_sync_engine()
+    """Pull LTE signal metrics and system facts in one SSH round-trip and store in InfluxDB."""
+    run_async(_poll_signal_metrics(router_id))
+
+
+async def _poll_signal_metrics(router_id: int):
+    async with task_session() as session:
+        router = await session.get(Router, router_id)
+    if not router or not router.is_online:
+        return
+
+    points, snapshot = await collect_router_metrics(router)
+    if points:
+        await get_point_writer().write_async(points)
+        await _mark_collected([router_id], {router_id: snapshot} if snapshot else {})
 
-    with Session(engine) as session:
-        router = session.get(Router, router_id)
-        if not router or not router.is_online:
+
+@celery_app.task(name="app.tasks.tasks.signal_sweep")
+def signal_sweep():
+    """Fleet-wide signal + system collection for every router the heartbeat considers online."""
+    with lease("signal-sweep", ttl=settings.SIGNAL_SWEEP_INTERVAL) as acquired:
+        if not acquired:
+            print("Signal sweep still running, skipping")
+            return
+        return run_async(_signal_sweep())
+
+
+async def _signal_sweep() -> dict:
+    start = time.monotonic()
+
+    async with task_session() as session:
+        routers = (await session.execute(select(Router).where(Router.is_active == True))).scalars().all()
+    online = [r for r in routers if r.is_online]
+
+    results = await fan_out(
+        online,
+        collect_router_metrics,
+        concurrency=settings.SIGNAL_SWEEP_CONCURRENCY,
+        deadline=settings.SIGNAL_SWEEP_DEADLINE,
+    )
+
+    points = []
+    collected = []
+    snapshots = {}
+    failed = 0
+    for router, result in zip(online, results):
+        if isinstance(result, BaseException) or not result[0]:
+            failed += 1
+        else:
+            collected.append(router.id)
+            points.extend(result[0])
+            if result[1]:
+                snapshots[router.id] = result[1]
+    ok = len(collected)
+
+    stats = {
+        "duration_ms": int((time.monotonic() - start) * 1000),
+        "polled": len(online),
+        "ok": ok,
+        "failed": failed,
+        "skipped_offline": len(routers) - len(online),
+    }
+    points.append(
+        Point("signal_sweep")
+        .field("duration_ms", stats["duration_ms"])
+        .field("polled", stats["polled"])
+        .field("ok", ok)
+        .field("failed", failed)
+        .field("skipped_offline", stats["skipped_offline"])
+    )
+    await get_point_writer().write_async(points)
+    await _mark_collected(collected, snapshots)
+    print(f"Signal sweep: {stats}")
+    return stats
+
+
+@celery_app.task(name="app.tasks.tasks.rollup_metrics")
+def rollup_metrics():
+    """Extend the 5m and 1h rollup buckets up to the latest complete windows."""
+    with lease("rollup-metrics", ttl=settings.ROLLUP_INTERVAL) as acquired:
+        if not acquired:
+            print("Rollup still running, skipping")
             return
+        _ensure_buckets()
+
+        redis = get_redis()
+        now = time.time()
+        raw_start = None
+        source_checkpoint = None
+        rolled = {}
+        for tier in rollup_tiers():
+            checkpoint = redis.get(checkpoint_key(tier["name"]))
+            checkpoint = float(checkpoint) if checkpoint is not None else None
+            if tier["source"] != settings.INFLUX_BUCKET and source_checkpoint is None:
+                break  # the finer tier has not been built yet
+            if checkpoint is None and raw_start is None:
+                raw_start = _earliest_raw_time() or now
+
+            span = rollup_span(checkpoint, now, tier["every_s"], raw_start or now, source_checkpoint)
+            if span is not None:
+                start, stop = span
+                source = rollup_source(tier, start, now)
+                get_query_api().query(rollup_flux(tier, start, stop, source), org=settings.INFLUX_ORG)
+                redis.set(checkpoint_key(tier["name"]), stop)
+                checkpoint = stop
+                rolled[tier["name"]] = stop - start
+            source_checkpoint = checkpoint
+        print(f"Rollup: {rolled}")
+        return rolled
+
+
+def _earliest_raw_time() -> Optional[float]:
+    tables = get_query_api().query(earliest_flux(settings.INFLUX_BUCKET), org=settings.INFLUX_ORG)
+    times = [record.get_time() for table in tables for record in table.records]
+    return min(times).timestamp() if times else None
+
+
+@celery_app.task(name="app.tasks.tasks.apply_raw_retention")
+def apply_raw_retention():
+    """
+    Shorten the raw bucket's retention to INFLUX_RAW_RETENTION_DAYS. Not
+    scheduled: run it by hand once the rollups hold the history it deletes,
+    e.g. `celery -A app.tasks.celery_app call app.tasks.tasks.apply_raw_retention`.
+    """
+    checkpoints = {}
+    for tier in rollup_tiers():
+        value = get_redis().get(checkpoint_key(tier["name"]))
+        checkpoints[tier["name"]] = float(value) if value is not None else None
+    if not backfill_complete(checkpoints, time.time()):
+        print(f"Rollup backfill still running ({checkpoints}), raw retention left unchanged")
+        return {"applied": False, "checkpoints": checkpoints}
+    ensure_bucket(settings.INFLUX_BUCKET, settings.INFLUX_RAW_RETENTION_DAYS, shorten=True)
+    return {"applied": True, "retention_days": settings.INFLUX_RAW_RETENTION_DAYS}
+
+
+@celery_app.task(name="app.tasks.tasks.backfill_uptime")
+def backfill_uptime():
+    """Fill the uptime buckets for days before the counters existed, a few days per run."""
+    redis = get_redis()
+    cursor = redis.get(BACKFILL_CURSOR_KEY)
+    if cursor in (b"done", "done"):
+        return
+    with lease("backfill-uptime", ttl=settings.ROLLUP_INTERVAL) as acquired:
+        if not acquired:
+            print("Uptime backfill still running, skipping")
+            return
+        now = datetime.now(timezone.utc)
+        today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        day = datetime.fromtimestamp(float(cursor), timezone.utc) if cursor is not None else today - DAY
+        raw_start = _earliest_raw_time()
+        oldest = today - timedelta(days=settings.UPTIME_DAILY_RETENTION_DAYS)
+        if raw_start is not None:
+            oldest = max(oldest, datetime.fromtimestamp(raw_start, timezone.utc).replace(
+                hour=0, minute=0, second=0, microsecond=0))
+
+        filled = []
+        for _ in range(BACKFILL_DAYS_PER_RUN):
+            if raw_start is None or day < oldest:
+                redis.set(BACKFILL_CURSOR_KEY, "done")
+                break
+            if not redis.exists(day_key(day)):  # days the counters saw are left alone
+                _backfill_uptime_day(redis, day, now)
+                filled.append(f"{day:%Y-%m-%d}")
+            day -= DAY
+        else:
+            redis.set(BACKFILL_CURSOR_KEY, day.timestamp())
+        print(f"Uptime backfill: {filled}")
+        return filled
 
-        script = get_script("signal_strength")
-        result = run_async(
-            run_ssh_command(
-                router.ip_address,
-                script["command"],
-                port=router.ssh_port,
-                username=router.ssh_user,
-                password=router.ssh_password,
+
+def _backfill_uptime_day(redis, day: datetime, now: datetime):
+    tables = get_query_api().query(backfill_flux(day, day + DAY), org=settings.INFLUX_ORG)
+    rows = [
+        (int(record["router_id"]), record["_start"], record["total"], record["up"])
+        for table in tables for record in table.records
+    ]
+    buckets = backfill_buckets(rows)
+    age = (now - day).total_seconds()
+    # One MULTI per day: its daily bucket is what marks the day as done
+    pipe = redis.pipeline(transaction=True)
+    for key, fields in buckets.items():
+        retention = settings.UPTIME_DAILY_RETENTION_DAYS if key.startswith("uptime:d:") else settings.UPTIME_HOURLY_RETENTION_DAYS
+        ttl = int(retention * 86400 - age)
+        if ttl > 0:  # the counters would already have expired it
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, ttl)
+    # The month may already hold counted days, so the backfilled day is added to it
+    month_ttl = int(settings.UPTIME_MONTHLY_RETENTION_DAYS * 86400 - age)
+    if month_ttl > 0:
+        for field, seconds in buckets.get(day_key(day), {}).items():
+            pipe.hincrbyfloat(month_key(day), field, seconds)
+        pipe.expire(month_key(day), month_ttl, nx=True)
+    pipe.execute()
+
+
+_buckets_ready = False
+
+
+def _ensure_buckets():
+    global _buckets_ready
+    if _buckets_ready:
+        return
+    ensure_bucket(settings.INFLUX_BUCKET, settings.INFLUX_RAW_RETENTION_DAYS)  # never shortens
+    for tier in rollup_tiers():
+        ensure_bucket(tier["bucket"], tier["retention_days"])
+    _buckets_ready = True
+
+
+@celery_app.task(name="app.tasks.tasks.maintain_partitions")
+def maintain_partitions():
+    """Create the upcoming monthly history partitions and expire those past retention."""
+    with lease("maintain-partitions", ttl=settings.PARTITION_MAINTENANCE_INTERVAL) as acquired:
+        if not acquired:
+            print("Partition maintenance still running, skipping")
+            return
+        return run_async(_maintain_partitions())
+
+
+async def _maintain_partitions() -> dict:
+    now = datetime.now(timezone.utc)
+    changes = {}
+    async with task_session() as session:
+        for table in PARTITIONED_TABLES:
+            existing = (await session.execute(text(PARTITIONS_SQL), {"table": table})).scalars().all()
+            create, expire = plan_partitions(
+                table, existing, now, settings.PARTITION_PREMAKE_MONTHS, retention_months(table)
             )
-        )
+            for month in create:
+                await session.execute(text(create_partition_sql(table, month)))
+            for name in expire:
+                await session.execute(text(expire_partition_sql(table, name, settings.PARTITION_EXPIRED_ACTION)))
+            await session.commit()  # per table, so the parent's DDL lock is held briefly
+            changes[table] = {"created": [partition_name(table, m) for m in create], "expired": expire}
+    print(f"Partitions: {changes}")
+    return changes
+
+
+METRICS_COLLECTOR = build_collector(["signal_strength", "system_info"])
+
+
+async def collect_router_metrics(router) -> tuple[list, Optional[dict]]:
+    """
+    Run the signal + system collector on a router. Returns the Influx points
+    ([] on failure) and the signal snapshot (None without a signal reading).
+    """
+    result = await run_ssh_command(
+        router.ip_address,
+        METRICS_COLLECTOR,
+        port=router.ssh_port,
+        username=router.ssh_user,
+        password=router.ssh_password,
+    )
+    if not result.success:
+        return [], None
+
+    sections = split_collector_output(result.stdout)
+    points = []
+    snapshot = None
+
+    signal = _section(sections, "signal_strength")
+    fields = _signal_fields(signal)
+    if fields:
+        points.append(_signal_point(router, fields, signal))
+        snapshot = signal_snapshot(router, fields, signal, datetime.now(timezone.utc))
+
+    system = _section(sections, "system_info")
+    if system:
+        point = _system_point(router, system)
+        if point is not None:
+            points.append(point)
+    return points, snapshot
+
+
+def _section(sections: dict, name: str) -> dict:
+    data = parse_kv_output(sections.get(name, ""))
+    return {} if "collector-error" in data else data
+
 
-        if result.success:
-            data = parse_kv_output(result.stdout)
-            write_api = get_write_api()
-            point = Point("signal") \
-                .tag("router_id", str(router.id)) \
-                .tag("router_name", router.name) \
-                .tag("operator", data.get("operator", "unknown")) \
-                .tag("band", data.get("band", "unknown"))
+async def _mark_collected(router_ids: list[int], snapshots: dict[int, dict]):
+    await write_snapshots(SIGNAL_KEY, snapshots)
+    await mark_written(router_ids, "signal")
+    await mark_written(router_ids, "system")
 
-            for field in ["rssi", "rsrp", "rsrq", "sinr"]:
-                val = data.get(field)
-                if val and val not in ("", "none"):
-                    try:
-                        point = point.field(field, float(val))
-                    except ValueError:
-                        pass
 
-            write_api.write(bucket=settings.INFLUX_BUCKET, org=settings.INFLUX_ORG, record=point)
+def _signal_fields(data: dict) -> dict:
+    fields = {}
+    for field in ["rssi", "rsrp", "rsrq", "sinr"]:
+        val = data.get(field)
+        if val and val not in ("", "none"):
+            try:
+                fields[field] = float(val)
+            except ValueError:
+                pass
+    return fields
+
+
+def _signal_point(router, fields: dict, data: dict):
+    point = Point("signal") \
+        .tag("router_id", str(router.id)) \
+        .tag("router_name", router.name) \
+        .tag("operator", data.get("operator", "unknown")) \
+        .tag("band", data.get("band", "unknown"))
+    for field, value in fields.items():
+        point = point.field(field, value)
+    return point
+
+
+def _system_point(router, data: dict):
+    point = Point("system") \
+        .tag("router_id", str(router.id)) \
+        .tag("router_name", router.name) \
+        .tag("version", data.get("version", "unknown")) \
+        .tag("board_name", data.get("board-name", "unknown"))
+
+    has_field = False
+    for key, field in [("cpu-load", "cpu_load"), ("free-memory", "free_memory"), ("total-memory", "total_memory")]:
+        try:
+            point = point.field(field, float(data[key]))
+            has_field = True
+        except (KeyError, ValueError):
+            pass
+
+    uptime_s = parse_routeros_duration(data.get("uptime", ""))
+    if uptime_s is not None:
+        point = point.field("uptime_s", uptime_s)
+        has_field = True
+    return point if has_field else None
 
 
 @celery_app.task(name="app.tasks.tasks.execute_script", bind=True)
 def execute_script(self, execution_id: int):
     """Execute a RouterOS script and save result."""
-    engine = get_sync_engine()
+    return run_async(_execute_script(execution_id))
+
 
-    with Session(engine) as session:
-        execution = session.get(ScriptExecution, execution_id)
+async def _execute_script(execution_id: int):
+    async with task_session() as session:
+        execution = await session.get(ScriptExecution, execution_id)
         if not execution:
             return
 
-        router = session.get(Router, execution.router_id)
+        router = await session.get(Router, execution.router_id)
         if not router:
             return
 
         execution.status = "running"
-        session.commit()
+        await session.commit()
+        await publish(execution_event(execution))
 
         script = get_script(execution.script_name)
         if not script:
             execution.status = "error"
             execution.error = f"Unknown script: {execution.script_name}"
             execution.completed_at = datetime.now(timezone.utc)
-            session.commit()
+            await session.commit()
+            await publish(execution_event(execution))
             return
 
-        result = run_async(
-            run_ssh_command(
-                router.ip_address,
-                script["command"],
-                port=router.ssh_port,
-                username=router.ssh_user,
-                password=router.ssh_password,
-            )
+        result = await run_ssh_command(
+            router.ip_address,
+            script["command"],
+            port=router.ssh_port,
+            username=router.ssh_user,
+            password=router.ssh_password,
         )
 
         execution.status = "success" if result.success else "error"
@@ -155,20 +576,98 @@ def execute_script(self, execution_id: int):
         execution.error = result.stderr if not result.success else None
         execution.duration_ms = result.duration_ms
         execution.completed_at = datetime.now(timezone.utc)
-        session.commit()
+        await session.commit()
+        await publish(execution_event(execution))
 
         # Store signal data in InfluxDB if it was a signal script
         if execution.script_name == "signal_strength" and result.success:
             poll_signal_metrics.delay(router.id)
 
-        return {"status": execution.status, "output": execution.output}
+        return {"status": execution.status, "output_size": execution.output_size}
+
+
+def _heartbeat_events(came_online, went_offline, still_online, now) -> list[dict]:
+    events = [
+        make_event("router.status", router_id=r.id, is_online=True, last_seen=now.isoformat())
+        for r in came_online
+    ]
+    for r in went_offline:
+        events.append(make_event("router.status", router_id=r.id, is_online=False,
+                                 last_seen=r.last_seen.isoformat() if r.last_seen else None))
+        events.append(make_event("alert.created", router_id=r.id, alert_type="offline",
+                                 message=f"Router {r.name} went offline", severity="critical"))
+    if still_online:
+        events.append(make_event("routers.seen", router_ids=[r.id for r in still_online], last_seen=now.isoformat()))
+    return events
+
+
+def execution_event(execution) -> dict:
+    return make_event(
+        "execution.status",
+        router_id=execution.router_id,
+        execution_id=execution.id,
+        script_name=execution.script_name,
+        status=execution.status,
+        duration_ms=execution.duration_ms,
+    )
+
+
+async def _persist_heartbeat_state(session, came_online, went_offline, still_online, now):
+    """
+    Write a heartbeat cycle back with at most three statements: one UPDATE for
+    the routers whose state flipped, one UPDATE refreshing last_seen for routers
+    that stayed online (leaving updated_at alone), and one batch INSERT of the
+    offline alerts.
+    """
+    changed_ids = [r.id for r in came_online + went_offline]
+    if changed_ids:
+        came_online_ids = [r.id for r in came_online]
+        await session.execute(
+            update(Router)
+            .where(Router.id.in_(changed_ids))
+            .values(
+                is_online=Router.id.in_(came_online_ids),
+                last_seen=case((Router.id.in_(came_online_ids), now), else_=Router.last_seen),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    if still_online:
+        await session.execute(
+            update(Router)
+            .where(Router.id.in_([r.id for r in still_online]))
+            .values(last_seen=now, updated_at=Router.updated_at)
+            .execution_options(synchronize_session=False)
+        )
+
+    if went_offline:
+        await session.execute(
+            insert(Alert),
+            [
+                {
+                    "router_id": r.id,
+                    "alert_type": "offline",
+                    "message": f"Router {r.name} went offline",
+                    "severity": "critical",
+                }
+                for r in went_offline
+            ],
+        )
 
 
-def _create_offline_alert(session, router):
-    alert = Alert(
-        router_id=router.id,
-        alert_type="offline",
-        message=f"Router {router.name} went offline",
-        severity="critical",
+async def _persist_poll_plans(session, plans: list[dict]):
+    """Upsert the cycle's polling plans in one executemany statement."""
+    if not plans:
+        return
+    stmt = pg_insert(RouterPollPlan)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[RouterPollPlan.router_id],
+            set_={
+                col: stmt.excluded[col]
+                for col in ("interval_s", "next_due_at", "last_polled_at", "last_change_at",
+                            "last_ssh_check_at", "consecutive_failures", "reason")
+            },
+        ),
+        plans,
     )
-    session.add(alert)
@@ -4,6 +4,7 @@ so the app can be imported without running external services.
 """
 import os
 import sys
+import types
 from unittest.mock import MagicMock
 
 # --- Set required env vars before any app imports ---
@@ -37,7 +38,14 @@ sys.modules.setdefault("asyncssh", MagicMock())
 sys.modules.setdefault("aiosmtplib", MagicMock())
 sys.modules.setdefault("celery", MagicMock())
 sys.modules.setdefault("celery.schedules", MagicMock())
+sys.modules.setdefault("celery.signals", MagicMock())
 sys.modules.setdefault("redis", MagicMock())
+sys.modules.setdefault("redis.asyncio", MagicMock())
+# Exception classes have to be real to be caught
+_redis_exceptions = types.ModuleType("redis.exceptions")
+_redis_exceptions.RedisError = type("RedisError", (Exception,), {})
+_redis_exceptions.ConnectionError = type("ConnectionError", (_redis_exceptions.RedisError,), {})
+sys.modules.setdefault("redis.exceptions", _redis_exceptions)
 sys.modules.setdefault("redbeat", MagicMock())
 sys.modules.setdefault("twilio", MagicMock())
 sys.modules.setdefault("twilio.request_validator", MagicMock())
@@ -0,0 +1,46 @@
+import numpy as np
+from app.services.analytics import fleet_signal_stats
+
+
+def test_rankings_percentiles_and_breakdowns():
+    rows = [
+        # router_id, name, operator, band, value, time; series arrive one after another
+        (1, "R01", "OpA", "B3", -80.0, 100),
+        (1, "R01", "OpA", "B3", -90.0, 200),
+        (2, "R02", "OpA", "B20", -110.0, 100),
+        (3, "R03-renamed", "OpB", "B3", -72.0, 200),
+        (3, "R03", "OpB", "B3", -70.0, 100),
+    ]
+    ids, names, operators, bands, values, times = zip(*rows)
+    stats = fleet_signal_stats(ids, names, operators, bands, values, times, limit=2)
+
+    assert stats["routers"] == 3
+    assert stats["samples"] == 5
+    assert [r["router_id"] for r in stats["top"]] == [3, 1]
+    assert [r["router_id"] for r in stats["bottom"]] == [2, 1]
+    assert stats["top"][0] == {"router_id": 3, "router_name": "R03-renamed", "mean": -71.0,
+                               "min": -72.0, "max": -70.0, "samples": 2}
+    assert stats["distribution"]["p50"] == -85.0  # median of router means -110, -85, -71
+
+    by_operator = {row["operator"]: row for row in stats["by_operator"]}
+    assert by_operator["OpA"]["routers"] == 2
+    assert by_operator["OpA"]["samples"] == 3
+    assert by_operator["OpB"]["mean"] == -71.0
+    assert {row["band"] for row in stats["by_band"]} == {"B3", "B20"}
+
+
+def test_empty_fleet():
+    stats = fleet_signal_stats([], [], [], [], [], [], limit=5)
+    assert stats["routers"] == 0
+    assert stats["top"] == []
+
+
+def test_scales_to_large_fleets():
+    rng = np.random.default_rng(0)
+    n = 5000 * 48
+    ids = rng.integers(1, 5001, n)
+    values = rng.normal(-95, 10, n)
+    stats = fleet_signal_stats(ids, ["r"] * n, rng.choice(["A", "B", "C"], n), rng.choice(["B3", "B7"], n), values, rng.random(n), 20)
+    assert stats["routers"] == 5000
+    assert len(stats["top"]) == 20
+    assert stats["top"][0]["mean"] >= stats["top"][-1]["mean"]
@@ -0,0 +1,38 @@
+import numpy as np
+from app.services.downsample import lttb_indices, lttb_rows
+
+
+def test_short_series_is_returned_unchanged():
+    assert list(lttb_indices([0, 1, 2], [5, 6, 7], 10)) == [0, 1, 2]
+
+
+def test_keeps_endpoints_and_size():
+    x = np.arange(1000)
+    y = np.sin(x / 20)
+    idx = lttb_indices(x, y, 100)
+    assert len(idx) == 100
+    assert idx[0] == 0 and idx[-1] == 999
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_spikes_survive():
+    x = np.arange(2000)
+    y = np.zeros(2000)
+    y[777] = -40.0  # a short signal drop
+    y[1500] = 25.0
+    idx = lttb_indices(x, y, 50)
+    assert 777 in idx
+    assert 1500 in idx
+
+
+def test_rows_share_one_time_axis():
+    times = list(range(0, 60_000_000, 60_000))  # 1000 minutes in epoch ms
+    rssi = [-70.0] * 1000
+    rssi[400] = -110.0
+    sinr = [None if i % 2 else 10.0 for i in range(1000)]
+    sinr[600] = 30.0
+
+    rows = lttb_rows(times, [rssi, sinr], 50)
+    assert 400 in rows and 600 in rows
+    assert np.all(np.diff(rows) > 0)
+    assert len(rows) <= 100
@@ -0,0 +1,53 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from redis.exceptions import ConnectionError as RedisConnectionError
+from app.services.events import EventBroker, SUBSCRIBER_QUEUE_SIZE, filter_event, make_event, publish
+
+
+def test_filter_single_router_events():
+    event = {"type": "router.status", "router_id": 3}
+    assert filter_event(event, None) is event
+    assert filter_event(event, {3, 4}) is event
+    assert filter_event(event, {4}) is None
+
+
+def test_filter_trims_batched_events():
+    event = {"type": "routers.seen", "router_ids": [1, 2, 3]}
+    assert filter_event(event, {2, 9}) == {"type": "routers.seen", "router_ids": [2]}
+    assert filter_event(event, {9}) is None
+
+
+def test_broker_fans_out_per_subscription():
+    async def main():
+        broker = EventBroker()
+        everyone = broker.subscribe()
+        only_two = broker.subscribe({2})
+        broker.dispatch({"type": "router.status", "router_id": 1})
+        broker.dispatch({"type": "router.status", "router_id": 2})
+        broker.unsubscribe(everyone)
+        broker.dispatch({"type": "router.status", "router_id": 2})
+        return everyone.qsize(), only_two.qsize()
+
+    assert asyncio.run(main()) == (2, 2)
+
+
+def test_slow_subscriber_drops_oldest():
+    async def main():
+        broker = EventBroker()
+        queue = broker.subscribe()
+        for i in range(SUBSCRIBER_QUEUE_SIZE + 5):
+            broker.dispatch({"type": "router.status", "router_id": i})
+        return queue.qsize(), queue.get_nowait()["router_id"]
+
+    assert asyncio.run(main()) == (SUBSCRIBER_QUEUE_SIZE, 5)
+
+
+@patch("app.services.events.get_async_redis")
+def test_publish_failure_is_logged_not_raised(mock_redis, caplog):
+    pipe = MagicMock(execute=AsyncMock(side_effect=RedisConnectionError("redis down")))
+    pipe.__aenter__ = AsyncMock(return_value=pipe)
+    pipe.__aexit__ = AsyncMock(return_value=False)
+    mock_redis.return_value.pipeline.return_value = pipe
+
+    asyncio.run(publish(make_event("execution.status", router_id=1, execution_id=7, status="running")))
+    assert "Publishing 1 events failed" in caplog.text
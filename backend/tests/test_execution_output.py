@@ -0,0 +1,32 @@
+from app.models.models import ScriptExecution
+from app.services.execution_output import pack_output, unpack_output
+
+
+def test_round_trip_compresses():
+    text = "name=ether1 mtu=1500 running=yes\n" * 2000
+    blob, size, truncated = pack_output(text, 1_000_000)
+    assert unpack_output(blob) == text
+    assert size == len(text)
+    assert not truncated
+    assert len(blob) < size / 10
+
+
+def test_truncates_on_character_boundary():
+    text = "é" * 10  # 2 bytes each
+    blob, size, truncated = pack_output(text, 5)
+    assert truncated
+    assert size == 20
+    assert unpack_output(blob) == "éé"
+
+
+def test_none_passes_through():
+    assert pack_output(None, 10) == (None, None, False)
+    assert unpack_output(None) is None
+
+
+def test_model_property_packs_output():
+    execution = ScriptExecution(router_id=1, script_name="signal_strength")
+    execution.output = "rssi=-71"
+    assert execution.output_size == 8
+    assert execution.output_truncated is False
+    assert execution.output == "rssi=-71"
@@ -0,0 +1,44 @@
+import csv
+import io
+from datetime import datetime, timezone
+import pytest
+from app.services import export
+from app.services.export import iter_arrow, iter_csv
+
+
+def _rows(n):
+    for i in range(n):
+        yield {
+            "time": datetime(2026, 1, 1, 0, i % 60, tzinfo=timezone.utc),
+            "router_id": i % 3,
+            "router_name": f"R{i % 3:02d}",
+            "rssi": -70.0 - i,
+            "sinr": None if i % 2 else 12.5,
+        }
+
+
+def test_csv_streams_in_chunks(monkeypatch):
+    monkeypatch.setattr(export, "EXPORT_CHUNK_ROWS", 4)
+    chunks = list(iter_csv(_rows(10), ["rssi", "sinr"]))
+    assert len(chunks) == 3
+
+    rows = list(csv.reader(io.StringIO("".join(chunks))))
+    assert rows[0] == ["time", "router_id", "router_name", "rssi", "sinr"]
+    assert len(rows) == 11
+    assert rows[1] == ["2026-01-01T00:00:00+00:00", "0", "R00", "-70.0", "12.5"]
+    assert rows[2][4] == ""
+
+
+def test_csv_without_rows_has_header_only():
+    assert "".join(iter_csv(iter([]), ["rssi"])) == "time,router_id,router_name,rssi\r\n"
+
+
+def test_arrow_stream_round_trips(monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    monkeypatch.setattr(export, "EXPORT_CHUNK_ROWS", 4)
+    data = b"".join(iter_arrow(_rows(10), ["rssi", "sinr"]))
+
+    table = pa.ipc.open_stream(data).read_all()
+    assert table.num_rows == 10
+    assert table.column("rssi").to_pylist()[0] == -70.0
+    assert table.column("sinr").null_count == 5
@@ -0,0 +1,55 @@
+import asyncio
+from app.services.fanout import fan_out
+
+
+def test_results_keep_input_order():
+    async def worker(n):
+        await asyncio.sleep(0.01 * (5 - n))
+        return n * 10
+
+    results = asyncio.run(fan_out(range(5), worker, concurrency=5, deadline=5))
+    assert results == [0, 10, 20, 30, 40]
+
+
+def test_concurrency_cap_is_respected():
+    running = 0
+    peak = 0
+
+    async def worker(n):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return n
+
+    asyncio.run(fan_out(range(20), worker, concurrency=4, deadline=5))
+    assert peak == 4
+
+
+def test_exceptions_and_deadline_are_returned_per_item():
+    async def worker(n):
+        if n == 0:
+            raise RuntimeError("boom")
+        if n == 1:
+            await asyncio.sleep(10)
+        return n
+
+    results = asyncio.run(fan_out(range(3), worker, concurrency=3, deadline=0.1))
+    assert isinstance(results[0], RuntimeError)
+    assert isinstance(results[1], asyncio.TimeoutError)
+    assert results[2] == 2
+
+
+def test_wall_time_follows_slowest_item():
+    async def worker(n):
+        await asyncio.sleep(0.1)
+        return n
+
+    loop = asyncio.new_event_loop()
+    try:
+        start = loop.time()
+        loop.run_until_complete(fan_out(range(50), worker, concurrency=50, deadline=5))
+        assert loop.time() - start < 1
+    finally:
+        loop.close()
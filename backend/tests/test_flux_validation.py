@@ -1,5 +1,7 @@
+import time
 import pytest
-from app.api.metrics import validate_range
+from unittest.mock import patch
+from app.api.metrics import validate_range, parse_fields, pick_window, field_selector, source_covers, _export_flux, _series_payload, SIGNAL_FIELDS
 
 
 def test_valid_ranges():
@@ -20,3 +22,63 @@ def test_invalid_ranges_raise():
     ]:
         with pytest.raises(ValueError):
             validate_range(r)
+
+
+def test_parse_fields_defaults_to_all():
+    assert parse_fields(None, SIGNAL_FIELDS) == ["rssi", "rsrp", "rsrq", "sinr"]
+    assert parse_fields("rsrp, sinr,rsrp", SIGNAL_FIELDS) == ["rsrp", "sinr"]
+
+
+def test_parse_fields_rejects_unknown_names():
+    for fields in ["rsrp,_value", 'rsrp") |> drop(', ","]:
+        with pytest.raises(ValueError):
+            parse_fields(fields, SIGNAL_FIELDS)
+
+
+def test_window_grows_with_range():
+    assert pick_window("1h", 500) == "1m"
+    assert pick_window("24h", 500) == "5m"
+    assert pick_window("7d", 500) == "1h"
+    assert pick_window("4w", 500) == "3h"
+    assert pick_window("4w", 50) == "1d"
+
+
+def test_columnar_payload_shares_time_axis():
+    columns = {"time": [0, 60000, 120000], "rssi": [-70.0, None, -71.5], "sinr": [10.0, 11.0, None]}
+    payload = _series_payload(columns, ["rssi", "sinr"], SIGNAL_FIELDS, 500, None, "columnar")
+    assert payload == {"time": [0, 60000, 120000], "rssi": [-70.0, None, -71.5], "sinr": [10.0, 11.0, None]}
+
+
+def test_points_payload_skips_gaps():
+    columns = {"time": [0, 60000], "rssi": [-70.0, None]}
+    payload = _series_payload(columns, ["rssi"], SIGNAL_FIELDS, 500, None, "points")
+    assert payload == {"rssi": [{"time": "1970-01-01T00:00:00+00:00", "value": -70.0}]}
+
+
+def test_source_covers_long_raw_ranges_only_within_retention():
+    now = 1_800_000_000.0
+    checkpoints = {"5m": now - 600, "1h": now - 3600}
+    with patch("app.api.metrics.settings") as s:
+        s.INFLUX_RAW_RETENTION_DAYS = 0  # kept forever
+        assert source_covers("52w", None, {}, now)
+        s.INFLUX_RAW_RETENTION_DAYS = 30
+        assert source_covers("4w", None, {}, now)
+        assert not source_covers("8w", None, checkpoints, now)
+        assert not source_covers("8w", "1m", checkpoints, now)  # finer than any rollup
+        assert source_covers("8w", "1h", checkpoints, now)
+
+
+def test_legacy_latency_field_is_read_as_ssh_latency():
+    selector = field_selector("heartbeat", ["ssh_latency_ms"])
+    assert 'r._field == "ssh_latency_ms" or r._field == "latency_ms"' in selector
+    assert 'if r._field == "latency_ms" then "ssh_latency_ms"' in selector
+    assert "latency_ms" not in field_selector("heartbeat", ["tcp_latency_ms"]).replace("tcp_latency_ms", "")
+
+
+def test_export_flux_uses_the_checkpoints_it_is_given():
+    now = time.time()
+    with patch("app.api.metrics.get_redis", side_effect=AssertionError("blocking Redis call on the event loop")):
+        flux = _export_flux("signal", [1], ["rsrp"], "30d", "1h", {"5m": now - 600, "1h": now - 3600})
+        raw = _export_flux("signal", [1], ["rsrp"], "30d", None, {})
+    assert "union(tables:" in flux
+    assert "union(tables:" not in raw
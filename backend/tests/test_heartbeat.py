@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, patch
+from app.services.heartbeat import needs_ssh_check, shard_filter, shard_for
+from app.models.models import Router
+from app.services import ssh
+from app.services.ssh import SSHResult
+
+NOW = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def test_offline_routers_always_get_ssh_check():
+    assert needs_ssh_check(7, False, NOW, NOW)
+    assert needs_ssh_check(7, False, None, NOW)
+
+
+def test_online_routers_get_ssh_check_every_nth_base_interval():
+    with patch("app.services.heartbeat.settings") as mock_settings:
+        mock_settings.HEARTBEAT_SSH_EVERY = 5
+        mock_settings.POLL_BASE_INTERVAL = 60
+        mock_settings.HEARTBEAT_INTERVAL = 20
+        # Probed every 20s tick (fast window) for 20 minutes: one check per 5 minutes, not bursts
+        last, checks = NOW, 0
+        for tick in range(1, 61):
+            now = NOW + timedelta(seconds=20 * tick)
+            if needs_ssh_check(7, True, last, now):
+                last, checks = now, checks + 1
+        assert checks == 4
+
+
+def test_first_checks_are_spread_by_router_id():
+    with patch("app.services.heartbeat.settings") as mock_settings:
+        mock_settings.HEARTBEAT_SSH_EVERY = 5
+        mock_settings.POLL_BASE_INTERVAL = 60
+        mock_settings.HEARTBEAT_INTERVAL = 20
+        checked = [needs_ssh_check(router_id, True, None, NOW) for router_id in range(10)]
+    assert checked == [False, False, False, False, True] * 2
+
+
+@patch("app.services.ssh.run_ssh_command", new_callable=AsyncMock)
+@patch("app.services.ssh.tcp_probe", new_callable=AsyncMock)
+def test_unreachable_port_skips_ssh(mock_tcp, mock_ssh):
+    mock_tcp.return_value = (False, 3000)
+    result = asyncio.run(ssh.test_connectivity("10.0.0.1", port=22, full_check=True))
+    assert not result.is_online
+    assert result.tcp_latency_ms is None
+    mock_ssh.assert_not_awaited()
+
+
+@patch("app.services.ssh.run_ssh_command", new_callable=AsyncMock)
+@patch("app.services.ssh.tcp_probe", new_callable=AsyncMock)
+def test_tiers_report_separate_latencies(mock_tcp, mock_ssh):
+    mock_tcp.return_value = (True, 12)
+    mock_ssh.return_value = SSHResult("ok", "", 0, 40)
+
+    light = asyncio.run(ssh.test_connectivity("10.0.0.1", port=22, full_check=False))
+    assert light.is_online and light.tcp_latency_ms == 12 and light.ssh_latency_ms is None
+    mock_ssh.assert_not_awaited()
+
+    full = asyncio.run(ssh.test_connectivity("10.0.0.1", port=22, full_check=True))
+    assert full.is_online and full.tcp_latency_ms == 12 and full.ssh_latency_ms == 40
+
+
+def test_shard_assignment_is_stable_and_spread():
+    shards = [shard_for(router_id, 8) for router_id in range(1, 1001)]
+    assert shards == [shard_for(router_id, 8) for router_id in range(1, 1001)]
+    counts = [shards.count(n) for n in range(8)]
+    assert min(counts) > 80
+
+
+def test_shard_filter_matches_shard_for():
+    clause = shard_filter(Router.id, 3, 8)
+    assert str(clause.compile(compile_kwargs={"literal_binds": True})) == "routers.id % 8 = 3"
+    assert [r for r in range(1, 40) if shard_for(r, 8) == 3] == [3, 11, 19, 27, 35]
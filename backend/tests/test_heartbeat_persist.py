@@ -0,0 +1,76 @@
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+from sqlalchemy.dialects import postgresql
+from app.tasks import tasks
+
+NOW = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+
+
+def _router(router_id):
+    router = MagicMock(id=router_id)
+    router.name = f"R{router_id:02d}"
+    return router
+
+
+def _persist(came_online, went_offline, still_online) -> list:
+    session = MagicMock(execute=AsyncMock())
+    asyncio.run(tasks._persist_heartbeat_state(
+        session, [_router(i) for i in came_online], [_router(i) for i in went_offline],
+        [_router(i) for i in still_online], NOW,
+    ))
+    return session.execute.await_args_list
+
+
+def _sql(call) -> tuple[str, dict]:
+    compiled = call.args[0].compile(dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True})
+    return str(compiled), compiled.params
+
+
+def test_a_cycle_is_three_statements():
+    calls = _persist(came_online=[1], went_offline=[2], still_online=[3, 4])
+    assert len(calls) == 3
+
+    changed, params = _sql(calls[0])
+    assert changed.startswith("UPDATE routers SET")
+    assert "is_online=(routers.id IN (" in changed
+    assert sorted(v for k, v in params.items() if k.startswith("id_3")) == [1, 2]  # only the flipped rows
+
+    refreshed, params = _sql(calls[1])
+    assert "updated_at=routers.updated_at" in refreshed  # not bumped by a mere last_seen refresh
+    assert "is_online" not in refreshed
+    assert params["last_seen"] == NOW
+    assert sorted(v for k, v in params.items() if k.startswith("id_")) == [3, 4]
+
+    alerts, _ = _sql(calls[2])
+    assert alerts.startswith("INSERT INTO alerts")
+    assert calls[2].args[1] == [
+        {"router_id": 2, "alert_type": "offline", "message": "Router R02 went offline", "severity": "critical"},
+    ]
+
+
+def test_only_offline_transitions_render_an_empty_in_as_false():
+    calls = _persist(came_online=[], went_offline=[2], still_online=[])
+    assert len(calls) == 2  # no last_seen refresh without routers that stayed online
+    changed, _ = _sql(calls[0])
+    assert "is_online=(routers.id IN (NULL) AND (1 != 1))" in changed
+    assert "THEN" in changed and "ELSE routers.last_seen" in changed  # last_seen kept for routers going down
+
+
+def test_quiet_cycle_only_refreshes_last_seen():
+    calls = _persist(came_online=[], went_offline=[], still_online=[5])
+    assert len(calls) == 1
+    assert "updated_at=routers.updated_at" in _sql(calls[0])[0]
+    assert _persist([], [], []) == []
+
+
+def test_poll_plans_are_one_upsert():
+    session = MagicMock(execute=AsyncMock())
+    plans = [{"router_id": 1}, {"router_id": 2}]
+    asyncio.run(tasks._persist_poll_plans(session, plans))
+    call = session.execute.await_args
+    sql, _ = _sql(call)
+    assert sql.startswith("INSERT INTO router_poll_plans")
+    assert "ON CONFLICT (router_id) DO UPDATE SET" in sql
+    assert "last_ssh_check_at = excluded.last_ssh_check_at" in sql
+    assert call.args[1] == plans
@@ -0,0 +1,129 @@
+import asyncio
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from app.core.influx import BufferedPointWriter, ensure_bucket, is_shorter_retention, run_in_query_executor
+
+
+def _writer(write_api=None, **overrides):
+    options = dict(batch_size=3, flush_interval=60, max_buffer=10, block_timeout=0)
+    options.update(overrides)
+    return BufferedPointWriter(write_api or MagicMock(), bucket="b", org="o", **options)
+
+
+def test_flush_writes_in_batches():
+    write_api = MagicMock()
+    writer = _writer(write_api)
+    writer.write(list(range(7)))
+    writer.flush()
+
+    batches = [c.kwargs["record"] for c in write_api.write.call_args_list]
+    assert sorted(p for batch in batches for p in batch) == list(range(7))
+    assert all(len(batch) <= 3 for batch in batches)
+    assert writer.stats()["flushed"] == 7
+    writer.close()
+
+
+def test_full_buffer_drops_after_block_timeout():
+    writer = _writer(batch_size=5, max_buffer=5)
+    writer._ensure_flusher = lambda: None  # keep the background thread out of the way
+
+    writer.write(list(range(8)))
+    stats = writer.stats()
+    assert stats["queued"] == 5
+    assert stats["dropped"] == 3
+
+
+def test_failed_batch_is_requeued():
+    write_api = MagicMock()
+    write_api.write.side_effect = [RuntimeError("influx down"), None]
+    writer = _writer(write_api)
+    writer._ensure_flusher = lambda: None
+
+    writer.write([1, 2])
+    writer.flush()
+    assert writer.stats()["buffered"] == 2
+    writer.flush()
+    assert writer.stats() == {"queued": 2, "flushed": 2, "dropped": 0, "failed_batches": 1, "buffered": 0}
+
+
+def test_queries_run_off_the_event_loop_thread():
+    async def main():
+        return await run_in_query_executor(lambda x: (threading.get_ident(), x * 2), 21)
+
+    thread_id, value = asyncio.run(main())
+    assert value == 42
+    assert thread_id != threading.get_ident()
+
+
+def test_ensure_bucket_never_shortens_retention_implicitly():
+    bucket = MagicMock()
+    bucket.retention_rules = [MagicMock(every_seconds=0)]  # keep forever
+    client = MagicMock()
+    client.buckets_api.return_value.find_bucket_by_name.return_value = bucket
+    with patch("app.core.influx._client", client):
+        ensure_bucket("raw", 30)
+        client.buckets_api.return_value.update_bucket.assert_not_called()
+        ensure_bucket("raw", 30, shorten=True)
+        client.buckets_api.return_value.update_bucket.assert_called_once()
+
+
+def test_retention_comparison_treats_zero_as_forever():
+    assert is_shorter_retention(86400, 0)
+    assert is_shorter_retention(86400, 2 * 86400)
+    assert not is_shorter_retention(0, 86400)
+    assert not is_shorter_retention(2 * 86400, 86400)
+
+
+def test_offer_drops_instead_of_waiting():
+    writer = _writer(batch_size=5, max_buffer=5, block_timeout=30)
+    writer._ensure_flusher = lambda: None
+
+    start = time.monotonic()
+    writer.offer(list(range(8)))
+    assert time.monotonic() - start < 1
+    stats = writer.stats()
+    assert stats["queued"] == 5
+    assert stats["dropped"] == 3
+
+
+def test_drops_and_failures_are_logged(caplog):
+    write_api = MagicMock()
+    write_api.write.side_effect = RuntimeError("influx down")
+    writer = _writer(write_api, batch_size=2, max_buffer=2)
+    writer._ensure_flusher = lambda: None
+
+    with caplog.at_level("WARNING", logger="app.core.influx"):
+        writer.offer([1, 2, 3])
+        writer.flush()
+    assert "dropped 1 points (1 dropped in total)" in caplog.text
+    assert "1 failed batches" in caplog.text
+
+
+def test_write_async_waits_on_the_loop_until_the_flusher_makes_room():
+    write_api = MagicMock()
+    writer = _writer(write_api, batch_size=5, max_buffer=5, block_timeout=5)
+    writer._ensure_flusher = lambda: None
+
+    async def scenario():
+        writer.offer(list(range(5)))  # buffer full
+        waiting = asyncio.create_task(writer.write_async([5, 6, 7]))
+        await asyncio.sleep(0.1)  # the loop keeps running while the writer waits
+        assert not waiting.done()
+        writer.flush()
+        await asyncio.wait_for(waiting, 1)
+
+    asyncio.run(scenario())
+    writer.flush()
+    assert writer.stats()["dropped"] == 0
+    assert writer.stats()["flushed"] == 8
+
+
+def test_write_async_drops_what_does_not_fit_by_the_timeout():
+    writer = _writer(batch_size=5, max_buffer=5)
+    writer._ensure_flusher = lambda: None
+    writer.offer(list(range(4)))
+
+    asyncio.run(writer.write_async([4, 5, 6], timeout=0.1))
+    assert writer.stats()["queued"] == 5
+    assert writer.stats()["dropped"] == 2
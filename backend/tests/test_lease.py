@@ -0,0 +1,41 @@
+from unittest.mock import MagicMock, patch
+import pytest
+from app.core.redis import lease
+
+
+def _client(acquired):
+    client = MagicMock()
+    client.set.return_value = True if acquired else None
+    return client
+
+
+def test_lease_is_taken_with_nx_and_ttl_and_released_with_its_token():
+    client = _client(acquired=True)
+    with patch("app.core.redis.get_redis", return_value=client):
+        with lease("rollup-metrics", ttl=300) as acquired:
+            assert acquired
+            client.eval.assert_not_called()
+
+    key, token = client.set.call_args.args
+    assert key == "lease:rollup-metrics"
+    assert client.set.call_args.kwargs == {"nx": True, "ex": 300}
+    # Released by compare-and-delete on our own token, not a blind DEL
+    _, numkeys, released_key, released_token = client.eval.call_args.args
+    assert (numkeys, released_key, released_token) == (1, key, token)
+
+
+def test_held_lease_is_skipped_and_not_released():
+    client = _client(acquired=False)
+    with patch("app.core.redis.get_redis", return_value=client):
+        with lease("heartbeat:shard:3", ttl=38) as acquired:
+            assert not acquired
+    client.eval.assert_not_called()
+
+
+def test_lease_is_released_when_the_body_raises():
+    client = _client(acquired=True)
+    with patch("app.core.redis.get_redis", return_value=client):
+        with pytest.raises(RuntimeError):
+            with lease("signal-sweep", ttl=60):
+                raise RuntimeError("task failed")
+    client.eval.assert_called_once()
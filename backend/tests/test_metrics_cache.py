@@ -0,0 +1,45 @@
+import asyncio
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+from redis.exceptions import ConnectionError as RedisConnectionError
+from app.services import metrics_cache
+
+
+def _client(entry, written_at):
+    client = MagicMock()
+    client.mget = AsyncMock(return_value=[entry, written_at])
+    client.incr = AsyncMock()
+    return client
+
+
+@patch("app.services.metrics_cache.get_async_redis")
+def test_fresh_entry_is_a_hit(mock_redis):
+    entry = json.dumps({"computed_at": time.time(), "data": [{"time": "t", "value": 1.0}]})
+    mock_redis.return_value = client = _client(entry, str(time.time() - 60))
+
+    data = asyncio.run(metrics_cache.get_cached(1, "signal", "rsrp", "24h", "5m"))
+    assert data == [{"time": "t", "value": 1.0}]
+    client.incr.assert_awaited_once_with("metrics:cache:hits")
+
+
+@patch("app.services.metrics_cache.get_async_redis")
+def test_entry_older_than_last_write_is_a_miss(mock_redis):
+    entry = json.dumps({"computed_at": time.time() - 60, "data": []})
+    mock_redis.return_value = client = _client(entry, str(time.time()))
+
+    assert asyncio.run(metrics_cache.get_cached(1, "signal", "rsrp", "24h", "5m")) is None
+    client.incr.assert_awaited_once_with("metrics:cache:misses")
+
+
+@patch("app.services.metrics_cache.get_async_redis")
+def test_redis_outage_is_a_miss_not_an_error(mock_redis):
+    client = MagicMock()
+    client.mget = AsyncMock(side_effect=RedisConnectionError("redis down"))
+    client.set = AsyncMock(side_effect=RedisConnectionError("redis down"))
+    client.pipeline.side_effect = RedisConnectionError("redis down")
+    mock_redis.return_value = client
+
+    assert asyncio.run(metrics_cache.get_cached(1, "signal", "rsrp", "24h", "5m")) is None
+    asyncio.run(metrics_cache.set_cached(1, "signal", "rsrp", "24h", "5m", [], ttl=300))
+    asyncio.run(metrics_cache.mark_written([1], "signal"))
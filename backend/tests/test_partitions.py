@@ -0,0 +1,44 @@
+from datetime import datetime, timezone
+from app.services.partitions import (
+    add_months,
+    create_partition_sql,
+    expire_partition_sql,
+    partition_month,
+    plan_partitions,
+)
+
+
+def _month(year, month):
+    return datetime(year, month, 1, tzinfo=timezone.utc)
+
+
+def test_add_months_crosses_years():
+    assert add_months(_month(2026, 11), 3) == _month(2027, 2)
+    assert add_months(_month(2026, 1), -1) == _month(2025, 12)
+
+
+def test_partition_bounds_cover_one_month():
+    sql = create_partition_sql("alerts", _month(2026, 12))
+    assert "alerts_p202612 PARTITION OF alerts" in sql
+    assert "FROM ('2026-12-01T00:00:00+00:00') TO ('2027-01-01T00:00:00+00:00')" in sql
+
+
+def test_partition_month_ignores_other_tables():
+    assert partition_month("alerts", "alerts_p202610") == _month(2026, 10)
+    assert partition_month("alerts", "script_executions_p202610") is None
+    assert partition_month("alerts", "alerts_archive") is None
+
+
+def test_plan_creates_ahead_and_expires_past_retention():
+    now = datetime(2026, 10, 17, 12, tzinfo=timezone.utc)
+    existing = ["alerts_p202609", "alerts_p202610", "alerts_p202608", "alerts_p202607"]
+    create, expire = plan_partitions("alerts", existing, now, ahead=2, retention=3)
+    assert create == [_month(2026, 11), _month(2026, 12)]
+    assert expire == ["alerts_p202607"]
+
+
+def test_expire_detaches_when_archiving():
+    assert expire_partition_sql("alerts", "alerts_p202601", "detach") == (
+        "ALTER TABLE alerts DETACH PARTITION alerts_p202601"
+    )
+    assert expire_partition_sql("alerts", "alerts_p202601", "drop") == "DROP TABLE IF EXISTS alerts_p202601"
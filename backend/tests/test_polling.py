@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from app.services.polling import (
+    plan_next_poll,
+    REASON_STABLE,
+    REASON_RECENT_CHANGE,
+    REASON_OFFLINE_BACKOFF,
+)
+
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _plan(*args):
+    with patch("app.services.polling.settings") as mock_settings:
+        mock_settings.POLL_BASE_INTERVAL = 60
+        mock_settings.POLL_FAST_INTERVAL = 20
+        mock_settings.POLL_FAST_WINDOW = 600
+        mock_settings.POLL_MAX_INTERVAL = 900
+        return plan_next_poll(*args)
+
+
+def test_stable_router_keeps_base_interval():
+    plan = _plan(True, True, 0, None, NOW)
+    assert plan["interval_s"] == 60
+    assert plan["reason"] == REASON_STABLE
+    assert plan["next_due_at"] == NOW + timedelta(seconds=60)
+
+
+def test_state_change_switches_to_fast_interval():
+    plan = _plan(True, False, 0, None, NOW)
+    assert plan["interval_s"] == 20
+    assert plan["reason"] == REASON_RECENT_CHANGE
+    assert plan["last_change_at"] == NOW
+
+    # Still fast a few minutes later, even though the router is back online
+    later = _plan(False, True, 0, NOW, NOW + timedelta(minutes=5))
+    assert later["reason"] == REASON_RECENT_CHANGE
+
+
+def test_offline_router_backs_off_to_cap():
+    changed = NOW - timedelta(hours=1)
+    failures, intervals = 0, []
+    for _ in range(6):
+        plan = _plan(False, False, failures, changed, NOW)
+        failures = plan["consecutive_failures"]
+        intervals.append(plan["interval_s"])
+    assert intervals == [60, 120, 240, 480, 900, 900]
+    assert plan["reason"] == REASON_OFFLINE_BACKOFF
@@ -0,0 +1,69 @@
+from unittest.mock import patch
+from app.core.config import settings
+from app.services.rollups import backfill_complete, choose_tier, rollup_flux, rollup_source, rollup_span, rollup_tiers
+
+NOW = 1_800_000_000.0  # on an hour boundary
+
+
+def _tiers():
+    return {t["name"]: t for t in rollup_tiers()}
+
+
+def test_span_trails_now_and_stays_on_window_boundaries():
+    with patch("app.services.rollups.settings") as s:
+        s.ROLLUP_LAG = 120
+        s.ROLLUP_MAX_SPAN = 86400
+        start, stop = rollup_span(NOW - 3600, NOW, 300, NOW - 30 * 86400)
+    assert start == NOW - 3600
+    assert stop == NOW - 300  # the window closing 2 minutes ago is still open for late points
+    assert stop % 300 == 0
+
+
+def test_span_is_capped_and_limited_by_source_checkpoint():
+    with patch("app.services.rollups.settings") as s:
+        s.ROLLUP_LAG = 120
+        s.ROLLUP_MAX_SPAN = 86400
+        # First run backfills from the oldest raw point, one day at a time
+        start, stop = rollup_span(None, NOW, 300, NOW - 400 * 86400 + 17)
+        assert start == NOW - 400 * 86400
+        assert stop - start == 86400
+        # A coarse tier never passes the finer tier it reads from
+        assert rollup_span(NOW - 7200, NOW, 3600, 0, source_checkpoint=NOW - 3000) == (NOW - 7200, NOW - 3600)
+        assert rollup_span(NOW - 3600, NOW, 3600, 0, source_checkpoint=NOW - 1800) is None
+
+
+def test_choose_coarsest_tier_that_fits():
+    checkpoints = {"5m": NOW - 600, "1h": NOW - 3600}
+    assert choose_tier(86400, 90 * 86400, NOW, checkpoints)["name"] == "1h"
+    assert choose_tier(900, 7 * 86400, NOW, checkpoints)["name"] == "5m"
+    assert choose_tier(60, 86400, NOW, checkpoints) is None  # finer than any rollup
+
+
+def test_choose_tier_needs_built_rollups():
+    assert choose_tier(3600, 7 * 86400, NOW, {}) is None
+    # Built, but only past the start of the range is not enough to help
+    assert choose_tier(3600, 3600, NOW, {"5m": NOW - 7200, "1h": NOW - 7200}) is None
+
+
+def test_rollup_flux_aggregates_each_stat():
+    tier = _tiers()["1h"]
+    flux = rollup_flux(tier, NOW - 3600, NOW, tier["source"])
+    for stat in ("mean", "min", "max"):
+        assert f'r.stat == "{stat}"' in flux
+        assert f"fn: {stat}," in flux
+    assert f'to(bucket: "{tier["bucket"]}"' in flux
+
+
+def test_coarse_backfill_reads_raw_beyond_the_finer_retention():
+    tier = _tiers()["1h"]
+    assert rollup_source(tier, NOW - 3600, NOW) == tier["source"]
+    assert rollup_source(tier, NOW - 400 * 86400, NOW) == settings.INFLUX_BUCKET
+    flux = rollup_flux(tier, NOW - 400 * 86400, NOW - 399 * 86400, settings.INFLUX_BUCKET)
+    assert f'from(bucket: "{settings.INFLUX_BUCKET}")' in flux
+    assert "r.stat ==" not in flux
+
+
+def test_backfill_complete_needs_every_tier_caught_up():
+    assert not backfill_complete({"5m": NOW - 300, "1h": None}, NOW)
+    assert not backfill_complete({"5m": NOW - 30 * 86400, "1h": NOW - 3600}, NOW)
+    assert backfill_complete({"5m": NOW - 600, "1h": NOW - 3600}, NOW)
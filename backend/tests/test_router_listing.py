@@ -0,0 +1,33 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.api.routers import decode_cursor, encode_cursor, list_etag, parse_tag_filters
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor("R01 é", 42)) == ("R01 é", 42)
+
+
+def test_bad_cursor_raises():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_tag_filters():
+    assert parse_tag_filters(["site:north", "spare", "note:a:b"]) == [
+        ("site", "north"), ("spare", None), ("note", "a:b"),
+    ]
+    with pytest.raises(ValueError):
+        parse_tag_filters([":x"])
+
+
+def test_etag_changes_with_rows_not_with_every_heartbeat():
+    updated = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    seen = datetime(2026, 3, 1, 12, 0, 5, tzinfo=timezone.utc)
+    etag = list_etag(updated, 10, seen, "")
+    assert etag.startswith('W/"')
+    assert list_etag(updated, 10, seen + timedelta(seconds=20), "") == etag
+    assert list_etag(updated, 10, seen + timedelta(minutes=2), "") != etag
+    assert list_etag(updated + timedelta(seconds=1), 10, seen, "") != etag
+    assert list_etag(updated, 9, seen, "") != etag
+    assert list_etag(updated, 10, seen, "is_online=true") != etag
+    assert list_etag(None, 0, None, "")
@@ -0,0 +1,41 @@
+import pytest
+from app.scripts.routeros import (
+    build_collector,
+    split_collector_output,
+    parse_kv_output,
+    parse_routeros_duration,
+    COLLECTOR_SECTION_PREFIX,
+)
+
+
+def test_collector_wraps_each_script_in_its_own_section():
+    command = build_collector(["signal_strength", "system_info"])
+    assert command.count(COLLECTOR_SECTION_PREFIX) == 2
+    assert command.index("section=signal_strength") < command.index("section=system_info")
+    assert command.count(":do {") == 2
+
+
+def test_unknown_script_is_rejected():
+    with pytest.raises(ValueError):
+        build_collector(["signal_strength", "nope"])
+
+
+def test_split_collector_output():
+    output = (
+        f"{COLLECTOR_SECTION_PREFIX}signal_strength\n"
+        "iface=lte1\nrssi=-67\nrsrp=-95\n"
+        f"{COLLECTOR_SECTION_PREFIX}system_info\n"
+        "uptime=1w2d03:04:05\ncpu-load=7\n"
+    )
+    sections = split_collector_output(output)
+    assert set(sections) == {"signal_strength", "system_info"}
+    assert parse_kv_output(sections["signal_strength"])["rsrp"] == "-95"
+    assert parse_kv_output(sections["system_info"]) == {"uptime": "1w2d03:04:05", "cpu-load": "7"}
+
+
+def test_parse_routeros_duration():
+    assert parse_routeros_duration("1w2d03:04:05") == 604800 + 2 * 86400 + 3 * 3600 + 4 * 60 + 5
+    assert parse_routeros_duration("00:00:42") == 42
+    assert parse_routeros_duration("2d3h4m5s") == 2 * 86400 + 3 * 3600 + 4 * 60 + 5
+    assert parse_routeros_duration("") is None
+    assert parse_routeros_duration("n/a") is None
@@ -0,0 +1,25 @@
+import asyncio
+from app.tasks import runtime
+
+
+def test_run_async_reuses_one_loop_across_calls():
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    first = runtime.run_async(current_loop())
+    second = runtime.run_async(current_loop())
+    assert first is second
+    assert not first.is_closed()
+
+
+def test_shutdown_stops_the_loop_and_next_call_starts_a_new_one():
+    async def current_loop():
+        return asyncio.get_running_loop()
+
+    old = runtime.run_async(current_loop())
+    runtime.shutdown()
+    assert old.is_closed()
+
+    new = runtime.run_async(current_loop())
+    assert new is not old
+    runtime.shutdown()
@@ -0,0 +1,45 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.tasks import tasks
+
+
+def _router(router_id, is_online):
+    return MagicMock(id=router_id, is_online=is_online)
+
+
+def _session_with(routers):
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock(**{"scalars.return_value.all.return_value": routers}))
+
+    @asynccontextmanager
+    async def task_session():
+        yield session
+
+    return task_session
+
+
+def test_sweep_counts_ok_failed_and_skipped_and_writes_once():
+    routers = [_router(1, True), _router(2, True), _router(3, True), _router(4, True), _router(5, False)]
+    results = [
+        (["p1a", "p1b"], {"rssi": -70}),  # collected, with a snapshot
+        (["p2"], None),  # collected, nothing to snapshot
+        ([], None),  # answered but returned no points
+        TimeoutError("deadline"),  # not done before the deadline
+    ]
+    writer = MagicMock(write_async=AsyncMock())
+    with patch.object(tasks, "task_session", _session_with(routers)), \
+            patch.object(tasks, "fan_out", AsyncMock(return_value=results)) as fan_out, \
+            patch.object(tasks, "get_point_writer", return_value=writer), \
+            patch.object(tasks, "_mark_collected", new_callable=AsyncMock) as mark_collected:
+        stats = asyncio.run(tasks._signal_sweep())
+
+    assert [r.id for r in fan_out.await_args.args[0]] == [1, 2, 3, 4]  # offline routers are not polled
+    assert {k: v for k, v in stats.items() if k != "duration_ms"} == {
+        "polled": 4, "ok": 2, "failed": 2, "skipped_offline": 1,
+    }
+    writer.write_async.assert_awaited_once()
+    points = writer.write_async.await_args.args[0]
+    assert points[:3] == ["p1a", "p1b", "p2"]
+    assert len(points) == 4  # plus the sweep's own signal_sweep point
+    mark_collected.assert_awaited_once_with([1, 2], {1: {"rssi": -70}})
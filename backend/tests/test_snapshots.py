@@ -0,0 +1,27 @@
+import json
+from datetime import datetime, timedelta, timezone
+from app.services.snapshots import summary_rows
+
+NOW = datetime(2026, 1, 1, 12, tzinfo=timezone.utc)
+
+
+def _snapshot(age_s, **values):
+    return json.dumps({"router_name": "old name", **values, "at": (NOW - timedelta(seconds=age_s)).isoformat()})
+
+
+def test_summary_keeps_the_influx_shape():
+    rows = summary_rows(
+        {1: "R01", 2: "R02"},
+        [_snapshot(30, rssi=-71.0, rsrp=-98.0, sinr=12.0, band="B3"), _snapshot(60, rssi=-80.0, rsrp=None)],
+        NOW,
+        600,
+    )
+    assert rows == [
+        {"router_id": "1", "router_name": "R01", "rssi": -71.0, "rsrp": -98.0},
+        {"router_id": "2", "router_name": "R02", "rssi": -80.0},
+    ]
+
+
+def test_summary_drops_stale_and_missing_snapshots():
+    rows = summary_rows({1: "R01", 2: "R02", 3: "R03"}, [_snapshot(601, rssi=-70.0), None, _snapshot(5, rssi=-75.0)], NOW, 600)
+    assert [row["router_id"] for row in rows] == ["3"]
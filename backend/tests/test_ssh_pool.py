@@ -0,0 +1,144 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.services.ssh import SSHConnectionPool
+
+
+def _fake_conn(stdout="ok\n"):
+    conn = MagicMock()
+    conn.is_closed.return_value = False
+    conn.run = AsyncMock(return_value=MagicMock(stdout=stdout, stderr="", exit_status=0))
+    conn.wait_closed = AsyncMock()
+    return conn
+
+
+def _run(coro_fn):
+    return asyncio.run(coro_fn())
+
+
+@patch("app.services.ssh.asyncssh")
+def test_connection_is_reused_per_key(mock_asyncssh):
+    mock_asyncssh.connect = AsyncMock(side_effect=lambda **kw: _fake_conn())
+
+    async def scenario():
+        pool = SSHConnectionPool(max_connections=10, idle_timeout=300, keepalive_interval=30)
+        first = await pool.run("10.0.0.1", 22, "admin", ":put ok", 5)
+        second = await pool.run("10.0.0.1", 22, "admin", ":put ok", 5)
+        await pool.run("10.0.0.2", 22, "admin", ":put ok", 5)
+        return pool, first, second
+
+    pool, first, second = _run(scenario)
+    assert mock_asyncssh.connect.await_count == 2
+    assert len(pool) == 2
+    assert first.success and second.success
+    assert second.connect_ms == 0
+
+
+@patch("app.services.ssh.asyncssh")
+def test_closed_connection_is_replaced(mock_asyncssh):
+    conns = []
+
+    def connect(**kw):
+        conns.append(_fake_conn())
+        return conns[-1]
+
+    mock_asyncssh.connect = AsyncMock(side_effect=connect)
+
+    async def scenario():
+        pool = SSHConnectionPool(max_connections=10, idle_timeout=300, keepalive_interval=30)
+        await pool.run("10.0.0.1", 22, "admin", ":put ok", 5)
+        conns[0].is_closed.return_value = True  # keepalive gave up
+        return await pool.run("10.0.0.1", 22, "admin", ":put ok", 5)
+
+    result = _run(scenario)
+    assert result.success
+    assert mock_asyncssh.connect.await_count == 2
+
+
+@patch("app.services.ssh.asyncssh")
+def test_stale_connection_reconnects_transparently(mock_asyncssh):
+    conns = []
+
+    def connect(**kw):
+        conns.append(_fake_conn())
+        return conns[-1]
+
+    mock_asyncssh.connect = AsyncMock(side_effect=connect)
+
+    async def scenario():
+        pool = SSHConnectionPool(max_connections=10, idle_timeout=300, keepalive_interval=30)
+        await pool.run("10.0.0.1", 22, "admin", ":put ok", 5)
+        conns[0].run.side_effect = ConnectionResetError("gone")
+        return await pool.run("10.0.0.1", 22, "admin", ":put ok", 5)
+
+    result = _run(scenario)
+    assert result.success
+    conns[0].close.assert_called_once()
+
+
+@patch("app.services.ssh.asyncssh")
+def test_max_connections_evicts_least_recently_used(mock_asyncssh):
+    conns = []
+
+    def connect(**kw):
+        conns.append(_fake_conn())
+        return conns[-1]
+
+    mock_asyncssh.connect = AsyncMock(side_effect=connect)
+
+    async def scenario():
+        pool = SSHConnectionPool(max_connections=2, idle_timeout=300, keepalive_interval=30)
+        for ip in ("10.0.0.1", "10.0.0.2", "10.0.0.3"):
+            await pool.run(ip, 22, "admin", ":put ok", 5)
+        return pool
+
+    pool = _run(scenario)
+    assert len(pool) == 2
+    conns[0].close.assert_called_once()
+    conns[1].close.assert_not_called()
+
+
+@patch("app.services.ssh.asyncssh")
+def test_changed_password_opens_a_new_connection(mock_asyncssh):
+    mock_asyncssh.connect = AsyncMock(side_effect=lambda **kw: _fake_conn())
+
+    async def scenario():
+        pool = SSHConnectionPool(max_connections=10, idle_timeout=300, keepalive_interval=30)
+        await pool.run("10.0.0.1", 22, "admin", ":put ok", 5, password="old")
+        await pool.run("10.0.0.1", 22, "admin", ":put ok", 5, password="new")
+
+    _run(scenario)
+    assert mock_asyncssh.connect.await_count == 2
+    assert mock_asyncssh.connect.await_args.kwargs["password"] == "new"
+
+
+@patch("app.services.ssh.asyncssh")
+def test_timeout_leaves_other_commands_on_the_connection_running(mock_asyncssh):
+    conn = _fake_conn()
+    mock_asyncssh.connect = AsyncMock(return_value=conn)
+
+    async def scenario():
+        pool = SSHConnectionPool(max_connections=10, idle_timeout=300, keepalive_interval=30)
+        slow_started, finish_slow = asyncio.Event(), asyncio.Event()
+
+        async def run(command, check=False):
+            if command == "slow":
+                slow_started.set()
+                await finish_slow.wait()
+            elif command == "hang":
+                await asyncio.sleep(10)
+            return MagicMock(stdout="ok\n", stderr="", exit_status=0)
+
+        conn.run = AsyncMock(side_effect=run)
+        slow = asyncio.create_task(pool.run("10.0.0.1", 22, "admin", "slow", 5))
+        await slow_started.wait()
+        timed_out = await pool.run("10.0.0.1", 22, "admin", "hang", 0.05)
+        closed_before = conn.close.called
+        finish_slow.set()
+        return pool, timed_out, await slow, closed_before
+
+    pool, timed_out, slow, closed_before = _run(scenario)
+    assert timed_out.stderr == "Command timed out"
+    assert slow.success
+    assert not closed_before  # the slow command still had it
+    conn.close.assert_called_once()
+    assert len(pool) == 0
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta, timezone
+from app.services.uptime import backfill_buckets, range_bucket_keys, split_by_hour, sum_buckets
+
+
+def _t(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_split_by_hour():
+    pieces = split_by_hour(_t(2026, 3, 1, 9, 59, 30), _t(2026, 3, 1, 10, 0, 20))
+    assert pieces == [(_t(2026, 3, 1, 9), 30.0), (_t(2026, 3, 1, 10), 20.0)]
+
+
+def test_bucket_keys_use_days_in_the_middle():
+    keys = range_bucket_keys(_t(2026, 3, 1, 22, 15), _t(2026, 3, 4, 1, 5))
+    assert keys == [
+        "uptime:h:2026030122",
+        "uptime:h:2026030123",
+        "uptime:d:20260302",
+        "uptime:d:20260303",
+        "uptime:h:2026030400",
+        "uptime:h:2026030401",
+    ]
+
+
+def test_bucket_keys_use_months_for_whole_months():
+    keys = range_bucket_keys(_t(2026, 1, 30, 23), _t(2026, 4, 2, 0, 30))
+    assert keys == [
+        "uptime:h:2026013023",
+        "uptime:d:20260131",
+        "uptime:m:202602",
+        "uptime:m:202603",
+        "uptime:d:20260401",
+        "uptime:h:2026040200",
+    ]
+    assert range_bucket_keys(_t(2025, 12, 1), _t(2026, 1, 1))[0] == "uptime:m:202512"
+
+
+def test_bucket_count_does_not_grow_with_the_range():
+    now = _t(2026, 3, 30, 13, 5)
+    assert len(range_bucket_keys(now - timedelta(hours=1), now)) == 2
+    month = len(range_bucket_keys(now - timedelta(days=30), now))
+    year = len(range_bucket_keys(now - timedelta(weeks=52), now))
+    assert year <= month + 12
+    assert year < 100
+
+
+def test_sum_buckets():
+    buckets = [
+        {b"1:total": b"3600", b"1:up": b"3600", b"2:total": b"3600"},
+        {b"1:total": b"1800", b"1:up": b"900", b"2:total": b"1800", b"2:up": b"1800"},
+    ]
+    result = sum_buckets(buckets)
+    assert result[1] == {"up_s": 4500, "total_s": 5400, "uptime_pct": 83.333}
+    assert result[2]["uptime_pct"] == 33.333
+
+
+def test_backfill_credits_whole_hours_whatever_the_probe_spacing():
+    # 60 probes an hour (old 60 s spacing) and 180 (20 s ticks) cover the same hour
+    rows = [(1, _t(2026, 3, 1, 9), 60, 30), (1, _t(2026, 3, 1, 10), 180, 180), (2, _t(2026, 3, 1, 9), 60, 0)]
+    buckets = backfill_buckets(rows)
+    assert buckets["uptime:h:2026030109"] == {"1:total": 3600.0, "1:up": 1800.0, "2:total": 3600.0}
+    assert buckets["uptime:d:20260301"] == {"1:total": 7200.0, "1:up": 5400.0, "2:total": 3600.0}
+    assert sum_buckets([buckets["uptime:d:20260301"]])[1]["uptime_pct"] == 75.0
+
+
+def test_backfilled_and_counted_days_weigh_the_same():
+    # Down all of a backfilled day, up all of a counted one: 50%
+    backfilled = backfill_buckets([(1, _t(2026, 3, 1, h), 60, 0) for h in range(24)])["uptime:d:20260301"]
+    counted = {"1:total": 86400.0, "1:up": 86400.0}
+    assert sum_buckets([backfilled, counted])[1]["uptime_pct"] == 50.0
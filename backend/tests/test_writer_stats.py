@@ -0,0 +1,35 @@
+import json
+from unittest.mock import MagicMock, patch
+from app.services import writer_stats
+from app.services.writer_stats import summarize_writer_stats
+
+NOW = 1_800_000_000.0
+
+
+def _report(at, **counts):
+    return json.dumps({"queued": 0, "flushed": 0, "dropped": 0, "failed_batches": 0, "buffered": 0, **counts, "at": at})
+
+
+def test_summary_sums_live_processes_only():
+    entries = {
+        b"worker-1:10": _report(NOW - 5, queued=100, flushed=90, dropped=3, buffered=7),
+        b"worker-2:11": _report(NOW - 40, queued=50, flushed=50, failed_batches=2),
+        b"worker-3:12": _report(NOW - 3600, dropped=1000),  # process gone
+    }
+    summary = summarize_writer_stats(entries, NOW)
+    assert summary["queued"] == 150
+    assert summary["flushed"] == 140
+    assert summary["dropped"] == 3
+    assert summary["failed_batches"] == 2
+    assert summary["buffered"] == 7
+    assert set(summary["processes"]) == {"worker-1:10", "worker-2:11"}
+
+
+def test_publish_is_throttled_per_process():
+    redis = MagicMock()
+    with patch.object(writer_stats, "get_redis", return_value=redis), patch.object(writer_stats, "_last_report", None):
+        writer_stats.publish_writer_stats({"queued": 1}, now=NOW)
+        writer_stats.publish_writer_stats({"queued": 2}, now=NOW + 1)
+        writer_stats.publish_writer_stats({"queued": 3}, now=NOW + writer_stats.WRITER_STATS_INTERVAL)
+    assert redis.hset.call_count == 2
+    assert json.loads(redis.hset.call_args.args[2])["queued"] == 3
@@ -1,7 +1,8 @@
 "use client";
 
-import { useEffect, useState } from "react";
+import { useEffect, useRef, useState } from "react";
 import { api } from "@/lib/api";
+import { subscribeEvents, FleetEvent } from "@/lib/events";
 import { Router } from "@/lib/types";
 import RouterCard from "@/components/dashboard/RouterCard";
 import Sidebar from "@/components/ui/Sidebar";
@@ -14,11 +15,13 @@ export default function DashboardPage() {
   const [loading, setLoading] = useState(true);
   const [lastRefresh, setLastRefresh] = useState(new Date());
   const [filter, setFilter] = useState<"all" | "online" | "offline">("all");
+  const etag = useRef<string | null>(null);
 
   const fetchRouters = async () => {
     try {
-      const data = await api.get<Router[]>("/routers/");
-      setRouters(data);
+      const res = await api.getIfChanged<Router[]>("/routers/", etag.current);
+      etag.current = res.etag;
+      if (res.data) setRouters(res.data);
       setLastRefresh(new Date());
     } catch (e) {
       console.error(e);
@@ -27,10 +30,30 @@ export default function DashboardPage() {
     }
   };
 
+  const applyEvent = (event: FleetEvent) => {
+    if (event.type === "router.status") {
+      setRouters((prev) =>
+        prev.map((r) =>
+          r.id === event.router_id
+            ? { ...r, is_online: event.is_online, last_seen: event.last_seen ?? r.last_seen }
+            : r
+        )
+      );
+    } else if (event.type === "routers.seen") {
+      const seen = new Set(event.router_ids);
+      setRouters((prev) =>
+        prev.map((r) => (seen.has(r.id) ? { ...r, last_seen: event.last_seen } : r))
+      );
+    } else {
+      return;
+    }
+    setLastRefresh(new Date());
+  };
+
   useEffect(() => {
     fetchRouters();
-    const interval = setInterval(fetchRouters, 30000);
-    return () => clearInterval(interval);
+    // Live updates; reconnecting revalidates the full list in case events were missed
+    return subscribeEvents({ onEvent: applyEvent, onOpen: fetchRouters });
   }, []);
 
   const filtered = routers.filter((r) => {
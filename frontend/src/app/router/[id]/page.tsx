@@ -35,7 +35,7 @@ export default function RouterDetailPage() {
     try {
       const [r, m, e, s] = await Promise.all([
         api.get<Router>(`/routers/${id}`),
-        api.get<SignalMetrics>(`/metrics/${id}/signal?range=${range}`),
+        api.get<SignalMetrics>(`/metrics/${id}/signal?range=${range}&downsample=lttb`),
         api.get<ScriptExecution[]>(`/routers/${id}/executions`),
         api.get<Script[]>(`/routers/scripts/list`),
       ]);
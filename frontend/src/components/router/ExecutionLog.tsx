@@ -1,6 +1,7 @@
 "use client";
 
 import { ScriptExecution } from "@/lib/types";
+import { api } from "@/lib/api";
 import { formatDistanceToNow, format } from "date-fns";
 import { CheckCircle, XCircle, Clock, Loader, Smartphone, Monitor } from "lucide-react";
 import clsx from "clsx";
@@ -12,6 +13,25 @@ interface Props {
 
 export default function ExecutionLog({ executions }: Props) {
   const [expanded, setExpanded] = useState<number | null>(null);
+  // Output is loaded per execution on first expand; the history list omits it
+  const [details, setDetails] = useState<Record<number, ScriptExecution>>({});
+
+  const toggle = async (exec: ScriptExecution) => {
+    if (expanded === exec.id) {
+      setExpanded(null);
+      return;
+    }
+    setExpanded(exec.id);
+    if (details[exec.id] || exec.status === "pending" || exec.status === "running") return;
+    try {
+      const detail = await api.get<ScriptExecution>(
+        `/routers/${exec.router_id}/executions/${exec.id}?created_at=${encodeURIComponent(exec.created_at)}`
+      );
+      setDetails((prev) => ({ ...prev, [exec.id]: detail }));
+    } catch {
+      // Leave the row collapsed-looking; the next expand retries
+    }
+  };
 
   return (
     <div>
@@ -32,9 +52,7 @@ export default function ExecutionLog({ executions }: Props) {
             >
               {/* Row */}
               <button
-                onClick={() =>
-                  setExpanded(expanded === exec.id ? null : exec.id)
-                }
+                onClick={() => toggle(exec)}
                 className="w-full flex items-center gap-4 p-4 text-left hover:bg-border/30 transition-colors"
               >
                 {/* Status icon */}
@@ -77,11 +95,17 @@ export default function ExecutionLog({ executions }: Props) {
               </button>
 
               {/* Expanded output */}
-              {expanded === exec.id && (exec.output || exec.error) && (
+              {expanded === exec.id &&
+                (details[exec.id]?.output || details[exec.id]?.error) && (
                 <div className="border-t border-border p-4">
                   <div className="terminal text-xs max-h-64 overflow-auto">
-                    {exec.output || exec.error}
+                    {details[exec.id].output || details[exec.id].error}
                   </div>
+                  {details[exec.id].output_truncated && (
+                    <div className="font-mono text-xs text-text-dim mt-2">
+                      Output truncated ({details[exec.id].output_size} bytes produced)
+                    </div>
+                  )}
                 </div>
               )}
             </div>
@@ -3,6 +3,7 @@
 import { useState } from "react";
 import { Router, Script, ScriptExecution } from "@/lib/types";
 import { api } from "@/lib/api";
+import { subscribeEvents } from "@/lib/events";
 import {
   Signal,
   Cpu,
@@ -51,7 +52,86 @@ export default function ScriptRunner({ router, scripts, onComplete }: Props) {
     setResult(null);
     setConfirmDanger(false);
 
+    let cleanup = () => {};
     try {
+      // Subscribe before starting the script so its completion event cannot be missed
+      let executionId: number | null = null;
+      let createdAt = "";
+      let finished = false;
+      let streamOpen = false;
+      const fetchExecution = () =>
+        api
+          .get<ScriptExecution>(
+            `/routers/${router.id}/executions/${executionId}?created_at=${encodeURIComponent(createdAt)}`
+          )
+          .catch(() => null);
+      const isDone = (e: ScriptExecution | null) =>
+        !!e && (e.status === "success" || e.status === "error");
+      const finish = async (execution?: ScriptExecution | null) => {
+        if (finished || executionId === null) return;
+        finished = true;
+        cleanup();
+        setResult(execution ?? (await fetchExecution()));
+        setRunning(false);
+        onComplete();
+      };
+      const done = new Set<number>();
+      let opened: () => void = () => {};
+      const ready = new Promise<void>((resolve) => (opened = () => resolve()));
+      const unsubscribe = subscribeEvents({
+        routers: [router.id],
+        onOpen: async () => {
+          streamOpen = true;
+          opened();
+          // Reconnected mid-run: the completion event may have been sent while we were away
+          if (executionId === null || finished) return;
+          const latest = await fetchExecution();
+          if (isDone(latest)) finish(latest);
+        },
+        onEvent: (event) => {
+          if (
+            event.type === "execution.status" &&
+            (event.status === "success" || event.status === "error")
+          ) {
+            done.add(event.execution_id);
+            if (event.execution_id === executionId) finish();
+          }
+        },
+      });
+      // Poll the execution as well: often while the event stream is down, rarely as a safety net
+      let poll: ReturnType<typeof setTimeout> | undefined;
+      const schedulePoll = () => {
+        poll = setTimeout(async () => {
+          if (finished || executionId === null) return;
+          const latest = await fetchExecution();
+          if (isDone(latest)) finish(latest);
+          else if (!finished) schedulePoll();
+        }, streamOpen ? 10000 : 2000);
+      };
+      const timeout = setTimeout(() => {
+        if (finished) return;
+        finished = true;
+        cleanup();
+        setResult({
+          id: executionId ?? 0,
+          router_id: router.id,
+          script_name: script.name,
+          triggered_by: "ui",
+          status: "error",
+          error: "No result after 60s; check the execution log for its final status",
+          created_at: createdAt || new Date().toISOString(),
+        } as ScriptExecution);
+        setRunning(false);
+        onComplete();
+      }, 60000);
+      cleanup = () => {
+        clearTimeout(timeout);
+        clearTimeout(poll);
+        unsubscribe();
+      };
+
+      // Don't let a broken event stream keep the script from running
+      await Promise.race([ready, new Promise((resolve) => setTimeout(resolve, 3000))]);
       const execution = await api.post<ScriptExecution>(
         `/routers/${router.id}/execute`,
         {
@@ -60,27 +140,12 @@ export default function ScriptRunner({ router, scripts, onComplete }: Props) {
           triggered_by: "ui",
         }
       );
-
-      // Poll for completion
-      let attempts = 0;
-      const poll = async () => {
-        const executions = await api.get<ScriptExecution[]>(
-          `/routers/${router.id}/executions?limit=5`
-        );
-        const latest = executions.find((e) => e.id === execution.id);
-        if (latest && (latest.status === "success" || latest.status === "error")) {
-          setResult(latest);
-          setRunning(false);
-          onComplete();
-        } else if (attempts < 20) {
-          attempts++;
-          setTimeout(poll, 2000);
-        } else {
-          setRunning(false);
-        }
-      };
-      setTimeout(poll, 2000);
+      executionId = execution.id;
+      createdAt = execution.created_at;
+      if (done.has(execution.id)) finish();
+      else schedulePoll();
     } catch (e: any) {
+      cleanup();
       setResult({
         id: 0,
         router_id: router.id,
@@ -19,7 +19,29 @@ async function request<T>(path: string, options: RequestInit = {}): Promise<T> {
   return res.json();
 }
 
+// GET that revalidates with If-None-Match; data is null when the server answered 304.
+async function getIfChanged<T>(
+  path: string,
+  etag: string | null
+): Promise<{ data: T | null; etag: string | null }> {
+  const token = Cookies.get("mm_token");
+  const res = await fetch(`${BASE}${path}`, {
+    cache: "no-store",
+    headers: {
+      ...(token ? { Authorization: `Bearer ${token}` } : {}),
+      ...(etag ? { "If-None-Match": etag } : {}),
+    },
+  });
+  if (res.status === 304) return { data: null, etag };
+  if (!res.ok) {
+    const err = await res.json().catch(() => ({ detail: res.statusText }));
+    throw new Error(err.detail || "Request failed");
+  }
+  return { data: await res.json(), etag: res.headers.get("ETag") };
+}
+
 export const api = {
+  getIfChanged,
   get: <T>(path: string) => request<T>(path),
   post: <T>(path: string, body?: unknown) =>
     request<T>(path, { method: "POST", body: JSON.stringify(body) }),
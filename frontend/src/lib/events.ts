@@ -0,0 +1,83 @@
+import Cookies from "js-cookie";
+
+const BASE = process.env.NEXT_PUBLIC_API_URL || "http://localhost/api";
+
+export type FleetEvent =
+  | { type: "router.status"; router_id: number; is_online: boolean; last_seen: string | null; at: string }
+  | { type: "routers.seen"; router_ids: number[]; last_seen: string; at: string }
+  | {
+      type: "alert.created";
+      router_id: number;
+      alert_type: string;
+      message: string;
+      severity: "info" | "warning" | "critical";
+      at: string;
+    }
+  | {
+      type: "execution.status";
+      router_id: number;
+      execution_id: number;
+      script_name: string;
+      status: "pending" | "running" | "success" | "error";
+      duration_ms?: number;
+      at: string;
+    };
+
+interface Options {
+  routers?: number[];
+  onEvent: (event: FleetEvent) => void;
+  // Called on every (re)connect: events sent while disconnected are lost, so resync here
+  onOpen?: () => void;
+}
+
+/**
+ * Subscribe to /events/stream. Uses fetch rather than EventSource so the
+ * bearer token stays in a header instead of the URL. Reconnects with backoff;
+ * call the returned function to close.
+ */
+export function subscribeEvents({ routers, onEvent, onOpen }: Options): () => void {
+  const controller = new AbortController();
+  const query = routers && routers.length ? `?routers=${routers.join(",")}` : "";
+  let delay = 1000;
+
+  const connect = async () => {
+    while (!controller.signal.aborted) {
+      try {
+        const token = Cookies.get("mm_token");
+        const res = await fetch(`${BASE}/events/stream${query}`, {
+          headers: token ? { Authorization: `Bearer ${token}` } : {},
+          signal: controller.signal,
+        });
+        if (!res.ok || !res.body) throw new Error(`Event stream failed: ${res.status}`);
+        delay = 1000;
+        onOpen?.();
+
+        const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = "";
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) break;
+          buffer += value;
+          const frames = buffer.split("\n\n");
+          buffer = frames.pop() || "";
+          for (const frame of frames) {
+            const data = frame
+              .split("\n")
+              .filter((line) => line.startsWith("data:"))
+              .map((line) => line.slice(5).trim())
+              .join("\n");
+            if (data) onEvent(JSON.parse(data));
+          }
+        }
+      } catch (e) {
+        if (controller.signal.aborted) return;
+        console.error(e);
+      }
+      await new Promise((resolve) => setTimeout(resolve, delay));
+      delay = Math.min(delay * 2, 30000);
+    }
+  };
+
+  connect();
+  return () => controller.abort();
+}
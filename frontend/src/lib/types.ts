@@ -20,8 +20,11 @@ export interface ScriptExecution {
   script_name: string;
   triggered_by: string;
   status: "pending" | "running" | "success" | "error";
+  // output and error are only returned by the execution detail endpoint
   output?: string;
   error?: string;
+  output_size?: number;
+  output_truncated?: boolean;
   duration_ms?: number;
   created_at: string;
   completed_at?: string;
@@ -46,6 +49,7 @@ export interface MetricPoint {
 export interface SignalMetrics {
   router_id: number;
   range: string;
+  window: string;
   rssi: MetricPoint[];
   rsrp: MetricPoint[];
   rsrq: MetricPoint[];